@@ -154,6 +154,7 @@ CFG_FLOAT_KEYS = {  # integer or float arguments, i.e. x=2 and x=2.0
     "time",
     "workspace",
     "batch",
+    "stream_wait",
 }
 CFG_FRACTION_KEYS = {  # fractional float arguments with 0.0<=values<=1.0
     "dropout",
@@ -175,6 +176,7 @@ CFG_FRACTION_KEYS = {  # fractional float arguments with 0.0<=values<=1.0
     "mosaic",
     "mixup",
     "copy_paste",
+    "buffer_bias",
     "conf",
     "iou",
     "fraction",
@@ -183,14 +185,18 @@ CFG_INT_KEYS = {  # integer-only arguments
     "epochs",
     "patience",
     "workers",
+    "decode_workers",
     "seed",
     "close_mosaic",
     "mask_ratio",
     "max_det",
+    "nms_topk",
     "vid_stride",
     "line_width",
     "nbs",
     "save_period",
+    "buffer_mb",
+    "shard_buffer",
 }
 CFG_BOOL_KEYS = {  # boolean-only arguments
     "save",
@@ -199,6 +205,8 @@ CFG_BOOL_KEYS = {  # boolean-only arguments
     "deterministic",
     "single_cls",
     "rect",
+    "device_augment",
+    "deep_verify",
     "cos_lr",
     "overlap_mask",
     "val",
@@ -227,6 +235,8 @@ CFG_BOOL_KEYS = {  # boolean-only arguments
     "nms",
     "profile",
     "multi_scale",
+    "pipeline",
+    "fused_preprocess",
 }
 
 
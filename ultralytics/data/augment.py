@@ -8,6 +8,7 @@ from typing import Tuple, Union
 import cv2
 import numpy as np
 import torch
+import torch.nn.functional as F
 from PIL import Image
 
 from ultralytics.data.utils import polygons2masks, polygons2masks_overlap
@@ -15,7 +16,7 @@ from ultralytics.utils import LOGGER, colorstr
 from ultralytics.utils.checks import check_version
 from ultralytics.utils.instance import Instances
 from ultralytics.utils.metrics import bbox_ioa
-from ultralytics.utils.ops import segment2box, xyxyxyxy2xywhr
+from ultralytics.utils.ops import segment2box, xywh2xyxy, xyxy2xywh, xyxyxyxy2xywhr
 from ultralytics.utils.torch_utils import TORCHVISION_0_10, TORCHVISION_0_11, TORCHVISION_0_13
 
 DEFAULT_MEAN = (0.0, 0.0, 0.0)
@@ -326,6 +327,7 @@ class BaseMixTransform:
         dataset (Any): The dataset object containing images and labels.
         pre_transform (Callable | None): Optional transform to apply before mixing.
         p (float): Probability of applying the mix transformation.
+        buffer_p (float): Probability of drawing a random partner from the dataset's image buffer.
 
     Methods:
         __call__: Applies the mix transformation to the input labels.
@@ -346,7 +348,7 @@ class BaseMixTransform:
         >>> mixed_labels = transform(original_labels)
     """
 
-    def __init__(self, dataset, pre_transform=None, p=0.0) -> None:
+    def __init__(self, dataset, pre_transform=None, p=0.0, buffer_p=0.0) -> None:
         """
         Initializes the BaseMixTransform object for mix transformations like MixUp and Mosaic.
 
@@ -356,6 +358,8 @@ class BaseMixTransform:
             dataset (Any): The dataset object containing images and labels for mixing.
             pre_transform (Callable | None): Optional transform to apply before mixing.
             p (float): Probability of applying the mix transformation. Should be in the range [0.0, 1.0].
+            buffer_p (float): Probability that `random_index()` draws from the dataset's buffer of recently loaded
+                images, which are served without reading the image file again.
 
         Examples:
             >>> dataset = YOLODataset("path/to/data")
@@ -365,6 +369,7 @@ class BaseMixTransform:
         self.dataset = dataset
         self.pre_transform = pre_transform
         self.p = p
+        self.buffer_p = buffer_p
 
     def __call__(self, labels):
         """
@@ -441,6 +446,21 @@ class BaseMixTransform:
         """
         raise NotImplementedError
 
+    def random_index(self):
+        """
+        Returns a random dataset index, drawn from the dataset's image buffer with probability `buffer_p`.
+
+        Returns:
+            (int): A random index, of a buffered image or of any image in the dataset.
+
+        Examples:
+            >>> transform = MixUp(dataset, p=0.5, buffer_p=0.8)
+            >>> index = transform.random_index()  # buffered image 80% of the time
+        """
+        if self.buffer_p and random.random() < self.buffer_p and len(self.dataset.buffer):
+            return random.choice(self.dataset.buffer)
+        return random.randint(0, len(self.dataset) - 1)
+
     @staticmethod
     def _update_label_text(labels):
         """
@@ -563,7 +583,7 @@ class Mosaic(BaseMixTransform):
             >>> print(len(indexes))  # Output: 3
         """
         if buffer:  # select images from buffer
-            return random.choices(list(self.dataset.buffer), k=self.n - 1)
+            return random.choices(self.dataset.buffer, k=self.n - 1)
         else:  # select any images
             return [random.randint(0, len(self.dataset) - 1) for _ in range(self.n - 1)]
 
@@ -887,7 +907,7 @@ class MixUp(BaseMixTransform):
         >>> augmented_labels = mixup(original_labels)
     """
 
-    def __init__(self, dataset, pre_transform=None, p=0.0) -> None:
+    def __init__(self, dataset, pre_transform=None, p=0.0, buffer_p=0.0) -> None:
         """
         Initializes the MixUp augmentation object.
 
@@ -898,13 +918,14 @@ class MixUp(BaseMixTransform):
             dataset (Any): The dataset to which MixUp augmentation will be applied.
             pre_transform (Callable | None): Optional transform to apply to images before MixUp.
             p (float): Probability of applying MixUp augmentation to an image. Must be in the range [0, 1].
+            buffer_p (float): Probability of drawing the partner image from the dataset's image buffer.
 
         Examples:
             >>> from ultralytics.data.dataset import YOLODataset
             >>> dataset = YOLODataset("path/to/data.yaml")
             >>> mixup = MixUp(dataset, pre_transform=None, p=0.5)
         """
-        super().__init__(dataset=dataset, pre_transform=pre_transform, p=p)
+        super().__init__(dataset=dataset, pre_transform=pre_transform, p=p, buffer_p=buffer_p)
 
     def get_indexes(self):
         """
@@ -922,7 +943,7 @@ class MixUp(BaseMixTransform):
             >>> print(index)
             42
         """
-        return random.randint(0, len(self.dataset) - 1)
+        return self.random_index()
 
     def _mix_transform(self, labels):
         """
@@ -964,9 +985,11 @@ class RandomPerspective:
         shear (float): Maximum shear angle in degrees.
         perspective (float): Perspective distortion factor.
         border (Tuple[int, int]): Mosaic border size as (x, y).
-        pre_transform (Callable | None): Optional transform to apply before the random perspective.
+        pre_transform (Callable | None): Optional transform to apply before the random perspective. A LetterBox is not
+            applied but folded into the warp matrix, so images are resized, padded and warped in a single pass.
 
     Methods:
+        random_matrix: Samples a random perspective matrix.
         affine_transform: Applies affine transformations to the input image.
         apply_bboxes: Transforms bounding boxes using the affine matrix.
         apply_segments: Transforms segments and generates new bounding boxes.
@@ -1014,35 +1037,21 @@ class RandomPerspective:
         self.border = border  # mosaic border
         self.pre_transform = pre_transform
 
-    def affine_transform(self, img, border):
+    def random_matrix(self, border):
         """
-        Applies a sequence of affine transformations centered around the image center.
-
-        This function performs a series of geometric transformations on the input image, including
-        translation, perspective change, rotation, scaling, and shearing. The transformations are
-        applied in a specific order to maintain consistency.
+        Samples a random perspective matrix centered on the frame of size self.size without borders.
 
         Args:
-            img (np.ndarray): Input image to be transformed.
             border (Tuple[int, int]): Border dimensions for the transformed image.
 
         Returns:
-            (Tuple[np.ndarray, np.ndarray, float]): A tuple containing:
-                - np.ndarray: Transformed image.
-                - np.ndarray: 3x3 transformation matrix.
-                - float: Scale factor applied during the transformation.
-
-        Examples:
-            >>> import numpy as np
-            >>> img = np.random.rand(100, 100, 3)
-            >>> border = (10, 10)
-            >>> transformed_img, matrix, scale = affine_transform(img, border)
+            (Tuple[np.ndarray, float]): The 3x3 transformation matrix and the scale factor it applies.
         """
         # Center
         C = np.eye(3, dtype=np.float32)
 
-        C[0, 2] = -img.shape[1] / 2  # x translation (pixels)
-        C[1, 2] = -img.shape[0] / 2  # y translation (pixels)
+        C[0, 2] = -(self.size[0] - border[1] * 2) / 2  # x translation (pixels)
+        C[1, 2] = -(self.size[1] - border[0] * 2) / 2  # y translation (pixels)
 
         # Perspective
         P = np.eye(3, dtype=np.float32)
@@ -1069,12 +1078,47 @@ class RandomPerspective:
 
         # Combined rotation matrix
         M = T @ S @ R @ P @ C  # order of operations (right to left) is IMPORTANT
+        return M, s
+
+    def affine_transform(self, img, border, pre=None):
+        """
+        Applies a sequence of affine transformations centered around the image center.
+
+        This function performs a series of geometric transformations on the input image, including
+        translation, perspective change, rotation, scaling, and shearing. The transformations are
+        applied in a specific order to maintain consistency.
+
+        Args:
+            img (np.ndarray): Input image to be transformed.
+            border (Tuple[int, int]): Border dimensions for the transformed image.
+            pre (np.ndarray | None): 3x3 matrix mapping `img` into the frame the transformations are centered on, e.g.
+                a resize and letterbox, applied within the same warp. The frame size is self.size without borders.
+
+        Returns:
+            (Tuple[np.ndarray, np.ndarray, float]): A tuple containing:
+                - np.ndarray: Transformed image.
+                - np.ndarray: 3x3 transformation matrix, including `pre`.
+                - float: Scale factor applied during the transformation.
+
+        Examples:
+            >>> import numpy as np
+            >>> img = np.random.rand(100, 100, 3)
+            >>> border = (10, 10)
+            >>> transformed_img, matrix, scale = affine_transform(img, border)
+        """
+        M, s = self.random_matrix(border)
+        Mi = M  # pixel index matrix of the image
+        if pre is not None:
+            Mi = pre.copy()  # resize about pixel centers like cv2.resize, x' = r * (x + 0.5) - 0.5 + pad
+            Mi[:2, 2] += 0.5 * (pre[:2, :2].sum(1) - 1)
+            Mi = M @ Mi
+            M = M @ pre
         # Affine image
-        if (border[0] != 0) or (border[1] != 0) or (M != np.eye(3)).any():  # image changed
+        if (border[0] != 0) or (border[1] != 0) or (Mi != np.eye(3)).any():  # image changed
             if self.perspective:
-                img = cv2.warpPerspective(img, M, dsize=self.size, borderValue=(114, 114, 114))
+                img = cv2.warpPerspective(img, Mi, dsize=self.size, borderValue=(114, 114, 114))
             else:  # affine
-                img = cv2.warpAffine(img, M[:2], dsize=self.size, borderValue=(114, 114, 114))
+                img = cv2.warpAffine(img, Mi[:2], dsize=self.size, borderValue=(114, 114, 114))
         return img, M, s
 
     def apply_bboxes(self, bboxes, M):
@@ -1217,11 +1261,17 @@ class RandomPerspective:
             >>> result = transform(labels)
             >>> assert result["img"].shape[:2] == result["resized_shape"]
         """
+        img = labels["img"]
+        pre, shape = None, img.shape[:2]
         if self.pre_transform and "mosaic_border" not in labels:
-            labels = self.pre_transform(labels)
+            if isinstance(self.pre_transform, LetterBox):  # resize and pad within the warp below
+                pre, shape = self.pre_transform.get_matrix(shape, labels.pop("rect_shape", None))
+            else:
+                labels = self.pre_transform(labels)
+                img = labels["img"]
+                shape = img.shape[:2]
         labels.pop("ratio_pad", None)  # do not need ratio pad
 
-        img = labels["img"]
         cls = labels["cls"]
         instances = labels.pop("instances")
         # Make sure the coord formats are right
@@ -1229,10 +1279,10 @@ class RandomPerspective:
         instances.denormalize(*img.shape[:2][::-1])
 
         border = labels.pop("mosaic_border", self.border)
-        self.size = img.shape[1] + border[1] * 2, img.shape[0] + border[0] * 2  # w, h
+        self.size = shape[1] + border[1] * 2, shape[0] + border[0] * 2  # w, h
         # M is affine matrix
         # Scale for func:`box_candidates`
-        img, M, scale = self.affine_transform(img, border)
+        img, M, scale = self.affine_transform(img, border, pre)
 
         bboxes = self.apply_bboxes(instances.bboxes, M)
 
@@ -1249,7 +1299,8 @@ class RandomPerspective:
         new_instances.clip(*self.size)
 
         # Filter instances
-        instances.scale(scale_w=scale, scale_h=scale, bbox_only=True)
+        sw, sh = (scale, scale) if pre is None else (scale * pre[0, 0], scale * pre[1, 1])
+        instances.scale(scale_w=sw, scale_h=sh, bbox_only=True)
         # Make the bboxes have the same scale with new_bboxes
         i = self.box_candidates(
             box1=instances.bboxes.T, box2=new_instances.bboxes.T, area_thr=0.01 if len(segments) else 0.10
@@ -1376,7 +1427,10 @@ class RandomHSV:
             lut_val = np.clip(x * r[2], 0, 255).astype(dtype)
 
             im_hsv = cv2.merge((cv2.LUT(hue, lut_hue), cv2.LUT(sat, lut_sat), cv2.LUT(val, lut_val)))
-            cv2.cvtColor(im_hsv, cv2.COLOR_HSV2BGR, dst=img)  # no return needed
+            if img.flags.writeable:
+                cv2.cvtColor(im_hsv, cv2.COLOR_HSV2BGR, dst=img)  # no return needed
+            else:  # read-only view of a mapped image cache
+                labels["img"] = cv2.cvtColor(im_hsv, cv2.COLOR_HSV2BGR)
         return labels
 
 
@@ -1459,12 +1513,12 @@ class RandomFlip:
         h = 1 if instances.normalized else h
         w = 1 if instances.normalized else w
 
-        # Flip up-down
+        # Flip up-down, cv2.flip() writes a contiguous copy much faster than np.ascontiguousarray(np.flipud(img))
         if self.direction == "vertical" and random.random() < self.p:
-            img = np.flipud(img)
+            img = cv2.flip(img, 0)
             instances.flipud(h)
         if self.direction == "horizontal" and random.random() < self.p:
-            img = np.fliplr(img)
+            img = cv2.flip(img, 1)
             instances.fliplr(w)
             # For keypoints
             if self.flip_idx is not None and instances.keypoints is not None:
@@ -1559,6 +1613,44 @@ class LetterBox:
         img = labels.get("img") if image is None else image
         shape = img.shape[:2]  # current shape [height, width]
         new_shape = labels.pop("rect_shape", self.new_shape)
+        if isinstance(new_shape, int):
+            new_shape = (new_shape, new_shape)
+        ratio, new_unpad, (top, bottom, left, right) = self.get_params(shape, new_shape)
+
+        if shape[::-1] != new_unpad:  # resize
+            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
+        img = cv2.copyMakeBorder(
+            img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
+        )  # add border
+        if labels.get("ratio_pad"):
+            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
+
+        if len(labels):
+            labels = self._update_labels(labels, ratio, left, top)
+            labels["img"] = img
+            labels["resized_shape"] = new_shape
+            return labels
+        else:
+            return img
+
+    def get_params(self, shape, new_shape=None):
+        """
+        Computes the scale ratios, resized shape and padding that letterboxing applies to an image of a given shape.
+
+        Args:
+            shape (Tuple[int, int]): Current image shape (height, width).
+            new_shape (int | Tuple[int, int] | None): Target shape (height, width), defaults to self.new_shape.
+
+        Returns:
+            ratio (Tuple[float, float]): Scaling ratios (width, height).
+            new_unpad (Tuple[int, int]): Resized image shape (width, height) before padding.
+            pad (Tuple[int, int, int, int]): Padding (top, bottom, left, right) in pixels.
+
+        Examples:
+            >>> letterbox = LetterBox(new_shape=(640, 640))
+            >>> ratio, new_unpad, (top, bottom, left, right) = letterbox.get_params((480, 640))
+        """
+        new_shape = self.new_shape if new_shape is None else new_shape
         if isinstance(new_shape, int):
             new_shape = (new_shape, new_shape)
 
@@ -1582,23 +1674,31 @@ class LetterBox:
             dw /= 2  # divide padding into 2 sides
             dh /= 2
 
-        if shape[::-1] != new_unpad:  # resize
-            img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
         top, bottom = int(round(dh - 0.1)) if self.center else 0, int(round(dh + 0.1))
         left, right = int(round(dw - 0.1)) if self.center else 0, int(round(dw + 0.1))
-        img = cv2.copyMakeBorder(
-            img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
-        )  # add border
-        if labels.get("ratio_pad"):
-            labels["ratio_pad"] = (labels["ratio_pad"], (left, top))  # for evaluation
+        return ratio, new_unpad, (top, bottom, left, right)
 
-        if len(labels):
-            labels = self._update_labels(labels, ratio, left, top)
-            labels["img"] = img
-            labels["resized_shape"] = new_shape
-            return labels
-        else:
-            return img
+    def get_matrix(self, shape, new_shape=None):
+        """
+        Computes letterboxing of an image of a given shape as a 3x3 matrix, for transforms that fold it into a warp.
+
+        Args:
+            shape (Tuple[int, int]): Current image shape (height, width).
+            new_shape (int | Tuple[int, int] | None): Target shape (height, width), defaults to self.new_shape.
+
+        Returns:
+            M (np.ndarray): 3x3 matrix mapping pixel coordinates of the image to the letterboxed image.
+            shape (Tuple[int, int]): Letterboxed image shape (height, width).
+
+        Examples:
+            >>> letterbox = LetterBox(new_shape=(640, 640))
+            >>> M, shape = letterbox.get_matrix((480, 1280))
+            >>> shape
+            (640, 640)
+        """
+        ratio, new_unpad, (top, bottom, left, right) = self.get_params(shape, new_shape)
+        M = np.array([[ratio[0], 0, left], [0, ratio[1], top], [0, 0, 1]], dtype=np.float32)
+        return M, (new_unpad[1] + top + bottom, new_unpad[0] + left + right)
 
     @staticmethod
     def _update_labels(labels, ratio, padw, padh):
@@ -1656,15 +1756,15 @@ class CopyPaste(BaseMixTransform):
         >>> augmented_labels = copypaste(original_labels)
     """
 
-    def __init__(self, dataset=None, pre_transform=None, p=0.5, mode="flip") -> None:
+    def __init__(self, dataset=None, pre_transform=None, p=0.5, mode="flip", buffer_p=0.0) -> None:
         """Initializes CopyPaste object with dataset, pre_transform, and probability of applying MixUp."""
-        super().__init__(dataset=dataset, pre_transform=pre_transform, p=p)
+        super().__init__(dataset=dataset, pre_transform=pre_transform, p=p, buffer_p=buffer_p)
         assert mode in {"flip", "mixup"}, f"Expected `mode` to be `flip` or `mixup`, but got {mode}."
         self.mode = mode
 
     def get_indexes(self):
         """Returns a list of random indexes from the dataset for CopyPaste augmentation."""
-        return random.randint(0, len(self.dataset) - 1)
+        return self.random_index()
 
     def _mix_transform(self, labels):
         """Applies Copy-Paste augmentation to combine objects from another image into the current image."""
@@ -1701,6 +1801,8 @@ class CopyPaste(BaseMixTransform):
     def _transform(self, labels1, labels2={}):
         """Applies Copy-Paste augmentation to combine objects from another image into the current image."""
         im = labels1["img"]
+        if not im.flags.writeable:  # read-only view of a mapped image cache
+            im = im.copy()
         cls = labels1["cls"]
         h, w = im.shape[:2]
         instances = labels1.pop("instances")
@@ -2081,10 +2183,9 @@ class Format:
 
         This function performs the following operations:
         1. Ensures the image has 3 dimensions (adds a channel dimension if needed).
-        2. Transposes the image from HWC to CHW format.
+        2. Splits the HWC image into contiguous CHW planes, one copy instead of a strided transpose.
         3. Optionally flips the color channels from RGB to BGR.
-        4. Converts the image to a contiguous array.
-        5. Converts the Numpy array to a PyTorch tensor.
+        4. Converts the Numpy array to a PyTorch tensor.
 
         Args:
             img (np.ndarray): Input image as a Numpy array with shape (H, W, C) or (H, W).
@@ -2101,8 +2202,8 @@ class Format:
         """
         if len(img.shape) < 3:
             img = np.expand_dims(img, -1)
-        img = img.transpose(2, 0, 1)
-        img = np.ascontiguousarray(img[::-1] if random.uniform(0, 1) > self.bgr else img)
+        planes = cv2.split(np.ascontiguousarray(img))  # CHW planes
+        img = np.stack(planes[::-1] if random.uniform(0, 1) > self.bgr else planes)
         img = torch.from_numpy(img)
         return img
 
@@ -2275,6 +2376,296 @@ class RandomLoadText:
         return labels
 
 
+class CanvasCrop(RandomPerspective):
+    """
+    Samples a RandomPerspective and crops the region of the image it will sample, for DeviceAugment to warp.
+
+    This is the dataloader half of batched device augmentation: with `hyp.device_augment` the workers only sample the
+    perspective matrix, then cut out the part of the mosaic canvas (or letterboxed image) that lands in the imgsz x
+    imgsz output, downscaling it when it is larger, and pad it to a fixed crop size. Batches of crops are about 4x
+    smaller than 2 * imgsz mosaic canvases to collate, pin and copy to the device, where DeviceAugment warps them by the
+    per-sample matrix stored in labels['affine'], which maps the crop to the output.
+
+    Attributes:
+        imgsz (int): Training image size.
+        crop_size (int): Side of the square crops, imgsz plus a margin of 8 so that crops at scale 1 are never resized.
+            8 is a multiple of the usual mask ratios, so masks of crops map onto masks of imgsz images exactly.
+        pre_transform (LetterBox | None): Letterbox of non-mosaic images, folded into the matrix, or None for images
+            stretched to imgsz by the dataset.
+
+    Examples:
+        >>> crop = CanvasCrop(640, degrees=0.0, translate=0.1, scale=0.5)
+        >>> labels = crop({"img": np.zeros((480, 640, 3), np.uint8), "instances": Instances(np.zeros((0, 4)))})
+        >>> labels["img"].shape, labels["affine"].shape
+        ((648, 648, 3), torch.Size([3, 3]))
+    """
+
+    def __init__(self, imgsz=640, degrees=0.0, translate=0.1, scale=0.5, shear=0.0, perspective=0.0, stretch=False):
+        """Initializes CanvasCrop for a training image size and RandomPerspective ranges, stretch skips LetterBox."""
+        pre_transform = None if stretch else LetterBox((imgsz, imgsz))
+        super().__init__(degrees, translate, scale, shear, perspective, pre_transform=pre_transform)
+        self.imgsz = imgsz
+        self.crop_size = imgsz + 8
+
+    def __call__(self, labels):
+        """Crops the image of `labels` and moves instances into the crop, adding 'affine' and 'affine_scale'."""
+        img = labels["img"]
+        h, w = img.shape[:2]
+        pre = np.eye(3, dtype=np.float32)
+        if "mosaic_border" in labels:
+            border = labels.pop("mosaic_border")
+            self.size = w + border[1] * 2, h + border[0] * 2
+        elif self.pre_transform is None:  # stretched to imgsz by the dataset, like RandomPerspective without LetterBox
+            border, self.size = (0, 0), (w, h)
+        else:
+            pre, shape = self.pre_transform.get_matrix((h, w), labels.pop("rect_shape", None))
+            border, self.size = (0, 0), shape[::-1]
+        labels.pop("ratio_pad", None)
+        Mi = pre.copy()  # resize about pixel centers like cv2.resize, as in RandomPerspective.affine_transform()
+        Mi[:2, 2] += 0.5 * (pre[:2, :2].sum(1) - 1)
+        M, scale = self.random_matrix(border)
+        M = M @ Mi
+
+        # Region of the image sampled by the output, with a pixel of margin for interpolation
+        s, c = self.imgsz, self.crop_size
+        xy = np.array([[0, 0, 1], [s, 0, 1], [0, s, 1], [s, s, 1]], dtype=np.float32) @ np.linalg.inv(M).T
+        xy = xy[:, :2] / xy[:, 2:]
+        x0, y0 = (np.floor(xy.min(0)) - 1).clip(0, (w - 1, h - 1)).astype(int)
+        x1, y1 = (np.ceil(xy.max(0)) + 1).clip((x0 + 1, y0 + 1), (w, h)).astype(int)
+        crop = img[y0:y1, x0:x1]
+        r = c / max(x1 - x0, y1 - y0)
+        if r < 1:  # output samples the region at less than full resolution
+            dsize = max(round((x1 - x0) * r), 1), max(round((y1 - y0) * r), 1)
+            crop = cv2.resize(crop, dsize, interpolation=cv2.INTER_AREA)
+        ch, cw = crop.shape[:2]
+        labels["img"] = cv2.copyMakeBorder(crop, 0, c - ch, 0, c - cw, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+
+        rw, rh = cw / (x1 - x0), ch / (y1 - y0)
+        A = np.array(  # image to crop pixel indices, as resized by cv2.resize()
+            [[rw, 0, rw * (0.5 - x0) - 0.5], [0, rh, rh * (0.5 - y0) - 0.5], [0, 0, 1]], dtype=np.float32
+        )
+        L = A @ np.linalg.inv(Mi) @ pre  # image to crop coordinates of labels, mapped by M like in RandomPerspective
+        instances = labels["instances"]
+        instances.convert_bbox(format="xyxy")
+        instances.denormalize(w, h)
+        instances.scale(L[0, 0], L[1, 1])
+        instances.add_padding(L[0, 2], L[1, 2])
+        labels["affine"] = torch.from_numpy(M @ np.linalg.inv(A))  # crop to output
+        labels["affine_scale"] = torch.tensor([scale * pre[0, 0] / rw, scale * pre[1, 1] / rh], dtype=torch.float32)
+        return labels
+
+
+class DeviceAugment:
+    """
+    Batched RandomPerspective, MixUp, RandomHSV and RandomFlip as torch ops on the device that holds the batch.
+
+    Dataloader workers built by `v8_transforms` with `hyp.device_augment` only load, mosaic and crop images to the
+    region their random perspective samples (see CanvasCrop); the trainer then calls this on every batch after moving
+    images to the device, so the per-pixel warps and color jitter run as a few batched kernels instead of per-sample
+    cv2 calls. Boxes, keypoints and instance masks are transformed along with the images, and instances are filtered
+    like in RandomPerspective. Works on CPU and CUDA alike. OBB labels are not supported.
+
+    Differences to the worker pipeline: boxes of segments are transformed from box corners rather than polygons, which
+    is identical without rotation, shear and perspective; masks are rasterized before the warp and resampled nearest;
+    MixUp mixes each selected image with the next image of the batch; Albumentations are not applied.
+
+    Attributes:
+        imgsz (int): Output image size.
+        mixup (float): MixUp probability per image.
+        hgain, sgain, vgain (float): RandomHSV gains.
+        flipud, fliplr (float): RandomFlip probabilities.
+        flip_idx (List[int] | None): Keypoint order after a horizontal flip.
+        overlap_mask (bool): Whether masks are per-image instance id maps, as with Format(mask_overlap=True).
+
+    Examples:
+        >>> augment = DeviceAugment(640, hyp, flip_idx=data.get("flip_idx"))
+        >>> batch["img"] = batch["img"].to("cuda").float() / 255  # (B, 3, 648, 648) crops
+        >>> batch = augment(batch)  # (B, 3, 640, 640) augmented images and labels
+    """
+
+    def __init__(self, imgsz, hyp, flip_idx=None):
+        """Initializes DeviceAugment with the training image size and augmentation hyperparameters."""
+        self.imgsz = imgsz
+        self.mixup = hyp.mixup
+        self.hgain, self.sgain, self.vgain = hyp.hsv_h, hyp.hsv_s, hyp.hsv_v
+        self.flipud, self.fliplr = hyp.flipud, hyp.fliplr
+        self.flip_idx = flip_idx or None
+        self.overlap_mask = hyp.overlap_mask
+
+    def __call__(self, batch, size=None):
+        """
+        Augments a collated batch of float crops in place of the worker-side transforms.
+
+        Args:
+            batch (Dict): Collated batch with 'img' as float (B, C, H, W) crops in 0-1, 'affine' (B, 3, 3) crop to
+                output matrices and 'affine_scale' (B, 2) from CanvasCrop, and normalized xywh 'bboxes', 'cls',
+                'batch_idx' and optional 'keypoints' and 'masks' as produced by Format.
+            size (Tuple[int, int] | None): Output image (height, width), e.g. for multi-scale training, which the warp
+                samples directly. Defaults to (imgsz, imgsz); labels are normalized either way.
+
+        Returns:
+            (Dict): The batch with (B, C, *size) images and labels in Format's output convention.
+        """
+        img = batch["img"]
+        device, (b, _, h, w), s = img.device, img.shape, self.imgsz
+        idx = batch["batch_idx"].to(device).long()
+        boxes = xywh2xyxy(batch["bboxes"].to(device).float()) * torch.tensor([w, h, w, h], device=device)
+        cls = batch["cls"].to(device)
+        kpts = batch.get("keypoints")
+        if kpts is not None:
+            kpts = kpts.to(device).float() * torch.tensor([w, h, 1], device=device)
+        masks = batch.get("masks")
+        overlap = masks is not None and self.overlap_mask  # (B, h, w) instance ids instead of (N, h, w) masks
+        if masks is not None:
+            masks = masks.to(device)
+
+        # Random perspective
+        M, scale = batch.pop("affine").to(device), batch.pop("affine_scale").to(device)
+        img = self.warp(img, M, (h, w), size or (s, s), mode="bilinear", fill=114 / 255)
+        xy = torch.cat((boxes[:, [0, 1, 2, 3, 0, 3, 2, 1]].view(-1, 4, 2), boxes.new_ones(len(boxes), 4, 1)), -1)
+        xy = xy @ M[idx].transpose(1, 2)
+        xy = xy[..., :2] / xy[..., 2:]
+        new = torch.cat((xy.amin(1), xy.amax(1)), -1).clamp(0, s)
+        keep = self.box_candidates(
+            (boxes[:, 2:] - boxes[:, :2]) * scale[idx],
+            new[:, 2:] - new[:, :2],
+            0.01 if masks is not None else 0.1,
+        )
+        if kpts is not None:
+            xy = torch.cat((kpts[..., :2], torch.ones_like(kpts[..., :1])), -1) @ M[idx].transpose(1, 2)
+            kpts = torch.cat((xy[..., :2] / xy[..., 2:], kpts[..., 2:]), -1)
+            out = (kpts[..., 0] < 0) | (kpts[..., 1] < 0) | (kpts[..., 0] > s) | (kpts[..., 1] > s)
+            kpts[..., 2][out] = 0
+        if masks is not None:
+            hm, wm = masks.shape[-2:]
+            mm = M if overlap else M[idx]
+            masks = self.warp(masks[:, None].float(), mm, (h, w), (s * hm // h, s * wm // w), mode="nearest")
+            masks = masks[:, 0].round()
+        boxes, cls, idx = new[keep], cls[keep], idx[keep]
+        kpts = kpts[keep] if kpts is not None else None
+        if masks is not None:
+            masks = self.remap_overlap(masks, keep, batch["batch_idx"].to(device).long(), b) if overlap else masks[keep]
+
+        # MixUp with the next image of the batch
+        if self.mixup and b > 1:
+            sel = torch.rand(b, device=device) < self.mixup
+            if sel.any():
+                r = torch.distributions.Beta(32.0, 32.0).sample((b,)).to(device).view(b, 1, 1, 1)
+                nxt = torch.arange(1, b + 1, device=device) % b
+                img = torch.where(sel.view(b, 1, 1, 1), img * r + img[nxt] * (1 - r), img)
+                prev = (idx - 1) % b  # image that each instance is mixed into
+                j = sel[prev]
+                if overlap:
+                    n = torch.bincount(idx, minlength=b)  # instances per image before mixing
+                    m2 = masks[nxt]
+                    masks = torch.where(
+                        sel.view(b, 1, 1) & (masks == 0) & (m2 > 0), m2 + n.view(b, 1, 1).to(m2.dtype), masks
+                    )
+                elif masks is not None:
+                    masks = torch.cat((masks, masks[j]), 0)
+                boxes, cls, idx = torch.cat((boxes, boxes[j])), torch.cat((cls, cls[j])), torch.cat((idx, prev[j]))
+                if kpts is not None:
+                    kpts = torch.cat((kpts, kpts[j]), 0)
+
+        # HSV color-space jitter
+        if (self.hgain or self.sgain or self.vgain) and img.shape[1] == 3:
+            gain = (
+                torch.empty(b, 3, device=device).uniform_(-1, 1)
+                * torch.tensor([self.hgain, self.sgain, self.vgain], device=device)
+                + 1
+            )
+            img = self.hsv_jitter(img, gain)
+
+        # Flips
+        for p, dim, k in ((self.flipud, -2, 1), (self.fliplr, -1, 0)):
+            if p:
+                sel = torch.rand(b, device=device) < p
+                img = torch.where(sel.view(b, 1, 1, 1), img.flip(dim), img)
+                j = sel[idx]
+                boxes[j, k], boxes[j, k + 2] = s - boxes[j, k + 2], s - boxes[j, k]
+                if kpts is not None:
+                    kpts[j, :, k] = s - kpts[j, :, k]
+                    if k == 0 and self.flip_idx is not None:
+                        kpts[j] = kpts[j][:, self.flip_idx]
+                if masks is not None:
+                    masks = torch.where((sel if overlap else j).view(-1, 1, 1), masks.flip(dim), masks)
+
+        batch["img"] = img
+        batch["bboxes"] = xyxy2xywh(boxes) / s
+        batch["cls"] = cls
+        batch["batch_idx"] = idx.to(batch["batch_idx"].dtype)
+        if kpts is not None:
+            batch["keypoints"] = kpts / torch.tensor([s, s, 1], device=device)
+        if masks is not None:
+            batch["masks"] = masks
+        return batch
+
+    def warp(self, x, M, hw, size, mode="bilinear", fill=0.0):
+        """
+        Resamples (N, C, H', W') maps covering an (h, w) crop by the inverse of M, like cv2.warpPerspective.
+
+        Args:
+            x (torch.Tensor): Images or masks at any resolution H', W' of the crop.
+            M (torch.Tensor): (N, 3, 3) matrices from crop to imgsz x imgsz output pixel coordinates.
+            hw (Tuple[int, int]): Crop height and width in pixels, the coordinate frame of M.
+            size (Tuple[int, int]): Output resolution covering the imgsz x imgsz output.
+            mode (str): 'bilinear' for images or 'nearest' for masks.
+            fill (float): Value of pixels mapped from outside the crop.
+
+        Returns:
+            (torch.Tensor): Warped maps of shape (N, C, *size).
+        """
+        (h, w), (ho, wo), s = hw, size, self.imgsz
+        ys = (torch.arange(ho, device=x.device) + 0.5) * (s / ho) - 0.5  # output pixel centers in imgsz frame
+        xs = (torch.arange(wo, device=x.device) + 0.5) * (s / wo) - 0.5
+        gy, gx = torch.meshgrid(ys, xs, indexing="ij")
+        p = torch.stack((gx, gy, torch.ones_like(gx)), -1).view(1, -1, 3)
+        q = p @ torch.linalg.inv(M).transpose(1, 2)  # crop pixel coordinates
+        q = q[..., :2] / q[..., 2:]
+        grid = (q + 0.5) * (2 / torch.tensor([w, h], device=x.device)) - 1  # align_corners=False normalization
+        out = F.grid_sample(x - fill, grid.view(-1, ho, wo, 2), mode=mode, padding_mode="zeros", align_corners=False)
+        return out + fill
+
+    @staticmethod
+    def box_candidates(wh1, wh2, area_thr=0.1, wh_thr=2, ar_thr=100, eps=1e-16):
+        """Returns a mask of boxes kept after augmentation, the torch twin of RandomPerspective.box_candidates()."""
+        (w1, h1), (w2, h2) = wh1.unbind(-1), wh2.unbind(-1)
+        ar = torch.maximum(w2 / (h2 + eps), h2 / (w2 + eps))  # aspect ratio
+        return (w2 > wh_thr) & (h2 > wh_thr) & (w2 * h2 / (w1 * h1 + eps) > area_thr) & (ar < ar_thr)
+
+    @staticmethod
+    def remap_overlap(masks, keep, idx, b):
+        """Renumbers (B, h, w) instance id masks after dropping instances, ids being 1-based positions per image."""
+        counts = torch.bincount(idx, minlength=b)
+        starts = torch.cumsum(counts, 0) - counts
+        pos = torch.arange(len(idx), device=idx.device) - starts[idx]  # position of each instance in its image
+        k = keep.long()
+        ck = torch.cumsum(k, 0)
+        new = (ck - (ck - k)[starts[idx]]) * k  # 1-based position among kept instances, 0 if dropped
+        lut = torch.zeros(b, int(counts.max()) + 1 if len(idx) else 1, dtype=torch.long, device=masks.device)
+        lut[idx, pos + 1] = new
+        ids = masks.long().clamp(0, lut.shape[1] - 1)
+        return lut.gather(1, ids.view(b, -1)).view_as(masks).to(masks.dtype)
+
+    @staticmethod
+    def hsv_jitter(img, gain):
+        """Scales hue, saturation and value of (B, 3, H, W) RGB images in 0-1 by (B, 3) gains, like RandomHSV."""
+        r, g, b = img.unbind(1)
+        v, vi = img.max(1)
+        d = v - img.amin(1)
+        dd = d.clamp(min=1e-8)
+        h = torch.where(vi == 0, ((g - b) / dd) % 6, torch.where(vi == 1, (b - r) / dd + 2, (r - g) / dd + 4)) / 6
+        h = torch.where(d > 0, h, 0.0)
+        sat = d / v.clamp(min=1e-8)
+        gain = gain.view(-1, 3, 1, 1)
+        h, sat, v = (h * gain[:, 0]) % 1, (sat * gain[:, 1]).clamp(0, 1), (v * gain[:, 2]).clamp(0, 1)
+        rgb = []
+        for n in (5, 3, 1):  # f(n) = v - v * s * max(0, min(k, 4 - k, 1)) with k = (n + 6 * h) % 6
+            k = (n + h * 6) % 6
+            rgb.append(v - v * sat * torch.minimum(k, 4 - k).clamp(0, 1))
+        return torch.stack(rgb, 1)
+
+
 def v8_transforms(dataset, imgsz, hyp, stretch=False):
     """
     Applies a series of image transformations for training.
@@ -2289,7 +2680,8 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         stretch (bool): If True, applies stretching to the image. If False, uses LetterBox resizing.
 
     Returns:
-        (Compose): A composition of image transformations to be applied to the dataset.
+        (Compose): A composition of image transformations to be applied to the dataset. With `hyp.device_augment` it
+            stops at mosaic, copy-paste and CanvasCrop, leaving the rest to DeviceAugment on the training device.
 
     Examples:
         >>> from ultralytics.data.dataset import YOLODataset
@@ -2300,14 +2692,17 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         >>> augmented_data = transforms(dataset[0])
     """
     mosaic = Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic)
-    affine = RandomPerspective(
-        degrees=hyp.degrees,
-        translate=hyp.translate,
-        scale=hyp.scale,
-        shear=hyp.shear,
-        perspective=hyp.perspective,
-        pre_transform=None if stretch else LetterBox(new_shape=(imgsz, imgsz)),
-    )
+    if hyp.device_augment:  # RandomPerspective, MixUp, RandomHSV and RandomFlip run batched in DeviceAugment
+        affine = CanvasCrop(imgsz, hyp.degrees, hyp.translate, hyp.scale, hyp.shear, hyp.perspective, stretch)
+    else:
+        affine = RandomPerspective(
+            degrees=hyp.degrees,
+            translate=hyp.translate,
+            scale=hyp.scale,
+            shear=hyp.shear,
+            perspective=hyp.perspective,
+            pre_transform=None if stretch else LetterBox(new_shape=(imgsz, imgsz)),
+        )
 
     pre_transform = Compose([mosaic, affine])
     if hyp.copy_paste_mode == "flip":
@@ -2319,6 +2714,7 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
                 pre_transform=Compose([Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic), affine]),
                 p=hyp.copy_paste,
                 mode=hyp.copy_paste_mode,
+                buffer_p=hyp.buffer_bias,
             )
         )
     flip_idx = dataset.data.get("flip_idx", [])  # for keypoints augmentation
@@ -2330,10 +2726,12 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         elif flip_idx and (len(flip_idx) != kpt_shape[0]):
             raise ValueError(f"data.yaml flip_idx={flip_idx} length must be equal to kpt_shape[0]={kpt_shape[0]}")
 
+    if hyp.device_augment:  # Albumentations are skipped, they would run before the warp on the device
+        return Compose([pre_transform])
     return Compose(
         [
             pre_transform,
-            MixUp(dataset, pre_transform=pre_transform, p=hyp.mixup),
+            MixUp(dataset, pre_transform=pre_transform, p=hyp.mixup, buffer_p=hyp.buffer_bias),
             Albumentations(p=1.0),
             RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v),
             RandomFlip(direction="vertical", p=hyp.flipud),
@@ -1,5 +1,6 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import atexit
 import glob
 import math
 import os
@@ -14,8 +15,19 @@ import numpy as np
 import psutil
 from torch.utils.data import Dataset
 
-from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS
+from ultralytics.data.utils import (
+    CACHE_CODECS,
+    FORMATS_HELP_MSG,
+    HELP_URL,
+    IMG_FORMATS,
+    ImageBuffer,
+    LabelStore,
+    decode_image,
+    encode_image,
+    get_hash,
+)
 from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
+from ultralytics.utils.checks import check_requirements
 
 
 class BaseDataset(Dataset):
@@ -25,7 +37,8 @@ class BaseDataset(Dataset):
     Args:
         img_path (str): Path to the folder containing images.
         imgsz (int, optional): Image size. Defaults to 640.
-        cache (bool, optional): Cache images to RAM or disk during training. Defaults to False.
+        cache (bool | str, optional): Cache images to RAM or disk during training, or compressed to RAM with 'jpg',
+            'webp', 'png', 'lz4' or 'zstd'. Defaults to False.
         augment (bool, optional): If True, data augmentation is applied. Defaults to True.
         hyp (dict, optional): Hyperparameters to apply data augmentation. Defaults to None.
         prefix (str, optional): Prefix to print in log messages. Defaults to ''.
@@ -39,10 +52,17 @@ class BaseDataset(Dataset):
 
     Attributes:
         im_files (list): List of image file paths.
-        labels (list): List of label data dictionaries.
+        labels (list | LabelStore): List of label data dictionaries, or a columnar LabelStore of them.
         ni (int): Number of images in the dataset.
         ims (list): List of loaded images.
+        im_bufs (list): List of compressed images, original and resized shapes for compressed RAM caching.
+        cache_file (Path | None): Index file of the packed image cache, in node-local shared memory for cache='ram' or
+            in the `cache_dir` directory for cache='disk'.
         npy_files (list): List of numpy file paths.
+        defer_resize (bool): If True, load_image() returns uncached images at original size with their planned resized
+            shape, and the RandomPerspective warp of the transforms resizes them, see build_transforms(). These are
+            buffered at original size only if `buffer_deferred`.
+        buffer_deferred (bool): If True, deferred images are buffered for mix transforms that draw from the buffer.
         transforms (callable): Image transformation function.
     """
 
@@ -70,6 +90,7 @@ class BaseDataset(Dataset):
         self.single_cls = single_cls
         self.prefix = prefix
         self.fraction = fraction
+        self.deep_verify = bool(getattr(hyp, "deep_verify", False))  # PIL verify() images in label scans
         self.im_files = self.get_img_files(self.img_path)
         self.labels = self.get_labels()
         self.update_labels(include_class=classes)  # single_cls and include_class
@@ -82,16 +103,23 @@ class BaseDataset(Dataset):
             assert self.batch_size is not None
             self.set_rectangle()
 
-        # Buffer thread for mosaic images
-        self.buffer = []  # buffer size = batch size
+        # LRU buffer of decoded images for mosaic partners, bounded by image count and optionally by bytes
         self.max_buffer_length = min((self.ni, self.batch_size * 8, 1000)) if self.augment else 0
+        self.buffer = ImageBuffer(self.max_buffer_length, int(getattr(hyp, "buffer_mb", 0) or 0) << 20)
+        self.defer_resize = self.buffer_deferred = False  # until build_transforms()
 
-        # Cache images (options are cache = True, False, None, "ram", "disk")
+        # Cache images (options are cache = True, False, None, "ram", "disk", or compressed "jpg", "webp", "png",
+        # "lz4", "zstd")
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
+        self.im_bufs = [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
         self.cache = cache.lower() if isinstance(cache, str) else "ram" if cache is True else None
-        if self.cache == "ram" and self.check_cache_ram():
-            if hyp.deterministic:
+        if self.cache in {"lz4", "zstd"}:
+            check_requirements({"lz4": "lz4", "zstd": "zstandard"}[self.cache])
+        self.cache_dir = getattr(hyp, "cache_dir", None)
+        self.cache_file = self.get_cache_file()
+        if self.cache in {"ram", *CACHE_CODECS} and self.check_cache_ram():
+            if self.cache == "ram" and hyp.deterministic:
                 LOGGER.warning(
                     "WARNING ⚠️ cache='ram' may produce non-deterministic training results. "
                     "Consider cache='disk' as a deterministic alternative if your disk space allows."
@@ -131,6 +159,11 @@ class BaseDataset(Dataset):
 
     def update_labels(self, include_class: Optional[list]):
         """Update labels to include only these classes (optional)."""
+        if isinstance(self.labels, LabelStore):
+            if include_class is not None:
+                self.labels = self.labels.filter_classes(include_class)
+            self.labels.single_cls |= self.single_cls
+            return
         include_class_array = np.array(include_class).reshape(1, -1)
         for i in range(len(self.labels)):
             if include_class is not None:
@@ -151,7 +184,14 @@ class BaseDataset(Dataset):
     def load_image(self, i, rect_mode=True):
         """Loads 1 image from dataset index 'i', returns (im, resized hw)."""
         im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
+        if im is None and self.im_bufs[i] is not None:  # compressed RAM cache of the resized image
+            buffer, hw0, shape = self.im_bufs[i]
+            if self.augment:
+                self.buffer.put(i, None)  # index-only, loaded from the cache again as a mosaic partner
+            return decode_image(buffer, self.cache, shape), hw0, shape[:2]
         if im is None:  # not cached in RAM
+            if self.augment and not self.cache and (x := self.buffer.get(i)) is not None:  # recently loaded
+                return x
             if fn.exists():  # load npy
                 try:
                     im = np.load(fn)
@@ -165,79 +205,202 @@ class BaseDataset(Dataset):
                 raise FileNotFoundError(f"Image Not Found {f}")
 
             h0, w0 = im.shape[:2]  # orig hw
+            hw = None  # resized hw if the resize is deferred to the augmentation warp
             if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
                 r = self.imgsz / max(h0, w0)  # ratio
                 if r != 1:  # if sizes are not equal
                     w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
-                    im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+                    if self.defer_resize:  # keep the full-size image, resized by the augmentation warp
+                        hw = (h, w)
+                    else:
+                        im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
             elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
                 im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
 
-            # Add to buffer if training with augmentations
-            if self.augment:
-                self.ims[i], self.im_hw0[i], self.im_hw[i] = im, (h0, w0), im.shape[:2]  # im, hw_original, hw_resized
-                self.buffer.append(i)
-                if 1 < len(self.buffer) >= self.max_buffer_length:  # prevent empty buffer
-                    j = self.buffer.pop(0)
-                    if self.cache != "ram":
-                        self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
+            # Add to buffer if training with augmentations and not loading images into a cache, deferred images at
+            # full size only when a mix transform draws from the buffer
+            if self.augment and not self.cache and (hw is None or self.buffer_deferred):
+                self.buffer.put(i, (im, (h0, w0), hw or im.shape[:2]))  # im, hw_original, hw_resized
 
-            return im, (h0, w0), im.shape[:2]
+            return im, (h0, w0), hw or im.shape[:2]
 
+        if self.augment:
+            self.buffer.put(i, None)  # index-only, loaded from the cache again as a mosaic partner
         return self.ims[i], self.im_hw0[i], self.im_hw[i]
 
     def cache_images(self):
         """Cache images to memory or disk."""
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        fcn, storage = (self.cache_images_to_disk, "Disk") if self.cache == "disk" else (self.load_image, "RAM")
+        if self.cache_file:
+            if not self.cache_file.exists():  # first rank on this node
+                self.cache_images_to_file()
+            return self.load_cache_file()
+        if self.cache == "ram":
+            fcn, storage = self.load_image, "RAM"
+        else:  # compressed RAM
+            fcn, storage = self.cache_image_to_buffer, f"RAM {self.cache}"
         with ThreadPool(NUM_THREADS) as pool:
             results = pool.imap(fcn, range(self.ni))
             pbar = TQDM(enumerate(results), total=self.ni, disable=LOCAL_RANK > 0)
             for i, x in pbar:
-                if self.cache == "disk":
-                    b += self.npy_files[i].stat().st_size
-                else:  # 'ram'
+                if self.cache == "ram":
                     self.ims[i], self.im_hw0[i], self.im_hw[i] = x  # im, hw_orig, hw_resized = load_image(self, i)
                     b += self.ims[i].nbytes
+                else:  # compressed RAM
+                    self.im_bufs[i] = x  # buffer, hw_orig, shape_resized = cache_image_to_buffer(self, i)
+                    b += len(x[0])
                 pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB {storage})"
             pbar.close()
+        self.fill_buffer()
 
-    def cache_images_to_disk(self, i):
-        """Saves an image as an *.npy file for faster loading."""
-        f = self.npy_files[i]
-        if not f.exists():
-            np.save(f.as_posix(), cv2.imread(self.im_files[i]), allow_pickle=False)
+    def get_cache_file(self):
+        """
+        Return the index file path of the packed image cache of this dataset, or None if not used.
+
+        cache='ram' uses node-local shared memory in /dev/shm when available, cache='disk' the `cache_dir` directory,
+        defaulting to the image directory.
+        """
+        if self.cache == "ram":
+            d = Path("/dev/shm")
+            if not (d.is_dir() and os.access(d, os.W_OK)):
+                return None
+            self.remove_stale_cache_files(d)
+        elif self.cache == "disk":
+            d = Path(self.cache_dir or Path(self.im_files[0]).parent)
+        else:
+            return None
+        return d / f"ultralytics-{get_hash(self.im_files + [str(self.imgsz)])[:16]}.npy"
+
+    def cache_images_to_file(self):
+        """
+        Cache resized images to a single packed file that all DDP ranks and dataloader workers map.
+
+        Images are appended to a *.bin file next to the index file, which is written last, when the cache is complete.
+        Files are written under names tagged with the PID of this process and renamed into place. Shared-memory caches
+        are removed when the process that created them exits, processes that mapped them keep their mappings; a *.pid
+        file records the owner so that caches of killed processes are removed by remove_stale_cache_files().
+        """
+        b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
+        storage = "shared RAM" if self.cache == "ram" else "Disk"
+        f, index = self.cache_file.with_suffix(".bin"), np.zeros((self.ni, 6), dtype=np.int64)
+        tmp = [x.with_name(f".{x.stem}.{os.getpid()}{x.suffix}") for x in (f, self.cache_file)]
+        with open(tmp[0], "wb") as file, ThreadPool(NUM_THREADS) as pool:
+            pbar = TQDM(enumerate(pool.imap(self.load_image, range(self.ni))), total=self.ni, disable=LOCAL_RANK > 0)
+            for i, (im, hw0, _) in pbar:
+                index[i] = b, *im.shape[:2], im.shape[2] if im.ndim == 3 else 0, *hw0  # offset, h, w, c, h0, w0
+                file.write(np.ascontiguousarray(im).data)
+                b += im.nbytes
+                pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB {storage})"
+            pbar.close()
+        if self.cache == "ram":
+            pid_file = self.cache_file.with_suffix(".pid")
+            pid_file.write_text(str(os.getpid()))
+            atexit.register(lambda: [x.unlink(missing_ok=True) for x in (self.cache_file, f, pid_file)])
+        os.replace(tmp[0], f)
+        np.save(tmp[1], index)
+        os.replace(tmp[1], self.cache_file)
+        if self.cache == "disk":
+            LOGGER.info(
+                f"{self.prefix}Cached images to {f}, caches of other dataset versions are not removed automatically, "
+                f"delete unused ultralytics-*.npy and *.bin files in {f.parent} to free disk space"
+            )
+
+    @staticmethod
+    def remove_stale_cache_files(d):
+        """Remove packed shared-memory image caches in `d` whose owner process exited without removing them."""
+
+        def alive(pid):
+            """Returns whether process `pid` is running."""
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return False
+            except (PermissionError, OverflowError):
+                return True  # running under another user, or not a PID we can check
+            return True
+
+        stale = []
+        for x in d.glob(".ultralytics-*"):  # partial caches named .ultralytics-<hash>.<pid>.<suffix>
+            pid = x.stem.rsplit(".", 1)[-1]
+            if pid.isdigit() and not alive(int(pid)):
+                stale.append(x)
+        for x in d.glob("ultralytics-*.bin"):  # complete caches, owner recorded in ultralytics-<hash>.pid
+            pid_file = x.with_suffix(".pid")
+            try:
+                pid = int(pid_file.read_text())
+            except (OSError, ValueError):
+                pid = None  # no owner, i.e. written by an older version
+            if pid is None or not alive(pid):
+                stale += [x.with_suffix(".npy"), x, pid_file]
+        n = 0
+        for x in stale:
+            try:
+                x.unlink()
+                n += 1
+            except OSError:
+                pass  # already removed, or owned by another user
+        if n:
+            LOGGER.info(f"Removed {n} stale image cache files from {d}")
+
+    def load_cache_file(self):
+        """Map the images of the packed image cache zero-copy as read-only views, copied by the first in-place write."""
+        index = np.load(self.cache_file)
+        data = np.memmap(self.cache_file.with_suffix(".bin"), dtype=np.uint8, mode="r").view(np.ndarray)
+        for i, (o, h, w, c, h0, w0) in enumerate(index.tolist()):
+            self.ims[i] = data[o : o + h * w * max(c, 1)].reshape((h, w, c) if c else (h, w))
+            self.im_hw0[i], self.im_hw[i] = (h0, w0), (h, w)
+        self.fill_buffer()
+        LOGGER.info(f"{self.prefix}Mapped {self.ni} cached images from {self.cache_file.with_suffix('.bin')}")
+
+    def fill_buffer(self):
+        """Seed the mosaic buffer with index-only entries of random cached images, rotated by load_image() hits."""
+        for i in random.sample(range(self.ni), self.max_buffer_length):
+            self.buffer.put(i, None)
+
+    def cache_image_to_buffer(self, i):
+        """Loads and resizes image 'i' and returns it compressed, with its original hw and resized shape."""
+        im, hw0, _ = self.load_image(i)
+        return encode_image(im, self.cache), hw0, im.shape
 
     def check_cache_disk(self, safety_margin=0.5):
         """Check image caching requirements vs available disk space."""
         import shutil
 
+        if self.cache_file.exists():
+            return True  # already cached, i.e. by another rank
+        d = self.cache_file.parent
+        try:
+            d.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass  # reported as not writeable below
+        if not os.access(d, os.W_OK):
+            self.cache = None
+            LOGGER.info(f"{self.prefix}Skipping caching images to disk, {d} not writeable, set 'cache_dir' ⚠️")
+            return False
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
         n = min(self.ni, 30)  # extrapolate from 30 random images
         for _ in range(n):
-            im_file = random.choice(self.im_files)
-            im = cv2.imread(im_file)
+            im = cv2.imread(random.choice(self.im_files))  # sample image
             if im is None:
                 continue
-            b += im.nbytes
-            if not os.access(Path(im_file).parent, os.W_OK):
-                self.cache = None
-                LOGGER.info(f"{self.prefix}Skipping caching images to disk, directory not writeable ⚠️")
-                return False
+            b += im.nbytes * (self.imgsz / max(im.shape[0], im.shape[1])) ** 2  # resized
         disk_required = b * self.ni / n * (1 + safety_margin)  # bytes required to cache dataset to disk
-        total, used, free = shutil.disk_usage(Path(self.im_files[0]).parent)
+        total, used, free = shutil.disk_usage(d)
         if disk_required > free:
             self.cache = None
             LOGGER.info(
                 f"{self.prefix}{disk_required / gb:.1f}GB disk space required, "
                 f"with {int(safety_margin * 100)}% safety margin but only "
-                f"{free / gb:.1f}/{total / gb:.1f}GB free, not caching images to disk ⚠️"
+                f"{free / gb:.1f}/{total / gb:.1f}GB free, not caching images to disk ⚠️ "
+                f"Caches of other dataset versions are kept, delete unused ultralytics-*.npy and *.bin files in {d}"
             )
             return False
         return True
 
     def check_cache_ram(self, safety_margin=0.5):
         """Check image caching requirements vs available memory."""
+        if self.cache_file and self.cache_file.exists():
+            return True  # already cached in shared memory by another rank on this node
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
         n = min(self.ni, 30)  # extrapolate from 30 random images
         for _ in range(n):
@@ -245,7 +408,11 @@ class BaseDataset(Dataset):
             if im is None:
                 continue
             ratio = self.imgsz / max(im.shape[0], im.shape[1])  # max(h, w)  # ratio
-            b += im.nbytes * ratio**2
+            if self.cache in CACHE_CODECS:  # compressed size of the resized image
+                h, w = (min(math.ceil(x * ratio), self.imgsz) for x in im.shape[:2])
+                b += len(encode_image(cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR), self.cache))
+            else:
+                b += im.nbytes * ratio**2
         mem_required = b * self.ni / n * (1 + safety_margin)  # GB required to cache dataset into RAM
         mem = psutil.virtual_memory()
         if mem_required > mem.available:
@@ -256,6 +423,14 @@ class BaseDataset(Dataset):
                 f"{mem.available / gb:.1f}/{mem.total / gb:.1f}GB available, not caching images ⚠️"
             )
             return False
+        if self.cache_file:
+            import shutil
+
+            if mem_required > shutil.disk_usage(self.cache_file.parent).free:
+                LOGGER.info(
+                    f"{self.prefix}Not enough free space in {self.cache_file.parent}, caching images per process"
+                )
+                self.cache_file = None
         return True
 
     def set_rectangle(self):
@@ -263,11 +438,12 @@ class BaseDataset(Dataset):
         bi = np.floor(np.arange(self.ni) / self.batch_size).astype(int)  # batch index
         nb = bi[-1] + 1  # number of batches
 
-        s = np.array([x.pop("shape") for x in self.labels])  # hw
+        store = isinstance(self.labels, LabelStore)
+        s = self.labels.shapes if store else np.array([x.pop("shape") for x in self.labels])  # hw
         ar = s[:, 0] / s[:, 1]  # aspect ratio
         irect = ar.argsort()
         self.im_files = [self.im_files[i] for i in irect]
-        self.labels = [self.labels[i] for i in irect]
+        self.labels = self.labels[irect] if store else [self.labels[i] for i in irect]
         ar = ar[irect]
 
         # Set training image shapes
@@ -289,7 +465,10 @@ class BaseDataset(Dataset):
 
     def get_image_and_label(self, index):
         """Get and return label information from the dataset."""
-        label = deepcopy(self.labels[index])  # requires deepcopy() https://github.com/ultralytics/ultralytics/pull/1948
+        if isinstance(self.labels, LabelStore):
+            label = self.labels[index]  # fresh dict, arrays are copied on write by Instances
+        else:  # requires deepcopy() https://github.com/ultralytics/ultralytics/pull/1948
+            label = deepcopy(self.labels[index])
         label.pop("shape", None)  # shape is for rect, remove it
         label["img"], label["ori_shape"], label["resized_shape"] = self.load_image(index)
         label["ratio_pad"] = (
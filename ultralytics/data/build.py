@@ -1,5 +1,6 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import math
 import os
 import random
 from pathlib import Path
@@ -9,7 +10,7 @@ import torch
 from PIL import Image
 from torch.utils.data import dataloader, distributed
 
-from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset
+from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset, YOLOShardDataset
 from ultralytics.data.loaders import (
     LOADERS,
     LoadImagesAndVideos,
@@ -20,7 +21,7 @@ from ultralytics.data.loaders import (
     SourceTypes,
     autocast_list,
 )
-from ultralytics.data.utils import IMG_FORMATS, PIN_MEMORY, VID_FORMATS
+from ultralytics.data.utils import IMG_FORMATS, PIN_MEMORY, VID_FORMATS, get_shard_files
 from ultralytics.utils import RANK, colorstr
 from ultralytics.utils.checks import check_file
 
@@ -39,7 +40,9 @@ class InfiniteDataLoader(dataloader.DataLoader):
         self.iterator = super().__iter__()
 
     def __len__(self):
-        """Returns the length of the batch sampler's sampler."""
+        """Returns the length of the batch sampler's sampler, or the batches per epoch of a streaming dataset."""
+        if isinstance(self.dataset, dataloader.IterableDataset):
+            return math.ceil(len(self.dataset) / self.batch_size)
         return len(self.batch_sampler.sampler)
 
     def __iter__(self):
@@ -91,6 +94,18 @@ def seed_worker(worker_id):  # noqa
 
 def build_yolo_dataset(cfg, img_path, batch, data, mode="train", rect=False, stride=32, multi_modal=False):
     """Build YOLO Dataset."""
+    if mode == "train" and not multi_modal and get_shard_files(img_path):  # stream tar or zip shards
+        return YOLOShardDataset(
+            img_path=img_path,
+            imgsz=cfg.imgsz,
+            augment=True,
+            hyp=cfg,
+            prefix=colorstr(f"{mode}: "),
+            single_cls=cfg.single_cls or False,
+            classes=cfg.classes,
+            data=data,
+            task=cfg.task,
+        )
     dataset = YOLOMultiModalDataset if multi_modal else YOLODataset
     return dataset(
         img_path=img_path,
@@ -137,13 +152,14 @@ def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
     batch = min(batch, len(dataset))
     nd = torch.cuda.device_count()  # number of CUDA devices
     nw = min(os.cpu_count() // max(nd, 1), workers)  # number of workers
-    sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
+    iterable = isinstance(dataset, dataloader.IterableDataset)  # streaming datasets shuffle and split themselves
+    sampler = None if rank == -1 or iterable else distributed.DistributedSampler(dataset, shuffle=shuffle)
     generator = torch.Generator()
     generator.manual_seed(6148914691236517205 + RANK)
     return InfiniteDataLoader(
         dataset=dataset,
         batch_size=batch,
-        shuffle=shuffle and sampler is None,
+        shuffle=shuffle and sampler is None and not iterable,
         num_workers=nw,
         sampler=sampler,
         pin_memory=PIN_MEMORY,
@@ -179,7 +195,9 @@ def check_source(source):
     return source, webcam, screenshot, from_img, in_memory, tensor
 
 
-def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
+def load_inference_source(
+    source=None, batch=1, vid_stride=1, buffer=False, stream_policy=None, stream_wait=None, workers=0
+):
     """
     Loads an inference source for object detection and applies necessary transformations.
 
@@ -188,6 +206,11 @@ def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
         batch (int, optional): Batch size for dataloaders. Default is 1.
         vid_stride (int, optional): The frame interval for video sources. Default is 1.
         buffer (bool, optional): Determined whether stream frames will be buffered. Default is False.
+        stream_policy (str | List[str], optional): Per-stream frame policy 'latest', 'drop_oldest' or 'block' for
+            stream sources. Default is None, derived from `buffer`.
+        stream_wait (float, optional): Maximum seconds to wait for lagging streams before returning a partial batch.
+            Default is None, one frame interval of the fastest stream.
+        workers (int, optional): Number of threads decoding image files ahead of inference. Default is 0.
 
     Returns:
         dataset (Dataset): A dataset object for the specified input source.
@@ -201,13 +224,13 @@ def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
     elif in_memory:
         dataset = source
     elif stream:
-        dataset = LoadStreams(source, vid_stride=vid_stride, buffer=buffer)
+        dataset = LoadStreams(source, vid_stride=vid_stride, buffer=buffer, policy=stream_policy, wait=stream_wait)
     elif screenshot:
         dataset = LoadScreenshots(source)
     elif from_img:
         dataset = LoadPilAndNumpy(source)
     else:
-        dataset = LoadImagesAndVideos(source, batch=batch, vid_stride=vid_stride)
+        dataset = LoadImagesAndVideos(source, batch=batch, vid_stride=vid_stride, workers=workers)
 
     # Attach source types to the dataset
     setattr(dataset, "source_type", source_type)
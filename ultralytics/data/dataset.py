@@ -1,6 +1,9 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import json
+import math
+import random
+import time
 from collections import defaultdict
 from itertools import repeat
 from multiprocessing.pool import ThreadPool
@@ -9,10 +12,11 @@ from pathlib import Path
 import cv2
 import numpy as np
 import torch
+import torch.distributed as dist
 from PIL import Image
-from torch.utils.data import ConcatDataset
+from torch.utils.data import ConcatDataset, IterableDataset, get_worker_info
 
-from ultralytics.utils import LOCAL_RANK, NUM_THREADS, TQDM, colorstr
+from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, NUM_THREADS, TQDM, colorstr
 from ultralytics.utils.ops import resample_segments
 from ultralytics.utils.torch_utils import TORCHVISION_0_18
 
@@ -29,17 +33,25 @@ from .augment import (
 from .base import BaseDataset
 from .utils import (
     HELP_URL,
+    IMG_FORMATS,
     LOGGER,
+    LabelStore,
+    count_shard_samples,
+    get_file_stats,
     get_hash,
+    get_shard_files,
     img2label_paths,
+    imap_verify,
     load_dataset_cache_file,
+    parse_yolo_label,
+    read_shard,
     save_dataset_cache_file,
     verify_image,
     verify_image_label,
 )
 
 # Ultralytics dataset *.cache version, >= 1.0.0 for YOLOv8
-DATASET_CACHE_VERSION = "1.0.3"
+DATASET_CACHE_VERSION = "1.0.5"
 
 
 class YOLODataset(BaseDataset):
@@ -63,63 +75,112 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, **kwargs)
 
-    def cache_labels(self, path=Path("./labels.cache")):
+    def cache_labels(self, path=Path("./labels.cache"), cache=None):
         """
         Cache dataset labels, check images and read shapes.
 
+        Every image is keyed on the size and modification time of its image and label files. When a previous cache is
+        given, only new or changed files are verified again, entries of unchanged files are reused and entries of files
+        no longer in the dataset are dropped.
+
         Args:
             path (Path): Path where to save the cache file. Default is Path("./labels.cache").
+            cache (dict, optional): Previous cache of this dataset to update incrementally.
 
         Returns:
             (dict): labels.
         """
-        x = {"labels": []}
-        nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
         desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
-        total = len(self.im_files)
         nkpt, ndim = self.data.get("kpt_shape", (0, 0))
         if self.use_keypoints and (nkpt <= 0 or ndim not in {2, 3}):
             raise ValueError(
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
-        with ThreadPool(NUM_THREADS) as pool:
-            results = pool.imap(
-                func=verify_image_label,
-                iterable=zip(
-                    self.im_files,
-                    self.label_files,
-                    repeat(self.prefix),
-                    repeat(self.use_keypoints),
-                    repeat(len(self.data["names"])),
-                    repeat(nkpt),
-                    repeat(ndim),
-                ),
+        keys = np.concatenate((get_file_stats(self.im_files), get_file_stats(self.label_files)), 1)  # size, mtime
+
+        # Match files against the previous cache
+        old = cache["labels"] if cache else LabelStore.from_labels([])
+        old_files = old.im_files
+        rows = {f: i for i, f in enumerate(old_files)}
+        corrupt, warnings = (cache["corrupt"], cache["warnings"]) if cache else ({}, {})
+        row = np.array([rows.get(f, -1) for f in self.im_files], dtype=np.int64)  # row in previous labels
+        pad = np.full((1, 4), -2)  # keys of files missing from the previous cache, never matching
+        old_keys = np.concatenate((cache["keys"], pad)) if cache else pad
+        keep = (old_keys[row] == keys).all(1)  # unchanged files
+        kept = (self.im_files[i] for i in np.flatnonzero(keep))
+        x = {"corrupt": {}, "warnings": {f: warnings[f] for f in kept if f in warnings}}
+        scan = []  # indices of files to verify
+        for i in np.flatnonzero(~keep):
+            f = self.im_files[i]
+            if f in corrupt and corrupt[f][0] == tuple(keys[i]):
+                x["corrupt"][f] = corrupt[f]  # unchanged corrupt file
+            else:
+                scan.append(i)
+        if cache:
+            removed = len(set(old_files).union(corrupt).difference(self.im_files))
+            changed = sum(row[i] >= 0 or self.im_files[i] in corrupt for i in scan)
+            LOGGER.info(
+                f"{self.prefix}Updating {path}: {len(scan) - changed} new, {changed} changed, {removed} removed, "
+                f"{len(self.im_files) - len(scan)} unchanged files"
             )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
-                nm += nm_f
-                nf += nf_f
-                ne += ne_f
-                nc += nc_f
-                if im_file:
-                    x["labels"].append(
-                        {
-                            "im_file": im_file,
-                            "shape": shape,
-                            "cls": lb[:, 0:1],  # n, 1
-                            "bboxes": lb[:, 1:],  # n, 4
-                            "segments": segments,
-                            "keypoints": keypoint,
-                            "normalized": True,
-                            "bbox_format": "xywh",
-                        }
-                    )
-                if msg:
-                    msgs.append(msg)
-                pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
-            pbar.close()
 
+        # Verify new and changed files
+        nb = old.num_boxes[row[keep]]
+        nf = int((keys[keep, 2] >= 0).sum())  # label files found
+        nm, ne, nc = int(keep.sum()) - nf, int((nb[keys[keep, 2] >= 0] == 0).sum()), len(x["corrupt"])
+        labels, found = [], []
+        results = imap_verify(
+            verify_image_label,
+            zip(
+                [self.im_files[i] for i in scan],
+                [self.label_files[i] for i in scan],
+                repeat(self.prefix),
+                repeat(self.use_keypoints),
+                repeat(len(self.data["names"])),
+                repeat(nkpt),
+                repeat(ndim),
+                repeat(self.deep_verify),
+            ),
+            len(scan),
+        )
+        t = time.perf_counter()
+        pbar = TQDM(results, desc=desc, total=len(scan))
+        for (im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg), i in zip(pbar, scan):
+            nm += nm_f
+            nf += nf_f
+            ne += ne_f
+            nc += nc_f
+            if im_file:
+                found.append(i)
+                labels.append(
+                    {
+                        "im_file": im_file,
+                        "shape": shape,
+                        "cls": lb[:, 0:1],  # n, 1
+                        "bboxes": lb[:, 1:],  # n, 4
+                        "segments": segments,
+                        "keypoints": keypoint,
+                        "normalized": True,
+                        "bbox_format": "xywh",
+                    }
+                )
+                if msg:
+                    x["warnings"][im_file] = msg
+            elif msg:
+                x["corrupt"][self.im_files[i]] = tuple(keys[i]), msg
+            pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
+        pbar.close()
+        if scan:
+            dt = time.perf_counter() - t
+            LOGGER.info(f"{self.prefix}Verified {len(scan)} images in {dt:.1f}s ({len(scan) / dt:.0f} images/s)")
+
+        # Merge reused and new labels in dataset order
+        i = np.concatenate((np.flatnonzero(keep), np.array(found, dtype=np.int64)))
+        order = i.argsort()
+        x["labels"] = LabelStore.concatenate([old[row[keep]], LabelStore.from_labels(labels)])[order].compact()
+        x["keys"] = keys[i[order]]
+        msgs = list(x["warnings"].values()) + [msg for _, msg in x["corrupt"].values()]
         if msgs:
             LOGGER.info("\n".join(msgs))
         if nf == 0:
@@ -135,11 +196,13 @@ class YOLODataset(BaseDataset):
         self.label_files = img2label_paths(self.im_files)
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
         try:
-            cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
+            cache = load_dataset_cache_file(cache_path)  # attempt to load a *.cache file
             assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
+            exists = cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
         except (FileNotFoundError, AssertionError, AttributeError):
-            cache, exists = self.cache_labels(cache_path), False  # run cache ops
+            cache, exists = None, False
+        if not exists:
+            cache = self.cache_labels(cache_path, cache)  # run cache ops, verifying only new or changed files
 
         # Display cache
         nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
@@ -150,23 +213,22 @@ class YOLODataset(BaseDataset):
                 LOGGER.info("\n".join(cache["msgs"]))  # display warnings
 
         # Read cache
-        [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
-        labels = cache["labels"]
-        if not labels:
+        [cache.pop(k) for k in ("hash", "version", "msgs", "keys", "corrupt", "warnings")]  # remove items
+        labels = cache["labels"]  # LabelStore
+        if not len(labels):
             LOGGER.warning(f"WARNING ⚠️ No images found in {cache_path}, training may not work correctly. {HELP_URL}")
-        self.im_files = [lb["im_file"] for lb in labels]  # update im_files
+        self.im_files = labels.im_files  # update im_files
 
         # Check if the dataset is all boxes or all segments
-        lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
-        len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
+        len_cls = len_boxes = labels.num_boxes.sum()
+        len_segments = labels.num_segments.sum()
         if len_segments and len_boxes != len_segments:
             LOGGER.warning(
                 f"WARNING ⚠️ Box and segment counts should be equal, but got len(segments) = {len_segments}, "
                 f"len(boxes) = {len_boxes}. To resolve this only boxes will be used and all segments will be removed. "
                 "To avoid this please supply either a detect or segment dataset, not a detect-segment mixed dataset."
             )
-            for lb in labels:
-                lb["segments"] = []
+            labels = labels.drop_segments()
         if len_cls == 0:
             LOGGER.warning(f"WARNING ⚠️ No labels found in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
@@ -177,6 +239,14 @@ class YOLODataset(BaseDataset):
             hyp.mosaic = hyp.mosaic if self.augment and not self.rect else 0.0
             hyp.mixup = hyp.mixup if self.augment and not self.rect else 0.0
             transforms = v8_transforms(self, self.imgsz, hyp)
+            # Without mosaic, which pastes resized images, RandomPerspective resizes, letterboxes and warps in one pass
+            self.defer_resize = not (hyp.mosaic or self.cache or hyp.device_augment)
+            # Full-size deferred images are buffered only for mix transforms that draw partners from the buffer, and
+            # within the bytes of resized images unless buffer_mb sets the limit
+            mix = hyp.mixup or (hyp.copy_paste and hyp.copy_paste_mode == "mixup")
+            self.buffer_deferred = self.defer_resize and bool(hyp.buffer_bias and mix)
+            if self.buffer_deferred and not self.buffer.max_bytes:
+                self.buffer.max_bytes = self.max_buffer_length * self.imgsz**2 * 3
         else:
             transforms = Compose([LetterBox(new_shape=(self.imgsz, self.imgsz), scaleup=False)])
         transforms.append(
@@ -236,7 +306,7 @@ class YOLODataset(BaseDataset):
         values = list(zip(*[list(b.values()) for b in batch]))
         for i, k in enumerate(keys):
             value = values[i]
-            if k == "img":
+            if k in {"img", "affine", "affine_scale"}:
                 value = torch.stack(value, 0)
             if k in {"masks", "keypoints", "bboxes", "cls", "segments", "obb"}:
                 value = torch.cat(value, 0)
@@ -355,6 +425,203 @@ class GroundingDataset(YOLODataset):
         return transforms
 
 
+class YOLOShardDataset(YOLODataset, IterableDataset):
+    """
+    Streaming dataset that reads YOLO images and labels sequentially from tar or zip shards.
+
+    Each sample is a run of consecutive shard members sharing a key, e.g. 'img0001.jpg' and 'img0001.txt' holding a
+    YOLO label file; images without a label are backgrounds. Shards are read front to back, so object-storage exports
+    train without unpacking millions of small files. Every epoch the shard order is reshuffled with `seed + epoch` and
+    shards are dealt round-robin to each (DDP rank, dataloader worker) reader; with fewer shards than readers every
+    reader scans all shards and keeps its own share of samples instead. Samples pass through a shuffle buffer of
+    `hyp.shard_buffer` encoded samples, and mosaic, mixup and copy-paste partners are drawn from that buffer.
+
+    Training streams are endless, `len()` gives the per-rank number of samples in one epoch so `len(dataloader)` keeps
+    its usual meaning. Without `augment` the shards are read once, in order, without shuffling.
+
+    Args:
+        img_path (str | List[str]): Shard file, directory of shards, or glob or brace pattern like 'train-{000..099}.tar'.
+        imgsz (int): Target image size for resizing.
+        augment (bool): Whether to shuffle and apply augmentations.
+        hyp (dict): Hyperparameters for augmentations and the shuffle buffer.
+        prefix (str): Prefix to print in log messages.
+        single_cls (bool): Whether to treat all classes as a single class.
+        classes (List[int], optional): List of included classes.
+        data (dict): A dataset YAML dictionary.
+        task (str): An explicit arg to point current task, Defaults to 'detect'.
+
+    Attributes:
+        shards (List[str]): Shard file paths.
+        ni (int): Total number of images in all shards.
+        samples (List[tuple]): Shuffle buffer of (im_file, encoded image, labels, segments, keypoints) samples.
+    """
+
+    def __init__(
+        self,
+        img_path,
+        imgsz=640,
+        augment=True,
+        hyp=DEFAULT_CFG,
+        prefix="",
+        single_cls=False,
+        classes=None,
+        data=None,
+        task="detect",
+        **kwargs,
+    ):
+        """Initializes the YOLOShardDataset, counting the samples of every shard from its member names."""
+        self.use_segments = task == "segment"
+        self.use_keypoints = task == "pose"
+        self.use_obb = task == "obb"
+        self.data = data
+        assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
+        self.img_path = img_path
+        self.imgsz = imgsz
+        self.augment = augment
+        self.single_cls = single_cls
+        self.classes = classes
+        self.prefix = prefix
+        self.rect = False  # rectangular batches need every image shape up front
+        self.cache = None  # images are decoded from the stream
+        self.defer_resize = False  # until build_transforms()
+        self.shards = get_shard_files(img_path)
+        if not self.shards:
+            raise FileNotFoundError(f"{prefix}No tar or zip shards found in {img_path}. {HELP_URL}")
+        self.seed = getattr(hyp, "seed", 0) or 0
+        self.epoch = 0
+        distributed = dist.is_available() and dist.is_initialized()
+        self.rank, self.world_size = (dist.get_rank(), dist.get_world_size()) if distributed else (0, 1)
+        with ThreadPool(NUM_THREADS) as pool:
+            self.ni = sum(pool.map(count_shard_samples, self.shards))
+        LOGGER.info(f"{prefix}Streaming {self.ni} images from {len(self.shards)} shards")
+        if self.ni < self.world_size:
+            raise ValueError(f"{prefix}{self.ni} images can not be split across {self.world_size} ranks. {HELP_URL}")
+        self.samples = []
+        self.max_buffer_length = max(int(getattr(hyp, "shard_buffer", 1000) or 1), 1) if augment else 1
+        self.transforms = self.build_transforms(hyp=hyp)
+
+    @property
+    def buffer(self):
+        """Indices of the shuffle buffer, the pool that mosaic partners are sampled from."""
+        return range(len(self.samples))
+
+    def __len__(self):
+        """Returns the number of samples each rank reads per epoch."""
+        return math.ceil(self.ni / self.world_size)
+
+    def __iter__(self):
+        """Yields transformed samples from this reader's shards through the shuffle buffer."""
+        info = get_worker_info()
+        nw, wid = (info.num_workers, info.id) if info else (1, 0)
+        n, i = self.world_size * nw, self.rank * nw + wid  # number of readers, this reader's index
+        rng = random.Random(f"{self.seed}-{self.epoch}-{i}")
+        self.samples = []
+        for sample in self.stream(n, i):
+            if len(self.samples) < self.max_buffer_length:
+                self.samples.append(sample)
+                continue
+            j = rng.randrange(len(self.samples)) if self.augment else 0
+            sample, self.samples[j] = self.samples[j], sample  # a one-sample buffer keeps file order
+            yield from self.transform(sample)
+        while self.samples:  # drain a finite stream
+            yield from self.transform(self.samples.pop(0))
+
+    def transform(self, sample):
+        """Decodes and transforms one sample, yielding nothing and warning if its image is corrupt."""
+        try:
+            yield self.transforms(self.load_sample(sample))
+        except cv2.error as e:
+            LOGGER.warning(f"{self.prefix}WARNING ⚠️ {sample[0]}: ignoring sample with corrupt image: {e}")
+
+    def stream(self, n, i):
+        """
+        Yields this reader's undecoded samples, reshuffling shards every epoch for endless training streams.
+
+        Args:
+            n (int): Number of readers, i.e. DDP ranks times dataloader workers.
+            i (int): Index of this reader.
+
+        Yields:
+            (tuple): Sample (im_file, encoded image, labels, segments, keypoints) with parsed and filtered labels.
+        """
+        nkpt, ndim = self.data.get("kpt_shape", (0, 0)) if self.use_keypoints else (0, 0)
+        num_cls = len(self.data["names"])
+        epoch = self.epoch
+        while True:
+            shards = list(self.shards)
+            if self.augment:
+                random.Random(self.seed + epoch).shuffle(shards)  # same order on every reader
+            if len(shards) >= n:
+                shards, start, step = shards[i::n], 0, 1  # split shards
+            else:
+                start, step = i, n  # split samples
+            k = 0
+            for shard in shards:
+                for key, files in read_shard(shard):
+                    im = next((files[x] for x in files if x in IMG_FORMATS), None)
+                    if im is None:
+                        continue
+                    k += 1
+                    if (k - 1) % step != start:
+                        continue
+                    im_file = f"{shard}/{key}"
+                    try:
+                        text = files["txt"].decode() if "txt" in files else ""
+                        lb, segments, keypoints, _ = parse_yolo_label(text, self.use_keypoints, num_cls, nkpt, ndim)
+                    except Exception as e:
+                        LOGGER.warning(f"{self.prefix}WARNING ⚠️ {im_file}: ignoring corrupt image/label: {e}")
+                        continue
+                    if self.classes is not None:
+                        j = np.isin(lb[:, 0], self.classes)
+                        lb = lb[j]
+                        if segments:
+                            segments = [segments[si] for si, idx in enumerate(j) if idx]
+                        if keypoints is not None:
+                            keypoints = keypoints[j]
+                    if self.single_cls:
+                        lb[:, 0] = 0
+                    yield im_file, im, lb, segments, keypoints
+            if not self.augment:
+                return
+            epoch += 1
+
+    def load_sample(self, sample):
+        """Decodes a buffered sample into a label dictionary with its image resized like `load_image`."""
+        im_file, buf, lb, segments, keypoints = sample
+        im = cv2.imdecode(np.frombuffer(buf, np.uint8), cv2.IMREAD_COLOR)
+        if im is None:
+            raise cv2.error(f"Image could not be decoded {im_file}")
+        h0, w0 = im.shape[:2]  # orig hw
+        h, w = h0, w0
+        r = self.imgsz / max(h0, w0)  # ratio
+        if r != 1:  # if sizes are not equal
+            w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+            if not self.defer_resize:  # else resized by the augmentation warp
+                im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        label = {
+            "im_file": im_file,
+            "cls": lb[:, 0:1].copy(),  # n, 1
+            "bboxes": lb[:, 1:].copy(),  # n, 4
+            "segments": segments,  # resampled into a new array by update_labels_info()
+            "keypoints": None if keypoints is None else keypoints.copy(),
+            "normalized": True,
+            "bbox_format": "xywh",
+            "img": im,
+            "ori_shape": (h0, w0),
+            "resized_shape": (h, w),
+        }
+        label["ratio_pad"] = (label["resized_shape"][0] / h0, label["resized_shape"][1] / w0)  # for evaluation
+        return self.update_labels_info(label)
+
+    def get_image_and_label(self, index):
+        """Get and return label information of sample `index` of the shuffle buffer, for mix transforms."""
+        return self.load_sample(self.samples[index % len(self.samples)])
+
+    def __getitem__(self, index):
+        """Streaming datasets are not indexable, iterate over them instead."""
+        raise TypeError(f"{self.__class__.__name__} is an IterableDataset and does not support indexing")
+
+
 class YOLOConcatDataset(ConcatDataset):
     """
     Dataset as a concatenation of multiple datasets.
@@ -432,6 +699,7 @@ class ClassificationDataset:
         if augment and args.fraction < 1.0:  # reduce training fraction
             self.samples = self.samples[: round(len(self.samples) * args.fraction)]
         self.prefix = colorstr(f"{prefix}: ") if prefix else ""
+        self.deep_verify = bool(getattr(args, "deep_verify", False))  # PIL verify() images in scans
         self.cache_ram = args.cache is True or str(args.cache).lower() == "ram"  # cache images into RAM
         if self.cache_ram:
             LOGGER.warning(
@@ -500,18 +768,26 @@ class ClassificationDataset:
         except (FileNotFoundError, AssertionError, AttributeError):
             # Run scan if *.cache retrieval failed
             nf, nc, msgs, samples, x = 0, 0, [], [], {}
-            with ThreadPool(NUM_THREADS) as pool:
-                results = pool.imap(func=verify_image, iterable=zip(self.samples, repeat(self.prefix)))
-                pbar = TQDM(results, desc=desc, total=len(self.samples))
-                for sample, nf_f, nc_f, msg in pbar:
-                    if nf_f:
-                        samples.append(sample)
-                    if msg:
-                        msgs.append(msg)
-                    nf += nf_f
-                    nc += nc_f
-                    pbar.desc = f"{desc} {nf} images, {nc} corrupt"
-                pbar.close()
+            results = imap_verify(
+                verify_image,
+                zip(self.samples, repeat(self.prefix), repeat(self.deep_verify)),
+                len(self.samples),
+            )
+            t = time.perf_counter()
+            pbar = TQDM(results, desc=desc, total=len(self.samples))
+            for sample, nf_f, nc_f, msg in pbar:
+                if nf_f:
+                    samples.append(sample)
+                if msg:
+                    msgs.append(msg)
+                nf += nf_f
+                nc += nc_f
+                pbar.desc = f"{desc} {nf} images, {nc} corrupt"
+            pbar.close()
+            dt = time.perf_counter() - t
+            LOGGER.info(
+                f"{self.prefix}Verified {len(self.samples)} images in {dt:.1f}s ({len(self.samples) / dt:.0f} images/s)"
+            )
             if msgs:
                 LOGGER.info("\n".join(msgs))
             x["hash"] = get_hash([x[0] for x in self.samples])
@@ -4,9 +4,11 @@ import glob
 import math
 import os
 import time
+from collections import deque
 from dataclasses import dataclass
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Thread
 from urllib.parse import urlparse
 
 import cv2
@@ -59,18 +61,22 @@ class LoadStreams:
         sources (List[str]): The source input paths or URLs for the video streams.
         vid_stride (int): Video frame-rate stride.
         buffer (bool): Whether to buffer input streams.
+        policy (List[str]): Frame policy for each stream, 'latest', 'drop_oldest' or 'block'.
+        wait (float): Maximum time in seconds to wait for lagging streams once a frame is ready.
         running (bool): Flag to indicate if the streaming thread is running.
         mode (str): Set to 'stream' indicating real-time capture.
-        imgs (List[List[np.ndarray]]): List of image frames for each stream.
+        imgs (List[deque]): Ring buffer of (capture time, frame) pairs for each stream.
         fps (List[float]): List of FPS for each stream.
         frames (List[int]): List of total frames for each stream.
         threads (List[Thread]): List of threads for each stream.
         shape (List[Tuple[int, int, int]]): List of shapes for each stream.
         caps (List[cv2.VideoCapture]): List of cv2.VideoCapture objects for each stream.
-        bs (int): Batch size for processing.
+        bs (int): Batch size for processing, the maximum number of frames per batch.
+        indices (List[int]): Stream indices of the frames in the last returned batch.
 
     Methods:
         update: Read stream frames in daemon thread.
+        stats: Return per-stream read, drop and lag metrics.
         close: Close stream loader and release resources.
         __iter__: Returns an iterator object for the class.
         __next__: Returns source paths, transformed, and original images for processing.
@@ -86,11 +92,27 @@ class LoadStreams:
     Notes:
         - The class uses threading to efficiently load frames from multiple streams simultaneously.
         - It automatically handles YouTube links, converting them to the best available stream URL.
-        - The class implements a buffer system to manage frame storage and retrieval.
+        - Each stream has its own ring buffer and frame policy: 'latest' keeps only the most recent frame,
+          'drop_oldest' keeps up to `ring` frames and overwrites the oldest when full, and 'block' keeps up to `ring`
+          frames and pauses reading when full so that no frame is lost.
+        - Batches hold the streams that have a frame within `wait` seconds of the first ready frame, so a slow or
+          stalled stream does not hold back the others. Iteration ends once every stream has ended.
     """
 
-    def __init__(self, sources="file.streams", vid_stride=1, buffer=False):
-        """Initialize stream loader for multiple video sources, supporting various stream types."""
+    def __init__(self, sources="file.streams", vid_stride=1, buffer=False, policy=None, wait=None, ring=30):
+        """
+        Initialize stream loader for multiple video sources, supporting various stream types.
+
+        Args:
+            sources (str): A stream source, or a *.streams text file with one source per line.
+            vid_stride (int): Video frame-rate stride.
+            buffer (bool): Default frame policy when `policy` is None, 'block' if True and 'latest' if False.
+            policy (str | List[str], optional): Frame policy 'latest', 'drop_oldest' or 'block' for all streams, or
+                one per stream as a list or comma-separated string.
+            wait (float, optional): Maximum time in seconds to wait for lagging streams once a frame is ready, None
+                for one frame interval of the fastest stream.
+            ring (int): Ring buffer capacity in frames for the 'drop_oldest' and 'block' policies.
+        """
         torch.backends.cudnn.benchmark = True  # faster for fixed-size inference
         self.buffer = buffer  # buffer input streams
         self.running = True  # running flag for Thread
@@ -100,12 +122,26 @@ class LoadStreams:
         sources = Path(sources).read_text().rsplit() if os.path.isfile(sources) else [sources]
         n = len(sources)
         self.bs = n
+        policy = policy or ("block" if buffer else "latest")
+        policy = [p.strip() for p in policy.split(",")] if isinstance(policy, str) else list(policy)
+        self.policy = policy * n if len(policy) == 1 else policy
+        if len(self.policy) != n or not set(self.policy) <= {"latest", "drop_oldest", "block"}:
+            raise ValueError(
+                f"Invalid stream policy {policy} for {n} streams, expected 'latest', 'drop_oldest' or 'block' for "
+                f"all streams or one per stream."
+            )
         self.fps = [0] * n  # frames per second
         self.frames = [0] * n
         self.threads = [None] * n
         self.caps = [None] * n  # video capture objects
-        self.imgs = [[] for _ in range(n)]  # images
+        self.imgs = [deque(maxlen=1 if p == "latest" else ring) for p in self.policy]  # (capture time, image) rings
         self.shape = [[] for _ in range(n)]  # image shapes
+        self.reads = [0] * n  # frames read per stream
+        self.drops = [0] * n  # frames overwritten before being returned per stream
+        self.emitted = [0] * n  # frames returned per stream
+        self.lag = [0.0] * n  # age in seconds of the last returned frame per stream
+        self.indices = []  # stream indices of the last batch
+        self.ready = Condition()  # guards the ring buffers and counters, notified on every new frame
         self.sources = [ops.clean_str(x) for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
             # Start thread to read frames from video stream
@@ -133,32 +169,64 @@ class LoadStreams:
             success, im = self.caps[i].read()  # guarantee first frame
             if not success or im is None:
                 raise ConnectionError(f"{st}Failed to read images from {s}")
-            self.imgs[i].append(im)
+            self.imgs[i].append((time.perf_counter(), im))
+            self.reads[i] = 1
             self.shape[i] = im.shape
             self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
-            LOGGER.info(f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS)")
+            LOGGER.info(
+                f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS, "
+                f"'{self.policy[i]}' policy)"
+            )
             self.threads[i].start()
+        self.wait = 1 / max(self.fps) if wait is None else wait
         LOGGER.info("")  # newline
 
     def update(self, i, cap, stream):
-        """Read stream frames in daemon thread and update image buffer."""
+        """Read stream frames in daemon thread and update image ring buffer."""
         n, f = 0, self.frames[i]  # frame number, frame array
+        buf, block = self.imgs[i], self.policy[i] == "block"
         while self.running and cap.isOpened() and n < (f - 1):
-            if len(self.imgs[i]) < 30:  # keep a <=30-image buffer
-                n += 1
-                cap.grab()  # .read() = .grab() followed by .retrieve()
-                if n % self.vid_stride == 0:
-                    success, im = cap.retrieve()
-                    if not success:
-                        im = np.zeros(self.shape[i], dtype=np.uint8)
-                        LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
-                        cap.open(stream)  # re-open stream if signal was lost
-                    if self.buffer:
-                        self.imgs[i].append(im)
-                    else:
-                        self.imgs[i] = [im]
-            else:
-                time.sleep(0.01)  # wait until the buffer is empty
+            if block and len(buf) == buf.maxlen:
+                time.sleep(0.01)  # wait until the buffer has room
+                continue
+            n += 1
+            cap.grab()  # .read() = .grab() followed by .retrieve()
+            if n % self.vid_stride == 0:
+                success, im = cap.retrieve()
+                if not success:
+                    im = np.zeros(self.shape[i], dtype=np.uint8)
+                    LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
+                    cap.open(stream)  # re-open stream if signal was lost
+                with self.ready:
+                    self.drops[i] += len(buf) == buf.maxlen  # ring is full, the oldest frame is overwritten
+                    buf.append((time.perf_counter(), im))
+                    self.reads[i] += 1
+                    self.ready.notify()
+        with self.ready:
+            self.ready.notify()  # wake __next__ to notice the ended stream
+
+    def stats(self):
+        """
+        Return per-stream frame metrics.
+
+        Returns:
+            (List[dict]): For each stream its source, policy, whether it is still being read, frames read, returned
+                and dropped, frames currently buffered, and the age in milliseconds of its last returned frame.
+        """
+        with self.ready:
+            return [
+                {
+                    "source": self.sources[i],
+                    "policy": self.policy[i],
+                    "alive": self.threads[i].is_alive(),
+                    "read": self.reads[i],
+                    "emitted": self.emitted[i],
+                    "dropped": self.drops[i],
+                    "buffered": len(self.imgs[i]),
+                    "lag_ms": self.lag[i] * 1e3,
+                }
+                for i in range(self.bs)
+            ]
 
     def close(self):
         """Terminates stream loader, stops threads, and releases video capture resources."""
@@ -179,31 +247,43 @@ class LoadStreams:
         return self
 
     def __next__(self):
-        """Returns the next batch of frames from multiple video streams for processing."""
+        """Returns the next batch of frames from the streams that are ready within the wait deadline."""
         self.count += 1
 
-        images = []
-        for i, x in enumerate(self.imgs):
-            # Wait until a frame is available in each buffer
-            while not x:
-                if not self.threads[i].is_alive() or cv2.waitKey(1) == ord("q"):  # q to quit
-                    self.close()
-                    raise StopIteration
-                time.sleep(1 / min(self.fps))
-                x = self.imgs[i]
-                if not x:
-                    LOGGER.warning(f"WARNING ⚠️ Waiting for stream {i}")
-
-            # Get and remove the first frame from imgs buffer
-            if self.buffer:
-                images.append(x.pop(0))
-
-            # Get the last frame, and clear the rest from the imgs buffer
-            else:
-                images.append(x.pop(-1) if x else np.zeros(self.shape[i], dtype=np.uint8))
-                x.clear()
-
-        return self.sources, images, [""] * self.bs
+        with self.ready:
+            deadline = None
+            while True:
+                ready = [i for i, x in enumerate(self.imgs) if x]
+                waiting = [i for i, x in enumerate(self.imgs) if not x and self.threads[i].is_alive()]
+                if not waiting and ready:
+                    break  # every live stream has a frame
+                if not ready:
+                    if not waiting:  # all streams ended
+                        self.close()
+                        raise StopIteration
+                    if not self.ready.wait(1 / min(self.fps)):
+                        if cv2.waitKey(1) == ord("q"):  # q to quit
+                            self.close()
+                            raise StopIteration
+                        LOGGER.warning(f"WARNING ⚠️ Waiting for streams {waiting}")
+                    continue
+                if deadline is None:  # the oldest ready frame starts the deadline for lagging streams
+                    deadline = min(self.imgs[i][0][0] for i in ready) + self.wait
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break  # return the ready streams, lagging streams join a later batch
+                self.ready.wait(remaining)
+
+            # Get the oldest frame of each ready ring buffer, 'latest' rings only hold the most recent frame
+            now, images = time.perf_counter(), []
+            for i in ready:
+                t, im = self.imgs[i].popleft()
+                self.lag[i] = now - t
+                self.emitted[i] += 1
+                images.append(im)
+            self.indices = ready
+
+        return [self.sources[i] for i in ready], images, [""] * len(ready)
 
     def __len__(self):
         """Return the number of video streams in the LoadStreams object."""
@@ -300,11 +380,15 @@ class LoadImagesAndVideos:
         frames (int): Total number of frames in the video.
         count (int): Counter for iteration, initialized at 0 during __iter__().
         ni (int): Number of images.
+        workers (int): Number of threads decoding images ahead of the consumer, 0 to decode on the consumer thread.
+        readahead (int): Number of image batches decoded ahead of the consumer when workers > 0.
 
     Methods:
         __init__: Initialize the LoadImagesAndVideos object.
         __iter__: Returns an iterator object for VideoStream or ImageFolder.
         __next__: Returns the next batch of images or video frames along with their paths and metadata.
+        _next_images: Returns the next batch of images decoded ahead by the worker pool.
+        _read_image: Reads an image file, including HEIC, as a BGR numpy array.
         _new_video: Creates a new video capture object for the given path.
         __len__: Returns the number of batches in the object.
 
@@ -318,10 +402,22 @@ class LoadImagesAndVideos:
         - Supports various image formats including HEIC.
         - Handles both local files and directories.
         - Can read from a text file containing paths to images and videos.
+        - With workers > 0, images are decoded by a thread pool `readahead` batches ahead of the consumer and returned
+          in order. OpenCV and Pillow release the GIL while decoding, so decoding uses multiple cores.
     """
 
-    def __init__(self, path, batch=1, vid_stride=1):
-        """Initialize dataloader for images and videos, supporting various input formats."""
+    def __init__(self, path, batch=1, vid_stride=1, workers=0, readahead=None):
+        """
+        Initialize dataloader for images and videos, supporting various input formats.
+
+        Args:
+            path (str | Path | List): Image or video file, directory, glob, *.txt file of sources, or a list of them.
+            batch (int): Batch size.
+            vid_stride (int): Video frame-rate stride.
+            workers (int): Number of threads decoding images ahead of the consumer, 0 to decode on the consumer thread.
+            readahead (int, optional): Number of image batches decoded ahead of the consumer, None for enough batches
+                to keep all workers busy.
+        """
         parent = None
         if isinstance(path, str) and Path(path).suffix == ".txt":  # *.txt file with img/vid/dir on each line
             parent = Path(path).parent
@@ -357,6 +453,9 @@ class LoadImagesAndVideos:
         self.mode = "video" if ni == 0 else "image"  # default to video if no images
         self.vid_stride = vid_stride  # video frame-rate stride
         self.bs = batch
+        self.workers = min(workers, ni)
+        self.readahead = readahead or max(2, math.ceil(self.workers / batch))
+        self.pool = None  # image decoding thread pool, started by __iter__() if workers > 0
         if any(videos):
             self._new_video(videos[0])  # new video
         else:
@@ -367,10 +466,20 @@ class LoadImagesAndVideos:
     def __iter__(self):
         """Iterates through image/video files, yielding source paths, images, and metadata."""
         self.count = 0
+        if self.workers:
+            if self.pool is not None:
+                self.pool.terminate()
+            self.pool = ThreadPool(self.workers)
+            self.pending = deque()  # (first file index, [AsyncResult]) for each image batch decoded ahead
+            self.queued = 0  # index of the next image file to submit for decoding
         return self
 
     def __next__(self):
         """Returns the next batch of images or video frames with their paths and metadata."""
+        if self.workers and self.count < self.ni:
+            batch = self._next_images()
+            if batch:
+                return batch
         paths, imgs, info = [], [], []
         while len(imgs) < self.bs:
             if self.count >= self.nf:  # end of file list
@@ -411,17 +520,7 @@ class LoadImagesAndVideos:
             else:
                 # Handle image files (including HEIC)
                 self.mode = "image"
-                if path.split(".")[-1].lower() == "heic":
-                    # Load HEIC image using Pillow with pillow-heif
-                    check_requirements("pillow-heif")
-
-                    from pillow_heif import register_heif_opener
-
-                    register_heif_opener()  # Register HEIF opener with Pillow
-                    with Image.open(path) as img:
-                        im0 = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)  # convert image to BGR nparray
-                else:
-                    im0 = imread(path)  # BGR
+                im0 = self._read_image(path)
                 if im0 is None:
                     LOGGER.warning(f"WARNING ⚠️ Image Read Error {path}")
                 else:
@@ -434,6 +533,46 @@ class LoadImagesAndVideos:
 
         return paths, imgs, info
 
+    def _next_images(self):
+        """Returns the next image batch decoded by the worker pool, keeping `readahead` batches in flight."""
+        while True:
+            while len(self.pending) < self.readahead and self.queued < self.ni:
+                files = self.files[self.queued : min(self.queued + self.bs, self.ni)]
+                self.pending.append((self.queued, [self.pool.apply_async(self._read_image, (f,)) for f in files]))
+                self.queued += len(files)
+            if not self.pending:
+                return None
+            start, jobs = self.pending.popleft()
+            self.mode = "image"
+            self.count = start + len(jobs)
+            paths, imgs, info = [], [], []
+            for i, job in enumerate(jobs, start):
+                path, im0 = self.files[i], job.get()
+                if im0 is None:
+                    LOGGER.warning(f"WARNING ⚠️ Image Read Error {path}")
+                else:
+                    paths.append(path)
+                    imgs.append(im0)
+                    info.append(f"image {i + 1}/{self.nf} {path}: ")
+            if self.count >= self.ni:
+                self.pool.close()  # all images decoded, continue with videos if any
+            if imgs:
+                return paths, imgs, info
+
+    @staticmethod
+    def _read_image(path):
+        """Reads an image file, including HEIC, as a BGR numpy array, returning None if it cannot be read."""
+        if path.split(".")[-1].lower() == "heic":
+            # Load HEIC image using Pillow with pillow-heif
+            check_requirements("pillow-heif")
+
+            from pillow_heif import register_heif_opener
+
+            register_heif_opener()  # Register HEIF opener with Pillow
+            with Image.open(path) as img:
+                return cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)  # convert image to BGR nparray
+        return imread(path)  # BGR
+
     def _new_video(self, path):
         """Creates a new video capture object for the given path and initializes video-related attributes."""
         self.frame = 0
@@ -1,15 +1,20 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import glob
 import hashlib
 import json
 import os
 import random
+import re
+import struct
 import subprocess
+import tarfile
+import threading
 import time
 import zipfile
-from multiprocessing.pool import ThreadPool
+from collections import OrderedDict
+from multiprocessing.pool import Pool, ThreadPool
 from pathlib import Path
-from tarfile import is_tarfile
 
 import cv2
 import numpy as np
@@ -39,6 +44,8 @@ IMG_FORMATS = {"bmp", "dng", "jpeg", "jpg", "mpo", "png", "tif", "tiff", "webp",
 VID_FORMATS = {"asf", "avi", "gif", "m4v", "mkv", "mov", "mp4", "mpeg", "mpg", "ts", "wmv", "webm"}  # video suffixes
 PIN_MEMORY = str(os.getenv("PIN_MEMORY", True)).lower() == "true"  # global pin_memory for dataloaders
 FORMATS_HELP_MSG = f"Supported formats are:\nimages: {IMG_FORMATS}\nvideos: {VID_FORMATS}"
+CACHE_CODECS = {"jpg", "webp", "png", "lz4", "zstd"}  # compressed RAM image cache modes
+SHARD_FORMATS = (".tar", ".tar.gz", ".tgz", ".zip")  # streaming dataset shard suffixes
 
 
 def img2label_paths(img_paths):
@@ -55,6 +62,21 @@ def get_hash(paths):
     return h.hexdigest()  # return hash
 
 
+def get_file_stats(paths):
+    """Returns an (N, 2) int64 array of file sizes and modification times in ns, -1 for missing files."""
+
+    def stat(p):
+        """Return size and mtime of one file."""
+        try:
+            s = os.stat(p)
+            return s.st_size, s.st_mtime_ns
+        except OSError:
+            return -1, -1
+
+    with ThreadPool(NUM_THREADS) as pool:
+        return np.array(pool.map(stat, paths, chunksize=256), dtype=np.int64).reshape(-1, 2)
+
+
 def exif_size(img: Image.Image):
     """Returns exif-corrected PIL size."""
     s = img.size  # (width, height)
@@ -69,24 +91,126 @@ def exif_size(img: Image.Image):
     return s
 
 
+def image_header(path):
+    """
+    Read the format and EXIF-corrected size of a JPEG or PNG image from its header, without decoding it.
+
+    Args:
+        path (str): Image file path.
+
+    Returns:
+        (tuple | None): Image format and (h, w) shape, or None for other formats and unparseable headers.
+    """
+    with open(path, "rb") as f:
+        head = f.read(24)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            w, h = struct.unpack(">II", head[16:24])
+            return "png", (h, w)
+        if not head.startswith(b"\xff\xd8"):
+            return None
+        f.seek(2)
+        rotation = None
+        while (marker := f.read(2))[:1] == b"\xff":
+            m = marker[1] if len(marker) == 2 else None
+            if m is None or m == 0xD9:  # end of file or image before any frame header
+                return None
+            if m == 0xFF:  # fill byte
+                f.seek(-1, 1)
+                continue
+            if m == 0x01 or 0xD0 <= m <= 0xD7:  # markers without a segment
+                continue
+            (n,) = struct.unpack(">H", f.read(2))
+            if 0xC0 <= m <= 0xCF and m not in {0xC4, 0xC8, 0xCC}:  # SOFn frame header
+                h, w = struct.unpack(">xHH", f.read(5))
+                return "jpeg", (w, h) if rotation in {6, 8} else (h, w)  # rotation 270 or 90
+            if m == 0xE1 and rotation is None:  # first APP1, EXIF
+                rotation = _exif_rotation(f.read(n - 2))
+            else:
+                f.seek(n - 2, 1)
+    return None
+
+
+def _exif_rotation(segment):
+    """Return the EXIF orientation tag of a JPEG APP1 segment, or None."""
+    if not segment.startswith(b"Exif\x00\x00"):
+        return None
+    t = segment[6:]
+    e = "<" if t[:2] == b"II" else ">"
+    try:
+        (ifd,) = struct.unpack_from(e + "I", t, 4)
+        (n,) = struct.unpack_from(e + "H", t, ifd)
+        for i in range(n):
+            tag, _, _, value = struct.unpack_from(e + "HHIH", t, ifd + 2 + 12 * i)
+            if tag == 274:  # the EXIF key for the orientation tag is 274
+                return value
+    except struct.error:
+        pass
+    return None
+
+
+def verify_image_file(im_file, prefix="", deep=False):
+    """
+    Verify one image file and return its shape.
+
+    The format and size are read from the image header only, and JPEGs missing their end-of-image marker are restored.
+    The deeper pass additionally decodes the file structure with PIL verify(), it also runs for formats whose header
+    can not be probed.
+
+    Args:
+        im_file (str): Image file path.
+        prefix (str): Prefix for warning messages.
+        deep (bool): Run the deeper pass for all files.
+
+    Returns:
+        shape (tuple): EXIF-corrected image shape (h, w).
+        msg (str): Warning message, empty if none.
+    """
+    msg = ""
+    header = image_header(im_file)
+    if header is None:  # other formats, PIL reads the header only until the image is loaded
+        deep = True
+        im = Image.open(im_file)
+        header = im.format.lower(), exif_size(im)[::-1]
+    fmt, shape = header
+    assert (shape[0] > 9) & (shape[1] > 9), f"image size {shape} <10 pixels"
+    assert fmt in IMG_FORMATS, f"invalid image format {fmt}. {FORMATS_HELP_MSG}"
+    if deep:
+        Image.open(im_file).verify()  # PIL verify
+    if fmt in {"jpg", "jpeg"}:
+        with open(im_file, "rb") as f:
+            f.seek(-2, 2)
+            if f.read() != b"\xff\xd9":  # corrupt JPEG
+                ImageOps.exif_transpose(Image.open(im_file)).save(im_file, "JPEG", subsampling=0, quality=100)
+                msg = f"{prefix}WARNING ⚠️ {im_file}: corrupt JPEG restored and saved"
+    return shape, msg
+
+
+def imap_verify(func, iterable, total):
+    """
+    Map a dataset verification function over its arguments, yielding results in order.
+
+    Datasets of 1000 or more files are verified in a process pool with chunked submission, so decoding headers and
+    parsing labels is not limited by the GIL. Smaller ones use a thread pool, where process start-up would dominate.
+
+    Args:
+        func (callable): A picklable verification function, i.e. verify_image_label.
+        iterable (Iterable): Arguments of each call.
+        total (int): Number of calls.
+
+    Yields:
+        (Any): Result of each call, in order.
+    """
+    with Pool(NUM_THREADS) if total >= 1000 else ThreadPool(NUM_THREADS) as pool:
+        yield from pool.imap(func, iterable, chunksize=max(1, min(256, total // NUM_THREADS // 8)))
+
+
 def verify_image(args):
     """Verify one image."""
-    (im_file, cls), prefix = args
+    (im_file, cls), prefix, deep = args
     # Number (found, corrupt), message
     nf, nc, msg = 0, 0, ""
     try:
-        im = Image.open(im_file)
-        im.verify()  # PIL verify
-        shape = exif_size(im)  # image size
-        shape = (shape[1], shape[0])  # hw
-        assert (shape[0] > 9) & (shape[1] > 9), f"image size {shape} <10 pixels"
-        assert im.format.lower() in IMG_FORMATS, f"Invalid image format {im.format}. {FORMATS_HELP_MSG}"
-        if im.format.lower() in {"jpg", "jpeg"}:
-            with open(im_file, "rb") as f:
-                f.seek(-2, 2)
-                if f.read() != b"\xff\xd9":  # corrupt JPEG
-                    ImageOps.exif_transpose(Image.open(im_file)).save(im_file, "JPEG", subsampling=0, quality=100)
-                    msg = f"{prefix}WARNING ⚠️ {im_file}: corrupt JPEG restored and saved"
+        _, msg = verify_image_file(im_file, prefix, deep)
         nf = 1
     except Exception as e:
         nc = 1
@@ -94,70 +218,82 @@ def verify_image(args):
     return (im_file, cls), nf, nc, msg
 
 
+def parse_yolo_label(text, keypoint, num_cls, nkpt, ndim):
+    """
+    Parse and validate the contents of one YOLO label file.
+
+    Args:
+        text (str): Label file contents, one object per line.
+        keypoint (bool): Whether labels carry `nkpt * ndim` keypoint columns after the box.
+        num_cls (int): Number of dataset classes.
+        nkpt (int): Number of keypoints per object.
+        ndim (int): Number of values per keypoint, 2 or 3.
+
+    Returns:
+        lb (np.ndarray): Labels of shape (N, 5) as (cls, xywh), normalized.
+        segments (List[np.ndarray]): Polygon segments, empty unless the labels are segments.
+        keypoints (np.ndarray | None): Keypoints of shape (N, nkpt, 3), or None if `keypoint` is False.
+        ndup (int): Number of duplicate rows removed.
+    """
+    segments, keypoints, ndup = [], None, 0
+    lb = [x.split() for x in text.strip().splitlines() if len(x)]
+    if any(len(x) > 6 for x in lb) and (not keypoint):  # is segment
+        classes = np.array([x[0] for x in lb], dtype=np.float32)
+        segments = [np.array(x[1:], dtype=np.float32).reshape(-1, 2) for x in lb]  # (cls, xy1...)
+        lb = np.concatenate((classes.reshape(-1, 1), segments2boxes(segments)), 1)  # (cls, xywh)
+    lb = np.array(lb, dtype=np.float32)
+    if nl := len(lb):
+        if keypoint:
+            assert lb.shape[1] == (5 + nkpt * ndim), f"labels require {(5 + nkpt * ndim)} columns each"
+            points = lb[:, 5:].reshape(-1, ndim)[:, :2]
+        else:
+            assert lb.shape[1] == 5, f"labels require 5 columns, {lb.shape[1]} columns detected"
+            points = lb[:, 1:]
+        assert points.max() <= 1, f"non-normalized or out of bounds coordinates {points[points > 1]}"
+        assert lb.min() >= 0, f"negative label values {lb[lb < 0]}"
+
+        # All labels
+        max_cls = lb[:, 0].max()  # max label count
+        assert max_cls <= num_cls, (
+            f"Label class {int(max_cls)} exceeds dataset class count {num_cls}. "
+            f"Possible class labels are 0-{num_cls - 1}"
+        )
+        _, i = np.unique(lb, axis=0, return_index=True)
+        if len(i) < nl:  # duplicate row check
+            lb = lb[i]  # remove duplicates
+            if segments:
+                segments = [segments[x] for x in i]
+            ndup = nl - len(i)
+    else:
+        lb = np.zeros((0, (5 + nkpt * ndim) if keypoint else 5), dtype=np.float32)
+    if keypoint:
+        keypoints = lb[:, 5:].reshape(-1, nkpt, ndim)
+        if ndim == 2:
+            kpt_mask = np.where((keypoints[..., 0] < 0) | (keypoints[..., 1] < 0), 0.0, 1.0).astype(np.float32)
+            keypoints = np.concatenate([keypoints, kpt_mask[..., None]], axis=-1)  # (nl, nkpt, 3)
+    return lb[:, :5], segments, keypoints, ndup
+
+
 def verify_image_label(args):
     """Verify one image-label pair."""
-    im_file, lb_file, prefix, keypoint, num_cls, nkpt, ndim = args
+    im_file, lb_file, prefix, keypoint, num_cls, nkpt, ndim, deep = args
     # Number (missing, found, empty, corrupt), message, segments, keypoints
     nm, nf, ne, nc, msg, segments, keypoints = 0, 0, 0, 0, "", [], None
     try:
         # Verify images
-        im = Image.open(im_file)
-        im.verify()  # PIL verify
-        shape = exif_size(im)  # image size
-        shape = (shape[1], shape[0])  # hw
-        assert (shape[0] > 9) & (shape[1] > 9), f"image size {shape} <10 pixels"
-        assert im.format.lower() in IMG_FORMATS, f"invalid image format {im.format}. {FORMATS_HELP_MSG}"
-        if im.format.lower() in {"jpg", "jpeg"}:
-            with open(im_file, "rb") as f:
-                f.seek(-2, 2)
-                if f.read() != b"\xff\xd9":  # corrupt JPEG
-                    ImageOps.exif_transpose(Image.open(im_file)).save(im_file, "JPEG", subsampling=0, quality=100)
-                    msg = f"{prefix}WARNING ⚠️ {im_file}: corrupt JPEG restored and saved"
+        shape, msg = verify_image_file(im_file, prefix, deep)
 
         # Verify labels
         if os.path.isfile(lb_file):
             nf = 1  # label found
             with open(lb_file) as f:
-                lb = [x.split() for x in f.read().strip().splitlines() if len(x)]
-                if any(len(x) > 6 for x in lb) and (not keypoint):  # is segment
-                    classes = np.array([x[0] for x in lb], dtype=np.float32)
-                    segments = [np.array(x[1:], dtype=np.float32).reshape(-1, 2) for x in lb]  # (cls, xy1...)
-                    lb = np.concatenate((classes.reshape(-1, 1), segments2boxes(segments)), 1)  # (cls, xywh)
-                lb = np.array(lb, dtype=np.float32)
-            if nl := len(lb):
-                if keypoint:
-                    assert lb.shape[1] == (5 + nkpt * ndim), f"labels require {(5 + nkpt * ndim)} columns each"
-                    points = lb[:, 5:].reshape(-1, ndim)[:, :2]
-                else:
-                    assert lb.shape[1] == 5, f"labels require 5 columns, {lb.shape[1]} columns detected"
-                    points = lb[:, 1:]
-                assert points.max() <= 1, f"non-normalized or out of bounds coordinates {points[points > 1]}"
-                assert lb.min() >= 0, f"negative label values {lb[lb < 0]}"
-
-                # All labels
-                max_cls = lb[:, 0].max()  # max label count
-                assert max_cls <= num_cls, (
-                    f"Label class {int(max_cls)} exceeds dataset class count {num_cls}. "
-                    f"Possible class labels are 0-{num_cls - 1}"
-                )
-                _, i = np.unique(lb, axis=0, return_index=True)
-                if len(i) < nl:  # duplicate row check
-                    lb = lb[i]  # remove duplicates
-                    if segments:
-                        segments = [segments[x] for x in i]
-                    msg = f"{prefix}WARNING ⚠️ {im_file}: {nl - len(i)} duplicate labels removed"
-            else:
-                ne = 1  # label empty
-                lb = np.zeros((0, (5 + nkpt * ndim) if keypoint else 5), dtype=np.float32)
+                lb, segments, keypoints, ndup = parse_yolo_label(f.read(), keypoint, num_cls, nkpt, ndim)
+            if ndup:
+                msg = f"{prefix}WARNING ⚠️ {im_file}: {ndup} duplicate labels removed"
+            ne = int(not len(lb))  # label empty
         else:
             nm = 1  # label missing
-            lb = np.zeros((0, (5 + nkpt * ndim) if keypoints else 5), dtype=np.float32)
-        if keypoint:
-            keypoints = lb[:, 5:].reshape(-1, nkpt, ndim)
-            if ndim == 2:
-                kpt_mask = np.where((keypoints[..., 0] < 0) | (keypoints[..., 1] < 0), 0.0, 1.0).astype(np.float32)
-                keypoints = np.concatenate([keypoints, kpt_mask[..., None]], axis=-1)  # (nl, nkpt, 3)
-        lb = lb[:, :5]
+            lb, segments, keypoints, _ = parse_yolo_label("", keypoint, num_cls, nkpt, ndim)
         return im_file, lb, shape, segments, keypoints, nm, nf, ne, nc, msg
     except Exception as e:
         nc = 1
@@ -237,42 +373,81 @@ def polygon2mask(imgsz, polygons, color=1, downsample_ratio=1):
     return cv2.resize(mask, (nw, nh))
 
 
+def polygons2points(polygons, downsample_ratio=1, shift=4):
+    """
+    Convert polygons to the fixed-point vertices that cv2.fillPoly() draws at a downsampled mask resolution.
+
+    Vertices are mapped like cv2.resize() maps pixels, x' = (x + 0.5) / downsample_ratio - 0.5, so drawing at the
+    downsampled resolution samples polygons at the same pixel centers as drawing at full resolution and resizing.
+
+    Args:
+        polygons (list[np.ndarray] | np.ndarray): Polygons as arrays of shape [M, 2] or [M * 2], or one array of shape
+            [N, M, 2] of polygons with the same number of points.
+        downsample_ratio (int, optional): Factor by which the mask is downsampled. Defaults to 1.
+        shift (int, optional): Number of fractional bits of the vertices, the `shift` argument of cv2.fillPoly().
+
+    Returns:
+        (list[np.ndarray] | np.ndarray): An int32 array of shape [M, 2] per polygon, or one array of shape [N, M, 2] for
+            an array input.
+    """
+    s = (1 << shift) / downsample_ratio
+    if isinstance(polygons, np.ndarray) and polygons.dtype != object:  # one vectorized conversion
+        polygons = polygons if polygons.ndim == 3 else polygons.reshape(len(polygons), -1, 2)
+        return np.round((polygons + 0.5) * s - 0.5 * (1 << shift)).astype(np.int32)
+    return [np.round((np.asarray(x).reshape(-1, 2) + 0.5) * s - 0.5 * (1 << shift)).astype(np.int32) for x in polygons]
+
+
 def polygons2masks(imgsz, polygons, color, downsample_ratio=1):
     """
     Convert a list of polygons to a set of binary masks of the specified image size.
 
+    Polygons are filled directly at the downsampled resolution rather than at full resolution and resized.
+
     Args:
         imgsz (tuple): The size of the image as (height, width).
-        polygons (list[np.ndarray]): A list of polygons. Each polygon is an array with shape [N, M], where
-                                     N is the number of polygons, and M is the number of points such that M % 2 = 0.
+        polygons (list[np.ndarray] | np.ndarray): Polygons, see polygons2points().
         color (int): The color value to fill in the polygons on the masks.
         downsample_ratio (int, optional): Factor by which to downsample each mask. Defaults to 1.
 
     Returns:
         (np.ndarray): A set of binary masks of the specified image size with the polygons filled in.
     """
-    return np.array([polygon2mask(imgsz, [x.reshape(-1)], color, downsample_ratio) for x in polygons])
+    masks = np.zeros((len(polygons), imgsz[0] // downsample_ratio, imgsz[1] // downsample_ratio), dtype=np.uint8)
+    for mask, points in zip(masks, polygons2points(polygons, downsample_ratio)):
+        cv2.fillPoly(mask, [points], color=color, shift=4)
+    return masks
 
 
 def polygons2masks_overlap(imgsz, segments, downsample_ratio=1):
-    """Return a (640, 640) overlap mask."""
+    """
+    Convert polygons to one overlap mask of instance indices at the downsampled resolution.
+
+    Instances are sorted by polygon area, largest first, and filled in that order into a single index mask, so smaller
+    instances are drawn over larger ones. Areas come from the polygon vertices (shoelace formula), not from masks.
+
+    Args:
+        imgsz (tuple): The size of the image as (height, width).
+        segments (list[np.ndarray] | np.ndarray): Polygons, see polygons2points().
+        downsample_ratio (int, optional): Factor by which to downsample the mask. Defaults to 1.
+
+    Returns:
+        masks (np.ndarray): Mask of shape (height // downsample_ratio, width // downsample_ratio), where value i + 1
+            marks the i-th instance in sorted order and 0 marks background.
+        index (np.ndarray): Indices that sort the instances by descending area.
+    """
     masks = np.zeros(
         (imgsz[0] // downsample_ratio, imgsz[1] // downsample_ratio),
         dtype=np.int32 if len(segments) > 255 else np.uint8,
     )
-    areas = []
-    ms = []
-    for si in range(len(segments)):
-        mask = polygon2mask(imgsz, [segments[si].reshape(-1)], downsample_ratio=downsample_ratio, color=1)
-        ms.append(mask.astype(masks.dtype))
-        areas.append(mask.sum())
-    areas = np.asarray(areas)
-    index = np.argsort(-areas)
-    ms = np.array(ms)[index]
-    for i in range(len(segments)):
-        mask = ms[i] * (i + 1)
-        masks = masks + mask
-        masks = np.clip(masks, a_min=0, a_max=i + 1)
+    points = polygons2points(segments, downsample_ratio)
+    xy = [points] if isinstance(points, np.ndarray) else [x[None] for x in points]  # groups of equal point counts
+    xy = [x.astype(np.int64) for x in xy]
+    areas = np.concatenate(
+        [np.abs((x[..., 0] * np.roll(x[..., 1], -1, -1) - np.roll(x[..., 0], -1, -1) * x[..., 1]).sum(-1)) for x in xy]
+    )  # shoelace formula, twice the area in squared fixed-point units
+    index = np.argsort(-areas, kind="stable")
+    for i, j in enumerate(index):
+        cv2.fillPoly(masks, [points[j]], color=i + 1, shift=4)
     return masks, index
 
 
@@ -317,7 +492,7 @@ def check_det_dataset(dataset, autodownload=True):
 
     # Download (optional)
     extract_dir = ""
-    if zipfile.is_zipfile(file) or is_tarfile(file):
+    if zipfile.is_zipfile(file) or tarfile.is_tarfile(file):
         new_dir = safe_download(file, dir=DATASETS_DIR, unzip=True, delete=False)
         file = find_dataset_yaml(DATASETS_DIR / new_dir)
         extract_dir, autodownload = file.parent, False
@@ -627,6 +802,153 @@ class HUBDatasetStats:
         return self.im_dir
 
 
+def encode_image(im, codec):
+    """
+    Compress a uint8 image for the compressed RAM cache.
+
+    Args:
+        im (np.ndarray): Image to compress.
+        codec (str): 'jpg' (quality 95), 'webp' (quality 95) or 'png' encoded with OpenCV, or 'lz4' or 'zstd'
+            compression of the raw pixels.
+
+    Returns:
+        (bytes): The compressed image.
+    """
+    if codec == "lz4":
+        import lz4.block  # scope for faster 'import ultralytics'
+
+        return lz4.block.compress(np.ascontiguousarray(im), store_size=True)
+    if codec == "zstd":
+        import zstandard  # scope for faster 'import ultralytics'
+
+        return zstandard.ZstdCompressor(level=3).compress(np.ascontiguousarray(im))
+    params = {"jpg": [cv2.IMWRITE_JPEG_QUALITY, 95], "webp": [cv2.IMWRITE_WEBP_QUALITY, 95]}.get(codec, [])
+    return cv2.imencode(f".{codec}", im, params)[1].tobytes()
+
+
+def decode_image(buffer, codec, shape):
+    """
+    Decompress an image compressed with `encode_image`.
+
+    Args:
+        buffer (bytes): The compressed image.
+        codec (str): Codec the image was compressed with.
+        shape (tuple): Shape of the image.
+
+    Returns:
+        (np.ndarray): The writeable uint8 image.
+    """
+    if codec == "lz4":
+        import lz4.block  # scope for faster 'import ultralytics'
+
+        return np.frombuffer(lz4.block.decompress(buffer, return_bytearray=True), dtype=np.uint8).reshape(shape)
+    if codec == "zstd":
+        import zstandard  # scope for faster 'import ultralytics'
+
+        return np.frombuffer(bytearray(zstandard.ZstdDecompressor().decompress(buffer)), dtype=np.uint8).reshape(shape)
+    return cv2.imdecode(np.frombuffer(buffer, dtype=np.uint8), cv2.IMREAD_UNCHANGED).reshape(shape)
+
+
+def expand_braces(pattern):
+    """
+    Expand WebDataset-style brace patterns such as 'train-{000..099}.tar' or 'train-{a,b}.tar'.
+
+    Args:
+        pattern (str): Path pattern with zero or more brace groups.
+
+    Returns:
+        (List[str]): Expanded paths, in pattern order.
+    """
+    m = re.search(r"\{([^{}]*)\}", pattern)
+    if not m:
+        return [pattern]
+    head, body, tail = pattern[: m.start()], m.group(1), pattern[m.end() :]
+    if r := re.fullmatch(r"(\d+)\.\.(\d+)", body):
+        a, b = r.groups()
+        parts = [str(i).zfill(len(a)) for i in range(int(a), int(b) + 1)]
+    else:
+        parts = body.split(",")
+    return [x for p in parts for x in expand_braces(head + p + tail)]
+
+
+def get_shard_files(path):
+    """
+    Return the tar or zip shards of a streaming dataset, or an empty list if `path` is not one.
+
+    Args:
+        path (str | Path | List): A shard file, a directory holding only shards, a glob or brace pattern, or a list.
+
+    Returns:
+        (List[str]): Sorted shard paths.
+    """
+    files = []
+    for p in path if isinstance(path, (list, tuple)) else [path]:
+        p = str(p)
+        if os.path.isdir(p):
+            f = sorted(str(x) for x in Path(p).iterdir() if x.is_file())
+            if not f or not all(x.lower().endswith(SHARD_FORMATS) for x in f):
+                return []  # image directory
+        else:
+            f = sorted(x for q in expand_braces(p) for x in (glob.glob(q) if glob.has_magic(q) else [q]))
+            if not f or not all(x.lower().endswith(SHARD_FORMATS) and os.path.isfile(x) for x in f):
+                return []
+        files += f
+    return files
+
+
+def _shard_key(name):
+    """Split a shard member name into its sample key and lower-case extension, e.g. 'a/b.seg.txt' -> 'a/b', 'seg.txt'."""
+    d, _, base = name.rpartition("/")
+    key, _, ext = base.partition(".")
+    return f"{d}/{key}" if d else key, ext.lower()
+
+
+def _shard_members(shard):
+    """Yield (name, bytes) for the files of a tar or zip shard in storage order, reading the shard sequentially."""
+    if shard.lower().endswith(".zip"):
+        with zipfile.ZipFile(shard) as z:
+            for info in z.infolist():
+                if not info.is_dir():
+                    yield info.filename, z.read(info)
+    else:
+        with tarfile.open(shard, "r|*") as t:  # stream mode, no seeking
+            for m in t:
+                if m.isfile():
+                    yield m.name, t.extractfile(m).read()
+
+
+def read_shard(shard):
+    """
+    Stream the samples of a tar or zip shard, grouping consecutive files that share a key.
+
+    Args:
+        shard (str): Path to a .tar, .tar.gz, .tgz or .zip shard, written as 'key.jpg', 'key.txt', ... per sample.
+
+    Yields:
+        (Tuple[str, Dict[str, bytes]]): Sample key and a mapping of file extension to contents.
+    """
+    key, sample = None, {}
+    for name, data in _shard_members(shard):
+        k, ext = _shard_key(name)
+        if k != key and sample:
+            yield key, sample
+            sample = {}
+        key, sample[ext] = k, data
+    if sample:
+        yield key, sample
+
+
+def count_shard_samples(shard):
+    """Count the image samples in a tar or zip shard from its member names, without decoding any data."""
+    if shard.lower().endswith(".zip"):
+        with zipfile.ZipFile(shard) as z:
+            names = [x.filename for x in z.infolist() if not x.is_dir()]
+    else:
+        with tarfile.open(shard, "r:*") as t:
+            names = [m.name for m in t if m.isfile()]
+    return len({k for k, ext in map(_shard_key, names) if ext in IMG_FORMATS})
+
+
 def compress_one_image(f, f_new=None, max_dim=1920, quality=50):
     """
     Compresses a single image file to reduced size while preserving its aspect ratio and quality using either the Python
@@ -709,9 +1031,11 @@ def load_dataset_cache_file(path):
 
 
 def save_dataset_cache_file(prefix, path, x, version):
-    """Save an Ultralytics dataset *.cache dictionary x to path."""
+    """Save an Ultralytics dataset *.cache dictionary x to path, with a LabelStore in x['labels'] saved beside it."""
     x["version"] = version  # add cache version
     if is_dir_writeable(path.parent):
+        if isinstance(x.get("labels"), LabelStore):
+            x["labels"] = x["labels"].save(path.with_suffix(".labels.npy").resolve())  # memory-mapped, pickled by path
         if path.exists():
             path.unlink()  # remove *.cache file if exists
         np.save(str(path), x)  # save cache for next time
@@ -719,3 +1043,431 @@ def save_dataset_cache_file(prefix, path, x, version):
         LOGGER.info(f"{prefix}New cache created: {path}")
     else:
         LOGGER.warning(f"{prefix}WARNING ⚠️ Cache directory {path.parent} is not writeable, cache not saved.")
+
+
+class LabelStore:
+    """
+    Columnar store of YOLO dataset labels, replacing a list of per-image label dictionaries.
+
+    Labels of all images are concatenated into a few flat numpy arrays indexed by offsets: box rows (`cls`, `bboxes`,
+    `keypoints`) by `box_offsets`, segments by `seg_offsets` and packed segment points by `point_offsets`. A dataset of
+    millions of objects is then held in a handful of arrays instead of millions of small Python objects, which keeps
+    memory flat in forked dataloader workers (no copy-on-write of reference counts), and the arrays can be saved to a
+    single file that is memory-mapped on load and shared through the page cache by every process reading it.
+
+    Indexing with an integer returns a label dictionary in the usual format whose 'bboxes', 'segments' and 'keypoints'
+    are read-only views of the stored rows, copied on write by Instances, and whose 'cls' is a fresh copy. Indexing with
+    a slice, list or array returns a reordered LabelStore sharing the same arrays.
+
+    Attributes:
+        arrays (dict): Flat label arrays, possibly memory-mapped from `path`.
+        index (np.ndarray): Row of each label in the stored arrays, i.e. after rect reordering.
+        path (Path | None): File the arrays are memory-mapped from, or None for an in-memory store.
+        layout (dict | None): Layout of the arrays in `path`, {name: (dtype, shape, byte offset)}.
+        single_cls (bool): Whether class indices are returned as 0.
+
+    Examples:
+        >>> store = LabelStore.from_labels(labels)
+        >>> store = store.save(Path("labels.labels.npy"))  # memory-mapped from now on
+        >>> label = store[0]  # dict with 'im_file', 'shape', 'cls', 'bboxes', 'segments', 'keypoints', ...
+        >>> store = store[np.argsort(store.shapes[:, 0])]  # reordered view
+    """
+
+    fields = (
+        "files",
+        "file_offsets",
+        "shapes",
+        "box_offsets",
+        "cls",
+        "bboxes",
+        "keypoints",
+        "seg_offsets",
+        "point_offsets",
+        "points",
+    )
+
+    def __init__(self, arrays, index=None, path=None, layout=None, single_cls=False):
+        """
+        Initialize the store from flat label arrays.
+
+        Args:
+            arrays (dict): Flat label arrays, keyed by `LabelStore.fields`. 'keypoints' may be None.
+            index (np.ndarray, optional): Row of each label in the arrays, defaults to all rows in order.
+            path (Path, optional): File the arrays are memory-mapped from.
+            layout (dict, optional): Layout of the arrays in `path`, as returned by `save()`.
+            single_cls (bool): Whether class indices are returned as 0.
+        """
+        self.arrays = arrays
+        self.index = np.arange(len(arrays["shapes"])) if index is None else np.asarray(index, dtype=np.int64)
+        self.path = path
+        self.layout = layout
+        self.single_cls = single_cls
+
+    @classmethod
+    def from_labels(cls, labels):
+        """
+        Build a store from a list of label dictionaries as produced by `verify_image_label`.
+
+        Args:
+            labels (List[dict]): Label dictionaries with 'im_file', 'shape', 'cls', 'bboxes', 'segments' and
+                'keypoints' keys.
+
+        Returns:
+            (LabelStore): An in-memory store holding the labels.
+        """
+        files = [lb["im_file"].encode() for lb in labels]
+        segments = [s for lb in labels for s in lb["segments"]]
+        keypoints = [lb["keypoints"] for lb in labels if lb["keypoints"] is not None]
+        arrays = {
+            "files": np.frombuffer(b"".join(files), dtype=np.uint8),
+            "file_offsets": np.cumsum([0] + [len(f) for f in files], dtype=np.int64),
+            "shapes": np.array([lb["shape"] for lb in labels], dtype=np.int64).reshape(-1, 2),
+            "box_offsets": np.cumsum([0] + [len(lb["cls"]) for lb in labels], dtype=np.int64),
+            "cls": np.concatenate([lb["cls"] for lb in labels] or [np.zeros((0, 1))]).astype(np.float32),
+            "bboxes": np.concatenate([lb["bboxes"] for lb in labels] or [np.zeros((0, 4))]).astype(np.float32),
+            "keypoints": np.concatenate(keypoints).astype(np.float32) if keypoints else None,
+            "seg_offsets": np.cumsum([0] + [len(lb["segments"]) for lb in labels], dtype=np.int64),
+            "point_offsets": np.cumsum([0] + [len(s) for s in segments], dtype=np.int64),
+            "points": np.concatenate(segments or [np.zeros((0, 2))]).astype(np.float32),
+        }
+        return cls(arrays)
+
+    @classmethod
+    def concatenate(cls, stores):
+        """
+        Concatenate stores, in order, into one in-memory store.
+
+        Args:
+            stores (List[LabelStore]): Stores to concatenate. Stores without boxes may lack keypoints.
+
+        Returns:
+            (LabelStore): The concatenated store.
+        """
+        arrays = [s.compact().arrays for s in stores]
+
+        def offsets(k):
+            """Concatenate offset arrays k, shifting each by the total length of the previous ones."""
+            shift = np.cumsum([0] + [a[k][-1] for a in arrays[:-1]])
+            return np.concatenate([[0]] + [a[k][1:] + s for a, s in zip(arrays, shift)]).astype(np.int64)
+
+        keypoints = [a["keypoints"] for a in arrays if a["keypoints"] is not None]
+        out = {k: offsets(k) for k in cls.fields if k.endswith("_offsets")}
+        out.update({k: np.concatenate([a[k] for a in arrays]) for k in ("files", "shapes", "cls", "bboxes", "points")})
+        out["keypoints"] = np.concatenate(keypoints) if keypoints else None
+        assert out["keypoints"] is None or len(out["keypoints"]) == len(out["cls"]), "keypoints missing from a store"
+        return cls(out)
+
+    @classmethod
+    def load(cls, path, layout):
+        """
+        Memory-map a store saved with `save()`.
+
+        Args:
+            path (Path): File written by `save()`.
+            layout (dict): Layout of the arrays in the file, {name: (dtype, shape, byte offset)}.
+
+        Returns:
+            (LabelStore): A store whose arrays are read-only views into the memory-mapped file.
+        """
+        buffer = np.load(str(path), mmap_mode="r")
+        arrays = {k: None for k in cls.fields}
+        for k, (dtype, shape, offset) in layout.items():
+            n = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            arrays[k] = buffer[offset : offset + n].view(dtype).reshape(shape)
+        return cls(arrays, path=Path(path), layout=layout)
+
+    def save(self, path):
+        """
+        Save the stored arrays to a single memory-mappable file and return a store mapped from it.
+
+        The file is written next to its destination and then renamed, so processes still mapping a previous version of
+        the file keep reading it unchanged.
+
+        Args:
+            path (Path): Destination *.npy file.
+
+        Returns:
+            (LabelStore): A memory-mapped store with the same labels, order and class mode as this one.
+        """
+        arrays = self.compact().arrays if len(self.index) != len(self.arrays["shapes"]) else self.arrays
+        layout, chunks, offset = {}, [], 0
+        for k in self.fields:
+            if arrays[k] is None:
+                continue
+            x = np.ascontiguousarray(arrays[k])
+            layout[k] = (x.dtype.str, x.shape, offset)
+            pad = -x.nbytes % 64  # keep every array 64-byte aligned
+            chunks += [x.reshape(-1).view(np.uint8), np.zeros(pad, dtype=np.uint8)]
+            offset += x.nbytes + pad
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.npy")
+        np.save(str(tmp), np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8))
+        os.replace(tmp, path)
+        index = self.index if arrays is self.arrays else None
+        return LabelStore(self.load(path, layout).arrays, index, path, layout, self.single_cls)
+
+    def __len__(self):
+        """Return the number of images."""
+        return len(self.index)
+
+    def __iter__(self):
+        """Iterate over label dictionaries."""
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, i):
+        """Return a label dictionary for an integer index, or a reordered store for a slice, list or array."""
+        if not isinstance(i, (int, np.integer)):
+            return LabelStore(self.arrays, self.index[i], self.path, self.layout, self.single_cls)
+        a = self.arrays
+        j = self.index[i]
+        b0, b1 = a["box_offsets"][j : j + 2]
+        s0, s1 = a["seg_offsets"][j : j + 2]
+        p = a["point_offsets"][s0 : s1 + 1]
+        cls = np.zeros((b1 - b0, 1), dtype=np.float32) if self.single_cls else np.array(a["cls"][b0:b1])
+        bboxes, points, keypoints = (self._view(a[k]) for k in ("bboxes", "points", "keypoints"))
+        return {
+            "im_file": self._file(j),
+            "shape": tuple(int(x) for x in a["shapes"][j]),
+            "cls": cls,
+            "bboxes": bboxes[b0:b1],
+            "segments": [points[p[k] : p[k + 1]] for k in range(s1 - s0)],
+            "keypoints": None if keypoints is None else keypoints[b0:b1],
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+    def __getstate__(self):
+        """Pickle memory-mapped stores by file path and layout only, e.g. for spawned dataloader workers."""
+        state = self.__dict__.copy()
+        if self.path is not None:
+            state["arrays"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled store, memory-mapping its file again if it had one."""
+        self.__dict__.update(state)
+        if self.arrays is None:
+            self.arrays = self.load(self.path, self.layout).arrays
+
+    @staticmethod
+    def _view(x):
+        """Return a read-only ndarray view of stored array x, or None, so that labels cannot write into the store."""
+        if x is None:
+            return None
+        x = x.view(np.ndarray)  # also drops the np.memmap subclass and its overhead in later operations
+        x.flags.writeable = False
+        return x
+
+    def _file(self, j):
+        """Return the decoded image file path of stored row j."""
+        f0, f1 = self.arrays["file_offsets"][j : j + 2]
+        return self.arrays["files"][f0:f1].tobytes().decode()
+
+    @property
+    def im_files(self):
+        """Return the image file paths of all labels."""
+        return [self._file(j) for j in self.index]
+
+    @property
+    def shapes(self):
+        """Return image shapes (h, w) of all labels as an (N, 2) array."""
+        return np.asarray(self.arrays["shapes"][self.index])
+
+    @property
+    def num_boxes(self):
+        """Return the number of boxes of each label."""
+        return np.diff(self.arrays["box_offsets"])[self.index]
+
+    @property
+    def num_segments(self):
+        """Return the number of segments of each label."""
+        return np.diff(self.arrays["seg_offsets"])[self.index]
+
+    def compact(self, keep=None):
+        """
+        Return an in-memory store holding only the labels of `index`, in order, and optionally only some boxes.
+
+        Args:
+            keep (np.ndarray, optional): Boolean mask over stored box rows selecting the boxes (and their segments and
+                keypoints) to keep.
+
+        Returns:
+            (LabelStore): A store whose arrays are laid out in this store's label order.
+        """
+        a = self.arrays
+        nb, ns = np.diff(a["box_offsets"]), np.diff(a["seg_offsets"])
+        assert ((ns == 0) | (ns == nb)).all(), "segments must be absent or match boxes one to one"
+        boxes = _ragged(a["box_offsets"][self.index], nb[self.index])
+        segments = _ragged(a["seg_offsets"][self.index], ns[self.index])
+        image = np.repeat(np.arange(len(self.index)), nb[self.index])  # label of each box
+        seg_image = np.repeat(np.arange(len(self.index)), ns[self.index])
+        if keep is not None:
+            seg_keep = keep[a["box_offsets"][:-1].repeat(ns) + _ragged(np.zeros_like(ns), ns)]
+            boxes, image = boxes[keep[boxes]], image[keep[boxes]]
+            segments, seg_image = segments[seg_keep[segments]], seg_image[seg_keep[segments]]
+        np_ = np.diff(a["point_offsets"])[segments]
+        f0, nf = a["file_offsets"][self.index], np.diff(a["file_offsets"])[self.index]
+        arrays = {
+            "files": np.asarray(a["files"][_ragged(f0, nf)]),
+            "file_offsets": np.concatenate(([0], np.cumsum(nf))).astype(np.int64),
+            "shapes": np.asarray(a["shapes"][self.index]),
+            "box_offsets": np.concatenate(([0], np.cumsum(np.bincount(image, minlength=len(self.index))))),
+            "cls": np.asarray(a["cls"][boxes]),
+            "bboxes": np.asarray(a["bboxes"][boxes]),
+            "keypoints": None if a["keypoints"] is None else np.asarray(a["keypoints"][boxes]),
+            "seg_offsets": np.concatenate(([0], np.cumsum(np.bincount(seg_image, minlength=len(self.index))))),
+            "point_offsets": np.concatenate(([0], np.cumsum(np_))).astype(np.int64),
+            "points": np.asarray(a["points"][_ragged(a["point_offsets"][segments], np_)]),
+        }
+        return LabelStore(arrays, single_cls=self.single_cls)
+
+    def filter_classes(self, include_class):
+        """
+        Return an in-memory store keeping only boxes, segments and keypoints of the given classes.
+
+        Args:
+            include_class (list): Class indices to keep.
+
+        Returns:
+            (LabelStore): The filtered store.
+        """
+        return self.compact(keep=np.isin(self.arrays["cls"][:, 0], include_class))
+
+    def drop_segments(self):
+        """Return a store sharing this store's boxes and keypoints but without any segments."""
+        arrays = {
+            **self.arrays,
+            "seg_offsets": np.zeros_like(self.arrays["seg_offsets"]),
+            "point_offsets": np.zeros(1, dtype=np.int64),
+            "points": np.zeros((0, 2), dtype=np.float32),
+        }
+        return LabelStore(arrays, self.index, single_cls=self.single_cls)
+
+
+def _ragged(starts, counts):
+    """Return the concatenated ranges [starts[i], starts[i] + counts[i]) as one int64 index array."""
+    counts = np.asarray(counts, dtype=np.int64)
+    n = counts.sum()
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(counts)
+    return np.repeat(np.asarray(starts, dtype=np.int64) - ends + counts, counts) + np.arange(n)
+
+
+class ImageBuffer:
+    """
+    Bounded least-recently-used buffer of decoded images, the pool that mosaic partners are drawn from.
+
+    Images are evicted least recently used first once the buffer holds more than `max_items` images or, when
+    `max_bytes` is set, more image bytes than that; one entry is always kept so mosaic never sees an empty buffer.
+    The buffer is a sequence of the buffered dataset indices, in arbitrary order from a key list kept alongside the
+    LRU order, so random.choices() samples it in O(k) like the range of indices of a shard shuffle buffer. Every
+    dataloader worker holds its own buffer.
+
+    Args:
+        max_items (int): Maximum number of buffered images.
+        max_bytes (int): Maximum bytes of buffered images, 0 for no byte limit.
+
+    Attributes:
+        items (OrderedDict): Dataset index to (im, hw_original, hw_resized), or None for index-only entries of
+            images cached elsewhere, in least to most recently used order.
+        keys (list): Buffered dataset indices in arbitrary order, for constant-time random sampling.
+        slots (dict): Dataset index to its position in `keys`.
+        nbytes (int): Bytes of buffered images.
+        hits (int): Lookups served from the buffer.
+        misses (int): Lookups of images not in the buffer.
+
+    Examples:
+        >>> buffer = ImageBuffer(max_items=64, max_bytes=512 << 20)
+        >>> buffer.put(0, (im, (h0, w0), im.shape[:2]))
+        >>> im, hw0, hw = buffer.get(0)
+        >>> indexes = random.choices(buffer, k=3)
+        >>> print(buffer)
+    """
+
+    def __init__(self, max_items, max_bytes=0):
+        """Initializes an empty buffer bounded by image count and, optionally, bytes."""
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.keys, self.slots = [], {}
+        self.nbytes = self.hits = self.misses = 0
+        self.lock = threading.Lock()  # images are loaded from a thread pool while caching
+
+    def __len__(self):
+        """Returns the number of buffered images."""
+        return len(self.items)
+
+    def __iter__(self):
+        """Iterates over the buffered dataset indices."""
+        return iter(list(self.keys))
+
+    def __getitem__(self, j):
+        """Returns the buffered dataset index at position `j` of the key list."""
+        return self.keys[j]
+
+    def __contains__(self, i):
+        """Returns whether dataset index `i` is buffered."""
+        return i in self.items
+
+    def __repr__(self):
+        """Returns a summary of buffer size and hit statistics."""
+        return (
+            f"{self.__class__.__name__}(images={len(self)}, MB={self.nbytes / (1 << 20):.1f}, "
+            f"hits={self.hits}, misses={self.misses}, hit_rate={self.hit_rate:.3f})"
+        )
+
+    @property
+    def hit_rate(self):
+        """Returns the fraction of lookups served from the buffer."""
+        return self.hits / max(self.hits + self.misses, 1)
+
+    def get(self, i):
+        """Returns the buffered (im, hw_original, hw_resized) of index `i` and marks it recently used, or None."""
+        with self.lock:
+            x = self.items.get(i)
+            if x is None:
+                self.misses += 1
+                return None
+            self.items.move_to_end(i)
+            self.hits += 1
+            return x
+
+    def put(self, i, x):
+        """Buffers (im, hw_original, hw_resized) or None for index `i`, evicting least recently used images."""
+        with self.lock:
+            if i in self.items:
+                self.nbytes -= self._nbytes(self.items.pop(i))
+            else:
+                self.slots[i] = len(self.keys)
+                self.keys.append(i)
+            self.items[i] = x
+            self.nbytes += self._nbytes(x)
+            while len(self.items) > 1 and (
+                len(self.items) > self.max_items or (self.max_bytes and self.nbytes > self.max_bytes)
+            ):
+                j, y = self.items.popitem(last=False)
+                self.nbytes -= self._nbytes(y)
+                self._remove_key(j)
+
+    def _remove_key(self, i):
+        """Removes index `i` from the key list by swapping the last key into its slot."""
+        slot, last = self.slots.pop(i), self.keys.pop()
+        if last != i:
+            self.keys[slot] = last
+            self.slots[last] = slot
+
+    @staticmethod
+    def _nbytes(x):
+        """Returns the image bytes of a buffer entry."""
+        return 0 if x is None else x[0].nbytes
+
+    def __getstate__(self):
+        """Pickle without the lock, e.g. for spawned dataloader workers."""
+        state = self.__dict__.copy()
+        state.pop("lock")
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled buffer with a new lock."""
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
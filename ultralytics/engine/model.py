@@ -1,6 +1,12 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import asyncio
 import inspect
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Union
 
@@ -62,6 +68,9 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
         fuse: Fuses Conv2d and BatchNorm2d layers for optimized inference.
         predict: Performs object detection predictions.
         track: Performs object tracking.
+        apredict: Awaitable variant of predict for asyncio code.
+        atrack: Awaitable variant of track for asyncio code.
+        astream: Asynchronous iterator over streaming prediction or tracking results.
         val: Validates the model on a dataset.
         benchmark: Benchmarks the model on various export formats.
         export: Exports the model to different formats.
@@ -124,6 +133,7 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
         self.metrics = None  # validation/training metrics
         self.session = None  # HUB session
         self.task = task  # task type
+        self._executor = None  # single-thread executor running apredict/atrack/astream model calls
         model = str(model).strip()  
 
         # Check if Ultralytics HUB model from https://hub.ultralytics.com
@@ -606,6 +616,159 @@ class Model(nn.Module, PyTorchModelHubMixin, repo_url="https://github.com/ultral
         kwargs["mode"] = "track"
         return self.predict(source=source, stream=stream, **kwargs)
 
+    async def apredict(
+        self,
+        source: Union[str, Path, int, Image.Image, list, tuple, np.ndarray, torch.Tensor] = None,
+        **kwargs: Any,
+    ) -> List[Results]:
+        """
+        Performs predictions on the given image source without blocking the asyncio event loop.
+
+        The prediction runs on the model's dedicated single-thread executor, so concurrent calls from different tasks
+        are serialized on the model while the event loop keeps serving other coroutines. Cancelling the awaiting task
+        drops the call if it has not started yet; a call that is already running finishes in the background.
+
+        Args:
+            source (str | Path | int | PIL.Image | np.ndarray | torch.Tensor | List | Tuple): The source of the image(s)
+                to make predictions on, as accepted by predict().
+            **kwargs: Additional keyword arguments for configuring the prediction process.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): A list of prediction results.
+
+        Examples:
+            >>> model = YOLO("yolo11n.pt")
+            >>> results = await model.apredict("path/to/image.jpg", conf=0.25)
+        """
+        kwargs.pop("stream", None)  # use astream() for streaming results
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), partial(self.predict, source, **kwargs)
+        )
+
+    async def atrack(
+        self,
+        source: Union[str, Path, int, list, tuple, np.ndarray, torch.Tensor] = None,
+        persist: bool = False,
+        **kwargs: Any,
+    ) -> List[Results]:
+        """
+        Conducts object tracking on the specified input source without blocking the asyncio event loop.
+
+        Args:
+            source (str | Path | int | List | Tuple | np.ndarray | torch.Tensor): Input source for object tracking, as
+                accepted by track().
+            persist (bool): If True, persists trackers between different calls to this method.
+            **kwargs: Additional keyword arguments for configuring the tracking process.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): A list of tracking results.
+
+        Examples:
+            >>> model = YOLO("yolo11n.pt")
+            >>> results = await model.atrack(frame, persist=True)
+        """
+        kwargs.pop("stream", None)  # use astream(track=True) for streaming results
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), partial(self.track, source, persist=persist, **kwargs)
+        )
+
+    async def astream(self, source=None, track: bool = False, buffer: int = 2, **kwargs: Any):
+        """
+        Asynchronously iterates over prediction or tracking results with bounded buffering.
+
+        Synchronous sources (files, videos, streams, lists of images) are read by the predictor in the model's
+        executor with frame decoding pipelined on a loader thread (`pipeline=True` unless overridden), and results are
+        handed to the event loop through a queue of `buffer` results: when the consumer falls behind, inference pauses
+        instead of accumulating results. Asynchronous iterables of frames, i.e. frames fetched with aiohttp, are
+        consumed on the event loop while earlier frames are inferred, with at most `buffer` frames in flight. Leaving
+        the `async for` loop or cancelling the consuming task stops inference after the current frame.
+
+        Args:
+            source (str | Path | int | List | Tuple | np.ndarray | torch.Tensor | AsyncIterable): The source to run
+                on, as accepted by predict(), or an asynchronous iterable yielding images.
+            track (bool): If True, runs tracking instead of prediction, persisting trackers across frames.
+            buffer (int): Maximum number of results (synchronous sources) or frames (asynchronous sources) buffered
+                between the event loop and the model.
+            **kwargs: Additional keyword arguments for configuring the prediction or tracking process.
+
+        Yields:
+            (ultralytics.engine.results.Results): Prediction or tracking results, one per image or frame.
+
+        Examples:
+            >>> model = YOLO("yolo11n.pt")
+            >>> async for r in model.astream("path/to/video.mp4", track=True):
+            ...     print(r.boxes.id)
+        """
+        assert buffer >= 1, f"buffer={buffer} must be at least 1"
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        kwargs.pop("stream", None)
+
+        if hasattr(source, "__aiter__"):  # frames fetched asynchronously, inferred one call per frame
+            call = partial(self.track, persist=True) if track else self.predict
+            pending = deque()
+            try:
+                async for frame in source:
+                    pending.append(loop.run_in_executor(executor, partial(call, frame, **kwargs)))
+                    if len(pending) >= buffer:
+                        for r in await pending.popleft():
+                            yield r
+                while pending:
+                    for r in await pending.popleft():
+                        yield r
+            finally:
+                for f in pending:
+                    f.cancel()
+            return
+
+        kwargs.setdefault("pipeline", True)
+        results = asyncio.Queue(maxsize=buffer)
+        stop = threading.Event()
+
+        def put(item):
+            """Hand an item to the event loop, blocking while the queue is full; returns False once stopped."""
+            try:
+                future = asyncio.run_coroutine_threadsafe(results.put(item), loop)
+            except RuntimeError:  # event loop closed
+                return False
+            while True:
+                try:
+                    future.result(timeout=0.1)
+                    return True
+                except FutureTimeoutError:
+                    if stop.is_set():
+                        future.cancel()
+                        return False
+
+        def produce():
+            """Run the streaming predictor in the executor and forward its results to the event loop."""
+            stream = (self.track if track else self.predict)(source, stream=True, **kwargs)
+            try:
+                for r in stream:
+                    if not put(r) or stop.is_set():
+                        return
+            except Exception as e:
+                put(e)
+                return
+            finally:
+                stream.close()
+            put(None)  # end of stream
+
+        loop.run_in_executor(executor, produce)
+        try:
+            while (item := await results.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Returns the single-thread executor that runs model calls for apredict, atrack and astream."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ultralytics-predict")
+        return self._executor
+
     def val(
         self,
         validator=None,
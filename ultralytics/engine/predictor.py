@@ -30,7 +30,9 @@ Usage - formats:
                               yolov8n_ncnn_model         # NCNN
 """
 
+import math
 import platform
+import queue
 import re
 import threading
 from pathlib import Path
@@ -46,7 +48,7 @@ from ultralytics.nn.autobackend import AutoBackend
 from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
 from ultralytics.utils.checks import check_imgsz, check_imshow
 from ultralytics.utils.files import increment_path
-from ultralytics.utils.torch_utils import select_device, smart_inference_mode
+from ultralytics.utils.torch_utils import BufferPool, select_device, smart_inference_mode
 
 STREAM_WARNING = """
 WARNING ⚠️ inference results will accumulate in RAM unless `stream=True` is passed, causing potential out-of-memory
@@ -76,6 +78,9 @@ class BasePredictor:
         device (torch.device): Device used for prediction.
         dataset (Dataset): Dataset used for prediction.
         vid_writer (dict): Dictionary of {save_path: video_writer, ...} writer for saving video output.
+        stream_indices (List[int] | None): Stream index of each image of the current batch for multi-stream sources,
+            whose batches may hold a subset of the streams, or None for other sources.
+        input_buffers (BufferPool): Reusable input buffers of fused_preprocess() with allocation counters.
     """
 
     def __init__(self, cfg=DEFAULT_CFG, overrides=None, _callbacks=None):
@@ -111,6 +116,9 @@ class BasePredictor:
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
         self._lock = threading.Lock()  # for automatic thread-safe inference
+        self._state = None  # dataset (count, mode, fps) snapshot of the current batch in pipeline mode
+        self.stream_indices = None
+        self.input_buffers = BufferPool()  # reusable fused_preprocess() inputs, pinned for CUDA in setup_model()
         callbacks.add_integration_callbacks(self)
 
     def preprocess(self, im):
@@ -121,6 +129,8 @@ class BasePredictor:
             im (torch.Tensor | List(np.ndarray)): BCHW for tensor, [(HWC) x B] for list.
         """
         not_tensor = not isinstance(im, torch.Tensor)
+        if not_tensor and self.args.fused_preprocess and type(self).pre_transform is BasePredictor.pre_transform:
+            return self.fused_preprocess(im)  # subclasses with their own pre_transform() keep the unfused path
         if not_tensor:
             im = np.stack(self.pre_transform(im))
             im = im[..., ::-1].transpose((0, 3, 1, 2))  # BGR to RGB, BHWC to BCHW, (n, 3, h, w)
@@ -152,13 +162,86 @@ class BasePredictor:
         Returns:
             (list): A list of transformed images.
         """
+        letterbox = self.get_letterbox(im)
+        return [letterbox(image=x) for x in im]
+
+    def get_letterbox(self, im):
+        """
+        Returns the LetterBox transform for a batch of input images.
+
+        Args:
+            im (List(np.ndarray)): [(h, w, 3) x N] images of the batch.
+
+        Returns:
+            (LetterBox): The letterbox transform to apply to each image.
+        """
         same_shapes = len({x.shape for x in im}) == 1
-        letterbox = LetterBox(
+        return LetterBox(
             self.imgsz,
             auto=same_shapes and (self.model.pt or (getattr(self.model, "dynamic", False) and not self.model.imx)),
             stride=self.model.stride,
         )
-        return [letterbox(image=x) for x in im]
+
+    def fused_preprocess(self, im):
+        """
+        Letterbox, convert BGR to RGB, transpose and normalize a list of images in one pass.
+
+        On GPU devices the raw uint8 frames are uploaded once and resized, padded, channel-swapped and normalized with
+        batched torch ops on the device. On CPU each frame is resized with cv2 and written channel-swapped and
+        transposed straight into a uint8 batch buffer, so the pixels match preprocess(). Host and device buffers come
+        from self.input_buffers (pinned host memory for CUDA) and the returned batch is released back to it once the
+        batch is done, so steady-state streaming allocates no new input buffers. Frames are uploaded through
+        power-of-two sized staging buffers, so sources of many frame shapes share a few of them. preprocess() only calls it for
+        predictors that do not override pre_transform(), whose transforms it would skip.
+
+        Args:
+            im (List(np.ndarray)): [(h, w, 3) x N] BGR images.
+
+        Returns:
+            (torch.Tensor): Preprocessed (N, 3, h, w) batch on self.device, fp16 if the model is fp16 else fp32.
+        """
+        letterbox = self.get_letterbox(im)
+        params = [letterbox.get_params(x.shape[:2])[1:] for x in im]  # (new_unpad, pad) for every image
+        (w, h), (top, bottom, left, right) = params[0]
+        shape = (len(im), 3, top + h + bottom, left + w + right)  # same for all images of a batch
+        dtype = torch.half if self.model.fp16 else torch.float
+        pool, cuda = self.input_buffers, self.device.type == "cuda"
+        out = pool.acquire(shape, dtype, self.device)
+
+        if self.device.type != "cpu":
+            out.fill_(114 / 255)
+            same_shapes = len({x.shape for x in im}) == 1
+            groups = [(range(len(im)), params[0])] if same_shapes else [([i], p) for i, p in enumerate(params)]
+            for i, ((w, h), (top, _, left, _)) in groups:
+                frames = (len(i), *im[i[0]].shape)
+                n = math.prod(frames)
+                size = 1 << (n - 1).bit_length()  # stage in power-of-two buffers, not one per frame shape
+                host, staged = pool.acquire((size,), device="cpu"), pool.acquire((size,), device=self.device)
+                for j, k in enumerate(i):
+                    np.copyto(host[:n].view(frames)[j].numpy(), im[k])
+                staged[:n].copy_(host[:n], non_blocking=cuda)
+                event = torch.cuda.Event() if cuda else None
+                if event is not None:
+                    event.record()
+                pool.release(host, event)  # reusable once the upload is done
+                pool.release(staged)  # later work on this stream is ordered after the ops below
+                x = staged[:n].view(frames).permute(0, 3, 1, 2).to(dtype)  # BHWC to BCHW
+                if x.shape[2:] != (h, w):
+                    x = torch.nn.functional.interpolate(x, size=(h, w), mode="bilinear", align_corners=False)
+                out[i[0] : i[-1] + 1, :, top : top + h, left : left + w] = x.flip(1).div_(255)  # BGR to RGB
+            return out
+
+        host = pool.acquire(shape, device="cpu")
+        for b, x, ((w, h), (top, bottom, left, right)) in zip(host.numpy(), im, params):
+            if x.shape[:2] != (h, w):
+                x = cv2.resize(x, (w, h), interpolation=cv2.INTER_LINEAR)
+            b[:, :top], b[:, b.shape[1] - bottom :] = 114, 114  # pad, geometry can change between batches
+            b[:, :, :left], b[:, :, b.shape[2] - right :] = 114, 114
+            b[:, top : top + h, left : left + w] = x.transpose(2, 0, 1)[::-1]  # BGR to RGB, HWC to CHW
+        out.copy_(host)  # uint8 to fp16/32
+        pool.release(host)
+        out /= 255  # 0 - 255 to 0.0 - 1.0
+        return out
 
     def postprocess(self, preds, img, orig_imgs):
         """Post-processes predictions for an image and returns them."""
@@ -205,6 +288,9 @@ class BasePredictor:
             batch=self.args.batch,
             vid_stride=self.args.vid_stride,
             buffer=self.args.stream_buffer,
+            stream_policy=self.args.stream_policy,
+            stream_wait=self.args.stream_wait,
+            workers=self.args.decode_workers,
         )
         self.source_type = self.dataset.source_type
         if not getattr(self, "stream", True) and (
@@ -240,26 +326,20 @@ class BasePredictor:
                 self.done_warmup = True
 
             self.seen, self.windows, self.batch = 0, [], None
+            pipeline = self.args.pipeline and not self.args.visualize  # visualize reads self.batch in inference
             profilers = (
+                ops.Profile(device=None if pipeline else self.device),  # no device sync while stages overlap
                 ops.Profile(device=self.device),
-                ops.Profile(device=self.device),
-                ops.Profile(device=self.device),
+                ops.Profile(device=None if pipeline else self.device),
             )
             self.run_callbacks("on_predict_start")
-            for self.batch in self.dataset:
-                self.run_callbacks("on_predict_batch_start")
+            batches = self._pipelined_batches if pipeline else self._serial_batches
+            for self.batch, im, preds, dt in batches(profilers, *args, **kwargs):
                 paths, im0s, s = self.batch
-
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
-
-                # Inference
-                with profilers[1]:
-                    preds = self.inference(im, *args, **kwargs)
-                    if self.args.embed:
-                        yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
-                        continue
+                if self.args.embed:
+                    yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
+                    self.input_buffers.release(im)
+                    continue
 
                 # Postprocess
                 with profilers[2]:
@@ -271,8 +351,8 @@ class BasePredictor:
                 for i in range(n):
                     self.seen += 1
                     self.results[i].speed = {
-                        "preprocess": profilers[0].dt * 1e3 / n,
-                        "inference": profilers[1].dt * 1e3 / n,
+                        "preprocess": dt[0] * 1e3 / n,
+                        "inference": dt[1] * 1e3 / n,
                         "postprocess": profilers[2].dt * 1e3 / n,
                     }
                     if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
@@ -284,6 +364,7 @@ class BasePredictor:
 
                 self.run_callbacks("on_predict_batch_end")
                 yield from self.results
+                self.input_buffers.release(im)  # reuse fused_preprocess() input for later batches
 
         # Release assets
         for v in self.vid_writer.values():
@@ -303,6 +384,118 @@ class BasePredictor:
             LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
         self.run_callbacks("on_predict_end")
 
+    def _serial_batches(self, profilers, *args, **kwargs):
+        """Yield (batch, im, preds, (preprocess_dt, inference_dt)) running each stage in turn on the calling thread."""
+        for self.batch in self.dataset:
+            self.stream_indices = self._get_stream_indices()
+            self.run_callbacks("on_predict_batch_start")
+            with profilers[0]:
+                im = self.preprocess(self.batch[1])
+            with profilers[1]:
+                preds = self.inference(im, *args, **kwargs)
+            yield self.batch, im, preds, (profilers[0].dt, profilers[1].dt)
+
+    def _pipelined_batches(self, profilers, *args, **kwargs):
+        """
+        Yield (batch, im, preds, (preprocess_dt, inference_dt)) with loading, preprocessing and inference overlapped.
+
+        Loading and preprocessing run in one background thread and inference in another, connected by bounded FIFO
+        queues. While batch N runs through the model, batch N+1 is letterboxed and batch N-1 is postprocessed and
+        written by the caller, so results keep their order and each stage keeps its own timing. The dataset frame
+        count, mode and fps are snapshotted with each batch, as the loader runs ahead of the caller.
+
+        Note:
+            'on_predict_batch_start' callbacks run on the calling thread once a batch reaches it, which is after its
+            preprocessing and inference, so that they see the predictor state of that batch.
+        """
+        stop = threading.Event()
+        loaded, inferred = queue.Queue(maxsize=2), queue.Queue(maxsize=2)
+        workers = (
+            threading.Thread(target=self._pipeline_load, args=(loaded, stop, profilers[0]), daemon=True),
+            threading.Thread(
+                target=self._pipeline_infer,
+                args=(loaded, inferred, stop, profilers[1], *args),
+                kwargs=kwargs,
+                daemon=True,
+            ),
+        )
+        for w in workers:
+            w.start()
+        try:
+            while (item := inferred.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                self.batch, (self._state, self.stream_indices), im, preds, dt = item
+                self.run_callbacks("on_predict_batch_start")
+                yield self.batch, im, preds, dt
+        finally:
+            stop.set()  # unblock workers if the caller stops consuming early
+            for w in workers:
+                w.join()
+            self._state = None
+
+    def _get_dataset_state(self):
+        """Returns the (frame count, mode, fps) of the dataset as of the batch it last returned."""
+        return getattr(self.dataset, "count", None), self.dataset.mode, getattr(self.dataset, "fps", None)
+
+    def _get_stream_indices(self):
+        """Returns the stream indices of the batch last returned by the dataset, or None if it has none."""
+        indices = getattr(self.dataset, "indices", None)
+        return list(indices) if indices is not None else None
+
+    @staticmethod
+    def _pipeline_put(q, item, stop):
+        """Put an item on a bounded pipeline queue, giving up once the pipeline is stopped."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    @staticmethod
+    def _pipeline_get(q, stop):
+        """Get an item from a pipeline queue, returning None once the pipeline is stopped."""
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
+
+    @smart_inference_mode()
+    def _pipeline_load(self, loaded, stop, profiler):
+        """Pipeline stage that reads batches from the dataset and preprocesses them."""
+        try:
+            for batch in self.dataset:
+                state = self._get_dataset_state(), self._get_stream_indices()  # before the loader moves on
+                with profiler:
+                    im = self.preprocess(batch[1])
+                if not self._pipeline_put(loaded, (batch, state, im, profiler.dt), stop):
+                    return
+        except BaseException as e:
+            self._pipeline_put(loaded, e, stop)
+            return
+        self._pipeline_put(loaded, None, stop)
+
+    @smart_inference_mode()
+    def _pipeline_infer(self, loaded, inferred, stop, profiler, *args, **kwargs):
+        """Pipeline stage that runs the model on preprocessed batches."""
+        while (item := self._pipeline_get(loaded, stop)) is not None:
+            if isinstance(item, BaseException):
+                break
+            batch, state, im, dt = item
+            try:
+                with profiler:
+                    preds = self.inference(im, *args, **kwargs)
+            except BaseException as e:
+                item = e
+                break
+            if not self._pipeline_put(inferred, (batch, state, im, preds, (dt, profiler.dt)), stop):
+                return
+        self._pipeline_put(inferred, item, stop)
+
     def setup_model(self, model, verbose=True):
         """Initialize YOLO model with given parameters and set it to evaluation mode."""
         self.model = AutoBackend(
@@ -317,22 +510,26 @@ class BasePredictor:
         )
 
         self.device = self.model.device  # update device
+        self.input_buffers.pin_memory = self.device.type == "cuda"
         self.args.half = self.model.fp16  # update half
         self.model.eval()
 
     def write_results(self, i, p, im, s):
         """Write inference results to a file or directory."""
         string = ""  # print string
+        frame, mode, _ = self._state or self._get_dataset_state()  # snapshot of this batch in pipeline mode
         if len(im.shape) == 3:
             im = im[None]  # expand for batch dim
         if self.source_type.stream or self.source_type.from_img or self.source_type.tensor:  # batch_size >= 1
-            string += f"{i}: "
-            frame = self.dataset.count
+            j = self.stream_indices[i] if self.stream_indices else i  # stream index, batches may hold a subset
+            string += f"{j}: "
+            if self.stream_indices and getattr(self.dataset, "sources", []).count(str(p)) > 1:
+                p = p.with_name(f"{p.stem}_{j}{p.suffix}")  # separate outputs of repeated sources
         else:
             match = re.search(r"frame (\d+)/", s[i])
             frame = int(match[1]) if match else None  # 0 if frame undetermined
 
-        self.txt_path = self.save_dir / "labels" / (p.stem + ("" if self.dataset.mode == "image" else f"_{frame}"))
+        self.txt_path = self.save_dir / "labels" / (p.stem + ("" if mode == "image" else f"_{frame}"))
         string += "{:g}x{:g} ".format(*im.shape[2:])
         result = self.results[i]
         result.save_dir = self.save_dir.__str__()  # used in other locations
@@ -363,10 +560,11 @@ class BasePredictor:
     def save_predicted_images(self, save_path="", frame=0):
         """Save video predictions as mp4 at specified path."""
         im = self.plotted_img
+        _, mode, fps = self._state or self._get_dataset_state()  # snapshot of this batch in pipeline mode
 
         # Save videos and streams
-        if self.dataset.mode in {"stream", "video"}:
-            fps = self.dataset.fps if self.dataset.mode == "video" else 30
+        if mode in {"stream", "video"}:
+            fps = fps if mode == "video" else 30
             frames_path = f"{save_path.split('.', 1)[0]}_frames/"
             if save_path not in self.vid_writer:  # new video
                 if self.args.save_frames:
@@ -396,7 +594,7 @@ class BasePredictor:
             cv2.namedWindow(p, cv2.WINDOW_NORMAL | cv2.WINDOW_KEEPRATIO)  # allow window resize (Linux)
             cv2.resizeWindow(p, im.shape[1], im.shape[0])  # (width, height)
         cv2.imshow(p, im)
-        cv2.waitKey(300 if self.dataset.mode == "image" else 1)  # 1 millisecond
+        cv2.waitKey(300 if (self._state or self._get_dataset_state())[1] == "image" else 1)  # 1 millisecond
 
     def run_callbacks(self, event: str):
         """Runs all registered callbacks for a specific event."""
@@ -1,12 +1,13 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 """
-Ultralytics Results, Boxes and Masks classes for handling inference results.
+Ultralytics Results, BatchResults, ResultsWriter, Boxes and Masks classes for handling inference results.
 
 Usage: See https://docs.ultralytics.com/modes/predict/
 """
 
 from copy import deepcopy
-from functools import lru_cache
+from functools import cached_property, lru_cache
+from itertools import islice
 from pathlib import Path
 
 import numpy as np
@@ -260,7 +261,7 @@ class Results(SimpleClass):
         self.orig_img = orig_img
         self.orig_shape = orig_img.shape[:2]
         self.boxes = Boxes(boxes, self.orig_shape) if boxes is not None else None  # native size boxes
-        self.masks = Masks(masks, self.orig_shape) if masks is not None else None  # native size or imgsz masks
+        self.masks = Masks(masks, self.orig_shape) if isinstance(masks, (torch.Tensor, np.ndarray)) else masks
         self.probs = Probs(probs) if probs is not None else None
         self.keypoints = Keypoints(keypoints, self.orig_shape) if keypoints is not None else None
         self.obb = OBB(obb, self.orig_shape) if obb is not None else None
@@ -935,6 +936,484 @@ class Results(SimpleClass):
         return json.dumps(self.summary(normalize=normalize, decimals=decimals), indent=2)
 
 
+class BatchResults(SimpleClass):
+    """
+    A columnar container for the detections of a batch or stream of Results.
+
+    All boxes (or oriented boxes) of all images are held in one contiguous array with an image index column, so
+    coordinate conversions, filtering and export to tables run as single vectorized operations instead of per-image and
+    per-box Python loops. Source images are not kept, so a BatchResults can accumulate millions of frames.
+
+    Attributes:
+        data (numpy.ndarray): Detections of shape (N, 6) [x1, y1, x2, y2, conf, cls] or (N, 7) with track IDs, or
+            (N, 7) [x, y, w, h, r, conf, cls] or (N, 8) with track IDs for oriented boxes.
+        image (numpy.ndarray): Image index of each detection, shape (N,).
+        orig_shapes (numpy.ndarray): Original (height, width) of each image, shape (B, 2).
+        paths (List[str]): Path of each image.
+        names (Dict[int, str]): Dictionary mapping class IDs to class names.
+        is_obb (bool): Whether the detections are oriented bounding boxes.
+        keypoints (numpy.ndarray | None): Keypoints of shape (N, K, 3) [x, y, visible] or (N, K, 2), if available.
+        rle (numpy.ndarray | None): COCO uncompressed RLE dict {"size": [h, w], "counts": [...]} of each detection's
+            mask as an object array of shape (N,), if available.
+
+    Methods:
+        from_results: Build a BatchResults from an iterable of Results.
+        columns: Return the detections as a dictionary of 1D numpy columns.
+        to_df: Convert the detections to a pandas DataFrame.
+        to_arrow: Convert the detections to a pyarrow Table.
+
+    Examples:
+        >>> batch = BatchResults.from_results(model.predict("path/to/video.mp4", stream=True))
+        >>> df = batch.to_df(normalize=True)
+        >>> people = batch[batch.cls == 0]
+    """
+
+    def __init__(self, data, image, orig_shapes, names, paths=None, is_obb=False, keypoints=None, rle=None) -> None:
+        """
+        Initialize a BatchResults from detection rows and their image indices.
+
+        Args:
+            data (numpy.ndarray | torch.Tensor): Detection rows as in Boxes.data or OBB.data.
+            image (numpy.ndarray | torch.Tensor): Image index of each detection row.
+            orig_shapes (numpy.ndarray | List[Tuple[int, int]]): Original (height, width) of each image.
+            names (Dict[int, str]): Dictionary mapping class IDs to class names.
+            paths (List[str] | None): Path of each image.
+            is_obb (bool): Whether the rows are oriented bounding boxes.
+            keypoints (numpy.ndarray | torch.Tensor | None): Keypoints of each detection, shape (N, K, 2 or 3).
+            rle (numpy.ndarray | List[dict] | None): COCO uncompressed RLE dict of each detection's mask.
+        """
+        if isinstance(data, torch.Tensor):
+            data = data.cpu().numpy()
+        if isinstance(image, torch.Tensor):
+            image = image.cpu().numpy()
+        if isinstance(keypoints, torch.Tensor):
+            keypoints = keypoints.cpu().numpy()
+        n = 7 if is_obb else 6
+        assert data.ndim == 2 and data.shape[1] in {n, n + 1}, f"expected {n} or {n + 1} values per row"
+        self._columns = np.ascontiguousarray(data.T)  # column-major storage, each column is contiguous
+        self.data = self._columns.T
+        self.image = np.ascontiguousarray(image, dtype=np.int64)
+        self.orig_shapes = np.asarray(orig_shapes, dtype=np.int64).reshape(-1, 2)
+        self.paths = list(paths) if paths is not None else [""] * len(self.orig_shapes)
+        self.names = names
+        self.is_obb = is_obb
+        self.keypoints = keypoints
+        if isinstance(rle, list):  # object array for row indexing
+            rle, items = np.empty(len(rle), dtype=object), rle
+            rle[:] = items
+        self.rle = rle
+
+    @classmethod
+    def from_results(cls, results):
+        """
+        Build a BatchResults from an iterable of Results, i.e. a list or a streaming predict() generator.
+
+        Only detection rows, keypoints, masks encoded as RLE, image shapes and paths are kept, so streaming results
+        are not held in memory. Images where tracking was not applied get a track ID of -1 when other images carry
+        track IDs. Masks are encoded at the resolution they are stored at, the original image size with
+        `retina_masks=True`.
+
+        Args:
+            results (Iterable[Results]): Detection or OBB results.
+
+        Returns:
+            (BatchResults): The detections of all results.
+        """
+        data, shapes, paths, keypoints, rle, names, is_obb, has_masks = [], [], [], [], [], {}, False, False
+        for r in results:
+            is_obb = r.obb is not None
+            d = r.obb if is_obb else r.boxes
+            if d is None:
+                raise TypeError("BatchResults requires detection or OBB results")
+            data.append(d.data.cpu().numpy() if isinstance(d.data, torch.Tensor) else np.asarray(d.data))
+            shapes.append(r.orig_shape)
+            paths.append(r.path)
+            names = r.names
+            if r.keypoints is not None:
+                k = r.keypoints.data
+                keypoints.append(k.cpu().numpy() if isinstance(k, torch.Tensor) else np.asarray(k))
+            if r.masks is not None:  # None for images without detections
+                has_masks = True
+                size = list(r.masks.data.shape[1:])
+                rle.extend({"size": size, "counts": c} for c in ops.masks2rle(r.masks.data))
+        n = 7 if is_obb else 6
+        width = n + any(x.shape[1] == n + 1 for x in data)  # add a track ID column if any image has one
+        for i, x in enumerate(data):
+            if x.shape[1] != width:
+                data[i] = np.insert(x, n - 2, -1, axis=1) if len(x) else np.zeros((0, width), np.float32)
+        counts = [len(x) for x in data]
+        rows = np.concatenate(data, 0).astype(np.float32, copy=False) if data else np.zeros((0, n), np.float32)
+        image = np.repeat(np.arange(len(counts)), counts)
+        keypoints = np.concatenate(keypoints, 0) if keypoints else None
+        return cls(rows, image, shapes, names, paths, is_obb, keypoints, rle if has_masks else None)
+
+    def __len__(self):
+        """Return the number of detections."""
+        return len(self.image)
+
+    def __getitem__(self, idx):
+        """
+        Return a BatchResults with the selected detections, keeping all images.
+
+        Args:
+            idx (int | slice | numpy.ndarray): Row index, slice, integer index array or boolean mask.
+
+        Returns:
+            (BatchResults): The selected detections.
+        """
+        if isinstance(idx, int):
+            idx = slice(idx, idx + 1 or None)
+        return BatchResults(
+            self.data[idx],
+            self.image[idx],
+            self.orig_shapes,
+            self.names,
+            self.paths,
+            self.is_obb,
+            None if self.keypoints is None else self.keypoints[idx],
+            None if self.rle is None else self.rle[idx],
+        )
+
+    @property
+    def is_track(self):
+        """Return whether the detections carry track IDs."""
+        return self.data.shape[1] == (8 if self.is_obb else 7)
+
+    @property
+    def conf(self):
+        """Return the confidence score of each detection."""
+        return self._columns[-2]
+
+    @property
+    def cls(self):
+        """Return the class ID of each detection."""
+        return self._columns[-1]
+
+    @property
+    def id(self):
+        """Return the track ID of each detection if available, otherwise None."""
+        return self._columns[-3] if self.is_track else None
+
+    @cached_property
+    def counts(self):
+        """Return the number of detections in each image."""
+        return np.bincount(self.image, minlength=len(self.orig_shapes))
+
+    @cached_property
+    def xywhr(self):
+        """Return oriented boxes in [x_center, y_center, width, height, rotation] format."""
+        assert self.is_obb, "xywhr requires oriented bounding boxes"
+        return self.data[:, :5]
+
+    @cached_property
+    def xyxyxyxy(self):
+        """Return oriented box corners of shape (N, 4, 2)."""
+        return ops.xywhr2xyxyxyxy(self.xywhr)
+
+    @cached_property
+    def xyxyxyxyn(self):
+        """Return oriented box corners of shape (N, 4, 2) normalized by image size."""
+        return self.xyxyxyxy / self._gain[:, None, :2]
+
+    @cached_property
+    def xyxy(self):
+        """Return boxes, or the axis-aligned bounds of oriented boxes, in [x1, y1, x2, y2] format."""
+        if self.is_obb:
+            corners = self.xyxyxyxy
+            return np.concatenate([corners.min(1), corners.max(1)], -1)
+        return self.data[:, :4]
+
+    @cached_property
+    def xywh(self):
+        """Return boxes in [x_center, y_center, width, height] format."""
+        return ops.xyxy2xywh(self.xyxy)
+
+    @cached_property
+    def xyxyn(self):
+        """Return boxes in [x1, y1, x2, y2] format normalized by image size."""
+        return self.xyxy / self._gain
+
+    @cached_property
+    def xywhn(self):
+        """Return boxes in [x_center, y_center, width, height] format normalized by image size."""
+        return self.xywh / self._gain
+
+    @cached_property
+    def _path_codes(self):
+        """Return the unique paths and the index into them of each detection's path."""
+        unique = {}
+        codes = np.array([unique.setdefault(p, len(unique)) for p in self.paths], dtype=np.int32)
+        return list(unique), codes[self.image]
+
+    @cached_property
+    def _gain(self):
+        """Return the [w, h, w, h] normalization gain of each detection's image."""
+        return self.orig_shapes[:, [1, 0, 1, 0]].astype(np.float32)[self.image]
+
+    def columns(self, normalize=False):
+        """
+        Return the detections as a dictionary of 1D numpy columns, matching the fields of Results.summary().
+
+        Columns are views of the stored arrays where possible. Class names and paths are represented by the 'class'
+        and 'image' index columns; to_df() and to_arrow() expand them as categorical columns.
+
+        Args:
+            normalize (bool): Whether to normalize coordinates by image size.
+
+        Returns:
+            (Dict[str, numpy.ndarray]): Columns 'image', 'class', 'confidence', box corner coordinates 'x1', 'y1', ...,
+                'track_id' if available, and 'kpt{k}_x', 'kpt{k}_y' and 'kpt{k}_visible' for each keypoint if
+                available.
+        """
+        cols = {"image": self.image, "class": self.cls.astype(np.int64), "confidence": self.conf}
+        if self.is_obb:
+            xy = self.xyxyxyxyn if normalize else self.xyxyxyxy
+            for j in range(4):
+                cols[f"x{j + 1}"], cols[f"y{j + 1}"] = xy[:, j, 0], xy[:, j, 1]
+        else:
+            xy = (self.xyxyn if normalize else self.xyxy).T
+            cols["x1"], cols["y1"], cols["x2"], cols["y2"] = xy
+        if self.is_track:
+            cols["track_id"] = self.id.astype(np.int64)
+        if self.keypoints is not None:
+            xy = self.keypoints[..., :2] / self._gain[:, None, :2] if normalize else self.keypoints[..., :2]
+            for k in range(xy.shape[1]):
+                cols[f"kpt{k}_x"], cols[f"kpt{k}_y"] = xy[:, k, 0], xy[:, k, 1]
+                if self.keypoints.shape[2] == 3:
+                    cols[f"kpt{k}_visible"] = self.keypoints[:, k, 2]
+        return cols
+
+    def to_df(self, normalize=False):
+        """
+        Convert the detections to a pandas DataFrame with one row per detection.
+
+        Args:
+            normalize (bool): Whether to normalize coordinates by image size.
+
+        Returns:
+            (DataFrame): Columns 'image', 'path' and 'name' (categorical), 'class', 'confidence', box corner
+                coordinates, and 'track_id', keypoint columns and 'rle' mask encodings if available.
+        """
+        import pandas as pd  # scope for faster 'import ultralytics'
+
+        cols = self.columns(normalize)
+        cls = cols["class"]
+        categories = [self.names[i] for i in range(len(self.names))]
+        df = {
+            "image": cols.pop("image"),
+            "path": pd.Categorical.from_codes(self._path_codes[1], categories=self._path_codes[0]),
+            "name": pd.Categorical.from_codes(cls, categories=categories),
+        }
+        if self.rle is not None:
+            cols["rle"] = self.rle
+        return pd.DataFrame({**df, **cols}, copy=False)
+
+    def to_arrow(self, normalize=False):
+        """
+        Convert the detections to a pyarrow Table with one row per detection.
+
+        Numeric columns are wrapped without copying where they are contiguous, and 'path' and 'name' are dictionary
+        encoded, which keeps Parquet and Arrow IPC output compact.
+
+        Args:
+            normalize (bool): Whether to normalize coordinates by image size.
+
+        Returns:
+            (pyarrow.Table): Columns 'image', 'path', 'name', 'class', 'confidence', box corner coordinates, and
+                'track_id', keypoint columns and 'rle' struct mask encodings if available.
+        """
+        check_requirements("pyarrow")
+        import pyarrow as pa
+
+        cols = self.columns(normalize)
+        names = pa.array([self.names[i] for i in range(len(self.names))])
+        table = {
+            "image": pa.array(cols.pop("image")),
+            "path": pa.DictionaryArray.from_arrays(pa.array(self._path_codes[1]), pa.array(self._path_codes[0])),
+            "name": pa.DictionaryArray.from_arrays(pa.array(cols["class"].astype(np.int32)), names),
+        }
+        table.update({k: pa.array(np.ascontiguousarray(v)) for k, v in cols.items()})
+        if self.rle is not None:
+            rle_type = pa.struct([("size", pa.list_(pa.int64())), ("counts", pa.list_(pa.int64()))])
+            table["rle"] = pa.array(self.rle.tolist(), type=rle_type)
+        return pa.table(table)
+
+
+class ResultsWriter:
+    """
+    Streams detections of Results to a JSON lines, CSV or Parquet file with vectorized serialization.
+
+    Results are converted to a columnar BatchResults in chunks of images and written one row per detection, with the
+    columns of BatchResults.columns() plus 'path' and 'name', keypoints, and masks as COCO uncompressed RLE. The
+    'image' column counts images across all writes, so a whole `stream=True` run can be appended call by call.
+
+    Attributes:
+        file (Path): Output file path.
+        format (str): Output format, 'jsonl', 'csv' or 'parquet'.
+        normalize (bool): Whether coordinates are normalized by image size.
+        decimals (int): Number of decimal places of coordinates and confidences in JSON lines and CSV output.
+        chunk (int): Number of images converted and written at a time.
+        images (int): Number of images written so far.
+        rows (int): Number of detections written so far.
+
+    Methods:
+        write: Append the detections of Results, an iterable of Results or a BatchResults.
+        close: Flush and close the output file.
+
+    Examples:
+        >>> with ResultsWriter("predictions.parquet") as writer:
+        ...     writer.write(model.predict("path/to/video.mp4", stream=True))
+        >>> with ResultsWriter("tracks.csv", normalize=True, track=True) as writer:
+        ...     for result in model.track("path/to/video.mp4", stream=True):
+        ...         writer.write(result)
+    """
+
+    def __init__(self, file, format=None, normalize=False, decimals=5, chunk=256, track=False):
+        """
+        Initialize the writer, creating the parent directory of the output file.
+
+        Args:
+            file (str | Path): Output file path.
+            format (str | None): Output format 'jsonl', 'csv' or 'parquet', inferred from the file suffix if None.
+            normalize (bool): Whether to normalize coordinates by image size.
+            decimals (int): Number of decimal places of coordinates and confidences in JSON lines and CSV output.
+            chunk (int): Number of images converted and written at a time when writing an iterable of Results.
+            track (bool): Whether to always write a 'track_id' column (-1 for untracked detections). CSV and Parquet
+                columns are fixed by the first written detections, so set this when writing tracking results.
+        """
+        self.file = Path(file)
+        fmt = (format or self.file.suffix[1:]).lower()
+        self.format = {"json": "jsonl", "ndjson": "jsonl"}.get(fmt, fmt)
+        if self.format not in {"jsonl", "csv", "parquet"}:
+            raise ValueError(f"Unsupported results format '{fmt}', expected 'jsonl', 'csv' or 'parquet'")
+        if self.format == "parquet":
+            check_requirements("pyarrow")
+        self.normalize = normalize
+        self.decimals = decimals
+        self.chunk = chunk
+        self.track = track
+        self.images = 0
+        self.rows = 0
+        self._writer = None  # text file handle, or pyarrow ParquetWriter
+        self._columns = None  # column names of the first written batch
+        self._empty = None  # last batch without detections, written by close() if no detections were written
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, results):
+        """
+        Append detections to the output file.
+
+        Args:
+            results (Results | Iterable[Results] | BatchResults): Detection, OBB, segmentation or pose results.
+                Iterables, i.e. streaming predict() generators, are consumed `chunk` images at a time.
+        """
+        if isinstance(results, BatchResults):
+            return self._write(results)
+        results = iter([results] if isinstance(results, Results) else results)
+        while True:
+            batch = BatchResults.from_results(islice(results, self.chunk))
+            self._write(batch)
+            if len(batch.orig_shapes) < self.chunk:
+                break
+
+    def close(self):
+        """Flush and close the output file, creating it with no rows if no detections were written."""
+        if self._writer is None and self._empty is not None:
+            getattr(self, f"_write_{self.format}")(self._empty)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the writer on context exit."""
+        self.close()
+
+    def _write(self, batch):
+        """Write one BatchResults, offsetting its image indices by the images already written."""
+        if len(batch):
+            getattr(self, f"_write_{self.format}")(batch)
+        elif self._writer is None:
+            self._empty = batch  # defer, the first batch with detections defines the columns
+        self.images += len(batch.orig_shapes)
+        self.rows += len(batch)
+
+    def _align(self, names, n):
+        """Fix table columns to those of the first batch, returning fill values for columns missing from a later one."""
+        if self._columns is None:
+            self._columns = list(names)
+            if self.track and "track_id" not in names:  # after box coordinates, before keypoints and masks
+                i = next((i for i, k in enumerate(names) if k.startswith("kpt") or k == "rle"), len(names))
+                self._columns.insert(i, "track_id")
+        if extra := set(names) - set(self._columns):
+            raise ValueError(
+                f"Results columns {sorted(extra)} were not present in the first written results, "
+                f"use ResultsWriter(track=True) when writing tracking results."
+            )
+        return {k: np.full(n, -1, dtype=np.int64) for k in self._columns if k not in names}  # i.e. 'track_id'
+
+    def _write_jsonl(self, batch):
+        """Write one JSON object per detection, formatted from column lists without per-box dicts."""
+        import json
+
+        if self._writer is None:
+            self._writer = open(self.file, "w", encoding="utf-8")
+        cols = {k: v for k, v in batch.columns(self.normalize).items() if not k.startswith("kpt")}  # keypoints below
+        paths, path_idx = batch._path_codes
+        paths = [json.dumps(p) for p in paths]
+        names = [json.dumps(batch.names[i]) for i in range(len(batch.names))]
+        fields = ['"image": %d', '"path": %s', '"name": %s']
+        values = [(cols.pop("image") + self.images).tolist(), [paths[i] for i in path_idx]]
+        values.append([names[i] for i in cols["class"].tolist()])
+        for k, v in cols.items():
+            is_int = v.dtype.kind in "iu"
+            fields.append(f'"{k}": %d' if is_int else f'"{k}": %r')
+            values.append(v.tolist() if is_int else np.round(v.astype(np.float64), self.decimals).tolist())
+        if batch.keypoints is not None:
+            k = batch.keypoints.astype(np.float64)
+            if self.normalize:
+                k[..., :2] /= batch._gain[:, None, :2]
+            fields.append('"keypoints": %s')
+            values.append(np.round(k, self.decimals).tolist())
+        if batch.rle is not None:
+            fields.append('"rle": {"size": %s, "counts": %s}')
+            values.extend(([r["size"] for r in batch.rle], [r["counts"] for r in batch.rle]))
+        template = "{" + ", ".join(fields) + "}\n"
+        self._writer.write("".join(template % row for row in zip(*values)))
+
+    def _write_csv(self, batch):
+        """Write detections as CSV rows, with the header taken from the first written batch."""
+        import json
+
+        df = batch.to_df(self.normalize).round(self.decimals)
+        df["image"] += self.images
+        if batch.rle is not None:
+            df["rle"] = [json.dumps(r) for r in batch.rle]
+        for k, v in self._align(df.columns, len(df)).items():
+            df[k] = v
+        header = self._writer is None
+        if header:
+            self._writer = open(self.file, "w", encoding="utf-8", newline="")
+        df[self._columns].to_csv(self._writer, header=header, index=False)
+
+    def _write_parquet(self, batch):
+        """Append detections to the Parquet file as one row group per batch."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = batch.to_arrow(self.normalize)
+        table = table.set_column(0, "image", pa.array(table["image"].to_numpy() + self.images))
+        for k, v in self._align(table.column_names, len(table)).items():
+            table = table.append_column(k, pa.array(v))
+        table = table.select(self._columns)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.file, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+
 class Boxes(BaseTensor):
     """
     A class for managing and manipulating detection boxes.
@@ -1160,13 +1639,21 @@ class Masks(BaseTensor):
     This class extends BaseTensor and provides functionality for handling segmentation masks,
     including methods for converting between pixel and normalized coordinates.
 
+    Masks created with `Masks.from_protos()` hold mask prototypes and per-detection coefficients instead of mask
+    tensors. Indexing them stays lazy, `data` computes the masks of the selected detections on first access, and
+    `area` and `bbox` are computed from low-resolution prototype masks without materializing full-size masks.
+
     Attributes:
         data (torch.Tensor | numpy.ndarray): The raw tensor or array containing mask data.
         orig_shape (tuple): Original image shape in (height, width) format.
         xy (List[numpy.ndarray]): A list of segments in pixel coordinates.
         xyn (List[numpy.ndarray]): A list of normalized segments.
+        area (torch.Tensor | numpy.ndarray): Mask areas in original image pixels.
+        bbox (torch.Tensor | numpy.ndarray): Mask bounding boxes in original image [x1, y1, x2, y2] pixels.
+        is_lazy (bool): Whether the mask tensors have not been computed yet.
 
     Methods:
+        from_protos(): Creates lazily materialized Masks from prototypes and mask coefficients.
         cpu(): Returns a copy of the Masks object with the mask tensor on CPU memory.
         numpy(): Returns a copy of the Masks object with the mask tensor as a numpy array.
         cuda(): Returns a copy of the Masks object with the mask tensor on GPU memory.
@@ -1197,8 +1684,152 @@ class Masks(BaseTensor):
         """
         if masks.ndim == 2:
             masks = masks[None, :]
+        self._protos = None  # (protos, coefficients, boxes, input shape, native) of lazy masks
         super().__init__(masks, orig_shape)
 
+    @classmethod
+    def from_protos(cls, protos, coeffs, bboxes, shape, orig_shape, native=False):
+        """
+        Create Masks that are computed from prototypes and mask coefficients only when accessed.
+
+        The masks are identical to those of `ops.process_mask(..., upsample=True)` at the model input resolution, or
+        of `ops.process_mask_native()` at the original image resolution if `native` is True.
+
+        Args:
+            protos (torch.Tensor): Mask prototypes of shape (c, mh, mw).
+            coeffs (torch.Tensor): Mask coefficients of each detection, shape (n, c).
+            bboxes (torch.Tensor): Detection boxes in model input [x1, y1, x2, y2] pixels, shape (n, 4).
+            shape (Tuple[int, int]): Model input (height, width).
+            orig_shape (Tuple[int, int]): Original image (height, width).
+            native (bool): Whether to compute masks at the original image resolution (retina_masks).
+
+        Returns:
+            (Masks): Masks whose data is computed on first access.
+
+        Examples:
+            >>> masks = Masks.from_protos(proto[i], pred[:, 6:], pred[:, :4].clone(), img.shape[2:], orig_img.shape)
+            >>> largest = masks[masks.area.argmax()].data  # computes a single full-size mask
+        """
+        masks = cls.__new__(cls)
+        masks._protos = (protos, coeffs, bboxes, tuple(shape), native)
+        masks._data = None
+        masks.orig_shape = tuple(orig_shape[:2])
+        return masks
+
+    @property
+    def data(self):
+        """Returns the mask tensor, computing it from the prototypes on first access for lazy masks."""
+        if self._data is None:
+            protos, coeffs, bboxes, shape, native = self._protos
+            if native:
+                bboxes = ops.scale_boxes(shape, bboxes.clone(), self.orig_shape)
+                self._data = ops.process_mask_native(protos, coeffs, bboxes, self.orig_shape)
+            else:
+                self._data = ops.process_mask(protos, coeffs, bboxes, shape, upsample=True)
+        return self._data
+
+    @data.setter
+    def data(self, masks):
+        """Sets the mask tensor."""
+        self._data = masks
+
+    @property
+    def is_lazy(self):
+        """Returns True if the mask tensors have not been computed yet."""
+        return self._data is None
+
+    @property
+    def shape(self):
+        """Returns the shape of the mask tensor without computing lazy masks."""
+        if self._data is None:
+            protos, coeffs, _, shape, native = self._protos
+            return torch.Size((len(coeffs), *(self.orig_shape if native else shape)))
+        return self._data.shape
+
+    def __len__(self):
+        """Returns the number of masks."""
+        return len(self._protos[1]) if self._data is None else len(self._data)
+
+    def __getitem__(self, idx):
+        """Returns Masks for the selected detections, keeping lazy masks lazy."""
+        if self._data is None:
+            protos, coeffs, bboxes, shape, native = self._protos
+            if isinstance(idx, int):
+                idx = slice(idx, idx + 1 or None)
+            return Masks.from_protos(protos, coeffs[idx], bboxes[idx], shape, self.orig_shape, native)
+        return super().__getitem__(idx)
+
+    def _apply_protos(self, fn, *args, **kwargs):
+        """Applies a tensor method to the prototypes, coefficients and boxes of lazy masks."""
+        protos, coeffs, bboxes, shape, native = self._protos
+        p, c, b = (getattr(x, fn)(*args, **kwargs) for x in (protos, coeffs, bboxes))
+        return Masks.from_protos(p, c, b, shape, self.orig_shape, native)
+
+    def cpu(self):
+        """Returns a copy of the Masks object with its tensors on CPU memory."""
+        return self._apply_protos("cpu") if self._data is None else super().cpu()
+
+    def cuda(self):
+        """Returns a copy of the Masks object with its tensors on GPU memory."""
+        return self._apply_protos("cuda") if self._data is None else super().cuda()
+
+    def to(self, *args, **kwargs):
+        """Returns a copy of the Masks object with its tensors on the specified device and dtype."""
+        return self._apply_protos("to", *args, **kwargs) if self._data is None else super().to(*args, **kwargs)
+
+    def numpy(self):
+        """Returns a copy of the Masks object with the mask tensor as a numpy array, computing lazy masks."""
+        return Masks(self.data.cpu().numpy(), self.orig_shape) if self._data is None else super().numpy()
+
+    def _grid(self):
+        """Returns binary masks to measure, the input shape they cover and their pixel size in input pixels."""
+        if self._data is None:  # low-resolution prototype masks, no upsampling
+            protos, coeffs, bboxes, shape, _ = self._protos
+            masks = ops.process_mask(protos, coeffs, bboxes, shape) if len(coeffs) else protos.new_zeros((0, 1, 1))
+            return masks, shape, (shape[0] / protos.shape[1], shape[1] / protos.shape[2])
+        return self._data, self._data.shape[1:], (1.0, 1.0)
+
+    @cached_property
+    def area(self):
+        """
+        Returns the area of each mask in original image pixels.
+
+        Lazy masks are measured on low-resolution prototype masks, which approximates the area of the full-size masks
+        to within the prototype pixel size along the mask boundary.
+
+        Returns:
+            (torch.Tensor | numpy.ndarray): Mask areas of shape (N,).
+
+        Examples:
+            >>> small = results[0].masks.area < 32**2
+        """
+        masks, shape, (ph, pw) = self._grid()
+        gain = min(shape[0] / self.orig_shape[0], shape[1] / self.orig_shape[1])  # input pixels per original pixel
+        return masks.sum((1, 2)) * (ph * pw / gain**2)
+
+    @cached_property
+    def bbox(self):
+        """
+        Returns the bounding box of each mask in original image [x1, y1, x2, y2] pixels, zeros for empty masks.
+
+        Lazy masks are measured on low-resolution prototype masks, so boxes are accurate to the prototype pixel size.
+
+        Returns:
+            (torch.Tensor | numpy.ndarray): Mask bounding boxes of shape (N, 4).
+
+        Examples:
+            >>> boxes = results[0].masks.bbox
+        """
+        masks, shape, (ph, pw) = self._grid()
+        is_numpy = isinstance(masks, np.ndarray)
+        masks = torch.as_tensor(masks) > 0.5
+        rows, cols = masks.any(2), masks.any(1)  # (n, h), (n, w) occupancy
+        y1, x1 = rows.int().argmax(1), cols.int().argmax(1)
+        y2, x2 = rows.shape[1] - rows.flip(1).int().argmax(1), cols.shape[1] - cols.flip(1).int().argmax(1)
+        boxes = torch.stack([x1 * pw, y1 * ph, x2 * pw, y2 * ph], 1).float()
+        boxes = ops.scale_boxes(shape, boxes, self.orig_shape) * rows.any(1, keepdim=True)
+        return boxes.numpy() if is_numpy else boxes
+
     @property
     @lru_cache(maxsize=1)
     def xyn(self):
@@ -0,0 +1,237 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+Dynamic micro-batching front end for serving YOLO predictions to many concurrent callers.
+
+Requests submitted from any number of threads or asyncio tasks are queued, grouped into batches of up to `max_batch`
+images (waiting at most `max_wait_ms` after the oldest request of a batch), run through a single `Model.predict` call
+and routed back to their callers.
+
+Example:
+    ```python
+    from ultralytics import YOLO
+    from ultralytics.engine.serving import BatchingPredictor
+
+    with BatchingPredictor(YOLO("yolo11n.pt"), max_batch=16, max_wait_ms=5, conf=0.4) as server:
+        result = server.predict("bus.jpg")  # blocking, from any thread
+        result = await server.apredict(image)  # from asyncio code
+        print(server.stats())
+    ```
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+
+from ultralytics.utils import LOGGER
+
+
+class BatchingPredictor:
+    """
+    Collects single-image prediction requests from concurrent callers and runs them as dynamic batches.
+
+    A single worker thread owns the model. It takes the oldest queued request, keeps collecting requests until the
+    batch holds `max_batch` images or `max_wait_ms` have passed since the oldest one was submitted, runs one forward
+    pass for the whole batch and resolves each caller's Future with its own Results object.
+
+    Attributes:
+        model (Model): The model used for prediction.
+        max_batch (int): Maximum number of images per batch.
+        max_wait_ms (float): Maximum time in milliseconds a request waits for more requests to join its batch.
+        overrides (dict): Prediction arguments passed to `Model.predict`, i.e. conf, iou, imgsz.
+
+    Methods:
+        submit: Queue an image and return a Future for its Results.
+        predict: Queue an image and block until its Results are ready.
+        apredict: Queue an image and await its Results from asyncio code.
+        stats: Return request, batch, queue-depth and latency statistics.
+        close: Process queued requests and stop the worker thread.
+
+    Examples:
+        >>> server = BatchingPredictor(YOLO("yolo11n.pt"), max_batch=8)
+        >>> futures = [server.submit(im) for im in images]
+        >>> results = [f.result() for f in futures]
+        >>> server.close()
+    """
+
+    def __init__(self, model, max_batch=8, max_wait_ms=5.0, max_queue=0, history=1000, **kwargs):
+        """
+        Initialize the batching predictor and start its worker thread.
+
+        Args:
+            model (Model | str | Path): A loaded Model, or a path to model weights to load with YOLO().
+            max_batch (int): Maximum number of images per batch.
+            max_wait_ms (float): Maximum time in milliseconds a request waits for more requests to join its batch.
+            max_queue (int): Maximum number of queued requests before submit() blocks, 0 for unlimited.
+            history (int): Number of most recent requests and batches kept for latency and batch-size statistics.
+            **kwargs (Any): Prediction arguments passed to `Model.predict`, i.e. conf=0.4, imgsz=640.
+        """
+        if isinstance(model, (str, Path)):
+            from ultralytics import YOLO  # scope to avoid circular import
+
+            model = YOLO(model)
+        assert max_batch >= 1, f"max_batch={max_batch} must be at least 1"
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.overrides = {**kwargs, "verbose": False, "stream": False}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()  # guards statistics and closed state
+        self._closed = False
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+        self._max_depth = 0
+        self._latency = deque(maxlen=history)  # submit to result, seconds
+        self._wait = deque(maxlen=history)  # submit to batch start, seconds
+        self._batch_sizes = deque(maxlen=history)
+        self._worker = threading.Thread(target=self._run, name="BatchingPredictor", daemon=True)
+        self._worker.start()
+
+    def submit(self, source):
+        """
+        Queue one image for prediction.
+
+        Args:
+            source (str | Path | np.ndarray | PIL.Image.Image): A single image, as a file path or URL, a BGR numpy
+                array or a PIL image.
+
+        Returns:
+            (concurrent.futures.Future): Future resolved with the image's Results, or with the batch's exception.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingPredictor is closed")
+        self._queue.put((source, future, time.perf_counter()))  # blocks if max_queue is reached
+        with self._lock:
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+        return future
+
+    def predict(self, source, timeout=None):
+        """
+        Predict one image, blocking until its batch has run.
+
+        Args:
+            source (str | Path | np.ndarray | PIL.Image.Image): A single image.
+            timeout (float, optional): Maximum time in seconds to wait for the result.
+
+        Returns:
+            (Results): The prediction results for the image.
+        """
+        return self.submit(source).result(timeout)
+
+    async def apredict(self, source):
+        """
+        Predict one image from asyncio code without blocking the event loop.
+
+        Args:
+            source (str | Path | np.ndarray | PIL.Image.Image): A single image.
+
+        Returns:
+            (Results): The prediction results for the image.
+        """
+        return await asyncio.wrap_future(self.submit(source))
+
+    def stats(self):
+        """
+        Return serving statistics.
+
+        Latency and wait percentiles (in milliseconds) and the mean batch size cover the most recent `history`
+        requests and batches; counters cover the whole lifetime.
+
+        Returns:
+            (dict): Requests, batches, errors, current and max queue depth, mean batch size, and latency and queue
+                wait percentiles.
+        """
+
+        def summary(x):
+            """Return mean and p50/p95/p99/max of a sequence of seconds, in milliseconds."""
+            x = np.array(x) * 1e3 if len(x) else np.zeros(1)
+            p50, p95, p99 = np.percentile(x, (50, 95, 99))
+            return {"mean": x.mean(), "p50": p50, "p95": p95, "p99": p99, "max": x.max()}
+
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "batches": self._batches,
+                "errors": self._errors,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_depth,
+                "mean_batch": float(np.mean(self._batch_sizes)) if self._batch_sizes else 0.0,
+                "latency_ms": summary(self._latency),
+                "wait_ms": summary(self._wait),
+            }
+
+    def close(self, timeout=None):
+        """
+        Stop accepting requests, process those already queued and stop the worker thread.
+
+        Args:
+            timeout (float, optional): Maximum time in seconds to wait for the worker thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)  # sentinel after all queued requests
+        self._worker.join(timeout)
+
+    def __enter__(self):
+        """Return the batching predictor for use as a context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the batching predictor on context exit."""
+        self.close()
+
+    def _run(self):
+        """Worker loop forming batches from the request queue until the close() sentinel is reached."""
+        max_wait = self.max_wait_ms / 1e3
+        stop = False
+        while not stop:
+            request = self._queue.get()
+            if request is None:
+                break
+            batch, deadline = [request], request[2] + max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    request = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            self._process(batch)
+
+    def _process(self, batch):
+        """Run one forward pass for a batch of requests and resolve their futures."""
+        batch = [r for r in batch if r[1].set_running_or_notify_cancel()]  # drop requests cancelled by callers
+        if not batch:
+            return
+        t = time.perf_counter()
+        try:
+            results = self.model.predict([r[0] for r in batch], **self.overrides)
+            assert len(results) == len(batch), f"expected {len(batch)} results but got {len(results)}"
+        except Exception as e:
+            LOGGER.warning(f"WARNING ⚠️ BatchingPredictor batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            results = None
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+        done = time.perf_counter()
+        with self._lock:
+            self._requests += len(batch)
+            self._batches += 1
+            self._errors += results is None
+            self._batch_sizes.append(len(batch))
+            self._wait.extend(t - r[2] for r in batch)
+            self._latency.extend(done - r[2] for r in batch)
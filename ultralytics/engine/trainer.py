@@ -348,7 +348,7 @@ class BaseTrainer:
                 self.scheduler.step()
 
             self.model.train()
-            if RANK != -1:
+            if RANK != -1 and hasattr(self.train_loader.sampler, "set_epoch"):  # streaming datasets have no sampler
                 self.train_loader.sampler.set_epoch(epoch)
             pbar = enumerate(self.train_loader)
             # Update dataloader attributes (optional)
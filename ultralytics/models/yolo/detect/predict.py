@@ -1,5 +1,8 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import numpy as np
+import torch
+
 from ultralytics.engine.predictor import BasePredictor
 from ultralytics.engine.results import Results
 from ultralytics.utils import ops
@@ -20,15 +23,26 @@ class DetectionPredictor(BasePredictor):
         ```
     """
 
+    def inference(self, im, *args, **kwargs):
+        """Runs inference, keeping NumPy outputs of non-PyTorch backends on CPU for NMS in NumPy."""
+        if self.args.task == "detect" and self.device.type == "cpu":
+            kwargs["to_tensor"] = False
+        return super().inference(im, *args, **kwargs)
+
     def postprocess(self, preds, img, orig_imgs):
         """Post-processes predictions and returns a list of Results objects."""
-        preds = ops.non_max_suppression(
+        if isinstance(preds, np.ndarray):
+            nms, kwargs = ops.non_max_suppression_numpy, {"topk": self.args.nms_topk}
+        else:
+            nms, kwargs = ops.non_max_suppression, {}
+        preds = nms(
             preds,
             self.args.conf,
             self.args.iou,
             agnostic=self.args.agnostic_nms,
             max_det=self.args.max_det,
             classes=self.args.classes,
+            **kwargs,
         )
 
         if not isinstance(orig_imgs, list):  # input images are a torch.Tensor, not a list
@@ -36,6 +50,7 @@ class DetectionPredictor(BasePredictor):
 
         results = []
         for pred, orig_img, img_path in zip(preds, orig_imgs, self.batch[0]):
+            pred = torch.from_numpy(pred) if isinstance(pred, np.ndarray) else pred
             pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], orig_img.shape)
             results.append(Results(orig_img, path=img_path, names=self.model.names, boxes=pred))
         return results
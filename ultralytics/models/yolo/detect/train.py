@@ -8,6 +8,7 @@ import numpy as np
 import torch.nn as nn
 
 from ultralytics.data import build_dataloader, build_yolo_dataset
+from ultralytics.data.augment import DeviceAugment
 from ultralytics.engine.trainer import BaseTrainer
 from ultralytics.models import yolo
 from ultralytics.nn.tasks import DetectionModel
@@ -45,6 +46,9 @@ class DetectionTrainer(BaseTrainer):
     def get_dataloader(self, dataset_path, batch_size=16, rank=0, mode="train"):
         """Construct and return dataloader."""
         assert mode in {"train", "val"}, f"Mode must be 'train' or 'val', not {mode}."
+        if mode == "train" and self.args.device_augment and self.args.task == "obb":
+            LOGGER.warning("WARNING ⚠️ 'device_augment=True' does not support OBB, augmenting in dataloader workers")
+            self.args.device_augment = False
         with torch_distributed_zero_first(rank):  # init dataset *.cache only once if DDP
             dataset = self.build_dataset(dataset_path, mode, batch_size)
         shuffle = mode == "train"
@@ -52,11 +56,18 @@ class DetectionTrainer(BaseTrainer):
             LOGGER.warning("WARNING ⚠️ 'rect=True' is incompatible with DataLoader shuffle, setting shuffle=False")
             shuffle = False
         workers = self.args.workers if mode == "train" else self.args.workers * 2
+        if mode == "train":  # after build_dataset(), which may disable flips, mosaic and mixup
+            self.device_transforms = (
+                DeviceAugment(self.args.imgsz, self.args, self.data.get("flip_idx"))
+                if self.args.device_augment
+                else None
+            )
         return build_dataloader(dataset, batch_size, workers, shuffle, rank)  # return dataloader
 
     def preprocess_batch(self, batch):
         """Preprocesses a batch of images by scaling and converting to float."""
         batch["img"] = batch["img"].to(self.device, non_blocking=True).float() / 255
+        ns = None
         if self.args.multi_scale:
             imgs = batch["img"]
             sz = (
@@ -69,10 +80,18 @@ class DetectionTrainer(BaseTrainer):
                 ns = [
                     math.ceil(x * sf / self.stride) * self.stride for x in imgs.shape[2:]
                 ]  # new shape (stretched to gs-multiple)
-                imgs = nn.functional.interpolate(imgs, size=ns, mode="bilinear", align_corners=False)
-            batch["img"] = imgs
+        if getattr(self, "device_transforms", None):  # batched augmentation of crops, warped straight to new shape
+            batch = self.device_transforms(batch, ns)
+        elif ns:
+            batch["img"] = nn.functional.interpolate(batch["img"], size=ns, mode="bilinear", align_corners=False)
         return batch
 
+    def _close_dataloader_mosaic(self):
+        """Update dataloaders to stop using mosaic augmentation, and stop MixUp of device augmentation."""
+        super()._close_dataloader_mosaic()
+        if getattr(self, "device_transforms", None):
+            self.device_transforms.mixup = 0.0
+
     def set_model_attributes(self):
         """Nl = de_parallel(self.model).model[-1].nl  # number of detection layers (to scale hyps)."""
         # self.args.box *= 3 / nl  # scale to layers
@@ -138,6 +157,8 @@ class DetectionTrainer(BaseTrainer):
 
     def plot_training_labels(self):
         """Create a labeled training plot of the YOLO model."""
+        if not hasattr(self.train_loader.dataset, "labels"):  # streaming datasets hold no label index
+            return
         boxes = np.concatenate([lb["bboxes"] for lb in self.train_loader.dataset.labels], 0)
         cls = np.concatenate([lb["cls"] for lb in self.train_loader.dataset.labels], 0)
         plot_labels(boxes, cls.squeeze(), names=self.data["names"], save_dir=self.save_dir, on_plot=self.on_plot)
@@ -146,5 +167,5 @@ class DetectionTrainer(BaseTrainer):
         """Get batch size by calculating memory occupation of model."""
         train_dataset = self.build_dataset(self.trainset, mode="train", batch=16)
         # 4 for mosaic augmentation
-        max_num_obj = max(len(label["cls"]) for label in train_dataset.labels) * 4
+        max_num_obj = max((len(label["cls"]) for label in getattr(train_dataset, "labels", [])), default=0) * 4
         return super().auto_batch(max_num_obj)
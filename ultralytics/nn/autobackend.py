@@ -500,7 +500,7 @@ class AutoBackend(nn.Module):
 
         self.__dict__.update(locals())  # assign all variables to self
 
-    def forward(self, im, augment=False, visualize=False, embed=None):
+    def forward(self, im, augment=False, visualize=False, embed=None, to_tensor=True):
         """
         Runs inference on the YOLOv8 MultiBackend model.
 
@@ -509,6 +509,7 @@ class AutoBackend(nn.Module):
             augment (bool): whether to perform data augmentation during inference, defaults to False
             visualize (bool): whether to visualize the output predictions, defaults to False
             embed (list, optional): A list of feature vectors/embeddings to return.
+            to_tensor (bool): whether to convert NumPy outputs of non-PyTorch backends to tensors, defaults to True
 
         Returns:
             (tuple): Tuple containing the raw output tensor, and processed output for visualization (if visualize=True)
@@ -699,9 +700,11 @@ class AutoBackend(nn.Module):
             if len(self.names) == 999 and (self.task == "segment" or len(y) == 2):  # segments and names not defined
                 nc = y[0].shape[1] - y[1].shape[1] - 4  # y = (1, 32, 160, 160), (1, 116, 8400)
                 self.names = {i: f"class{i}" for i in range(nc)}
+            if not to_tensor:
+                return y[0] if len(y) == 1 else list(y)
             return self.from_numpy(y[0]) if len(y) == 1 else [self.from_numpy(x) for x in y]
         else:
-            return self.from_numpy(y)
+            return self.from_numpy(y) if to_tensor else y
 
     def from_numpy(self, x):
         """
@@ -3,9 +3,13 @@
 Benchmark a YOLO model formats for speed and accuracy.
 
 Usage:
-    from ultralytics.utils.benchmarks import ProfileModels, benchmark
+    from ultralytics.utils.benchmarks import ProfileModels, benchmark, benchmark_dataloader, benchmark_nms
+    from ultralytics.utils.benchmarks import benchmark_masks
     ProfileModels(['yolov8n.yaml', 'yolov8s.yaml']).profile()
     benchmark(model='yolov8n.pt', imgsz=160)
+    benchmark_nms(batch_sizes=(1, 8, 32))
+    benchmark_dataloader(data='coco8.yaml', workers=(0, 4, 8))
+    benchmark_masks(instances=(10, 100, 300))
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -28,9 +32,12 @@ NCNN                    | `ncnn`                    | yolov8n_ncnn_model/
 import glob
 import os
 import platform
+import random
 import re
 import shutil
 import time
+from contextlib import contextmanager
+from copy import deepcopy
 from pathlib import Path
 
 import numpy as np
@@ -44,6 +51,7 @@ from ultralytics.utils import ARM64, ASSETS, IS_JETSON, IS_RASPBERRYPI, LINUX, L
 from ultralytics.utils.checks import IS_PYTHON_3_12, check_requirements, check_yolo
 from ultralytics.utils.downloads import safe_download
 from ultralytics.utils.files import file_size
+from ultralytics.utils.ops import non_max_suppression
 from ultralytics.utils.torch_utils import get_cpu_info, select_device
 
 
@@ -177,6 +185,240 @@ def benchmark(
     return df
 
 
+def benchmark_nms(batch_sizes=(1, 2, 4, 8, 16, 32, 64), nc=80, anchors=8400, device="cpu", runs=10, seed=0):
+    """
+    Benchmark batched non_max_suppression() against the per-image loop on synthetic YOLO detection outputs.
+
+    Args:
+        batch_sizes (tuple): Batch sizes to benchmark.
+        nc (int): Number of classes in the synthetic predictions.
+        anchors (int): Number of anchors per image, i.e. 8400 for imgsz=640.
+        device (str): Device to run the benchmark on, either 'cpu' or 'cuda'.
+        runs (int): Number of timed runs per batch size, after one warmup run.
+        seed (int): Random seed for the synthetic predictions.
+
+    Returns:
+        (pandas.DataFrame): NMS time per batch for both implementations, the speedup, and whether outputs match.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_nms
+        >>> benchmark_nms(batch_sizes=(1, 32), device="cuda")
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    device = select_device(device, verbose=False)
+    generator = torch.Generator().manual_seed(seed)
+    y = []
+    for bs in batch_sizes:
+        pred = torch.rand(bs, 4 + nc, anchors, generator=generator)
+        pred[:, :2] *= 640  # xy centers
+        pred[:, 2:4] *= 160  # wh
+        keep = torch.rand(bs, nc, anchors, generator=generator) < 2e-4  # ~130 confident scores per image at nc=80
+        pred[:, 4:] *= keep * 0.8 + 0.2  # scale all other scores below the default conf threshold
+        pred = pred.to(device)
+        t, out = [], []
+        for batched in (False, True):
+            out.append(non_max_suppression(pred.clone(), batched=batched))  # warmup
+            dt = []
+            for _ in range(runs):
+                x = pred.clone()
+                if device.type == "cuda":
+                    torch.cuda.synchronize(device)
+                t0 = time.perf_counter()
+                non_max_suppression(x, batched=batched)
+                if device.type == "cuda":
+                    torch.cuda.synchronize(device)
+                dt.append(time.perf_counter() - t0)
+            t.append(np.median(dt) * 1e3)
+        match = all(torch.equal(a, b) for a, b in zip(*out))
+        y.append([bs, round(t[0], 2), round(t[1], 2), round(t[0] / t[1], 2), "✅" if match else "❌"])
+
+    df = pd.DataFrame(y, columns=["Batch", "Loop (ms)", "Batched (ms)", "Speedup", "Match"])
+    LOGGER.info(f"\nNMS benchmark complete on {device} with nc={nc}, anchors={anchors}\n{df}\n")
+    return df
+
+
+def benchmark_dataloader(
+    data="coco8.yaml", imgsz=640, batch=16, workers=(0, 2, 4, 8), batches=50, task="detect", reference=True, **kwargs
+):
+    """
+    Benchmark the throughput of the augmenting YOLO training dataloader for several worker counts.
+
+    With `reference=True` every worker count is also timed on the previous per-sample pipeline: labels are plain dicts
+    deep-copied for every sample, RandomFlip flips with numpy and Format copies the image with a strided transpose.
+
+    Args:
+        data (str): Dataset YAML file whose 'train' split is loaded.
+        imgsz (int): Training image size.
+        batch (int): Batch size.
+        workers (tuple): Dataloader worker counts to benchmark, 0 loads batches in the main process. Counts are capped
+            at the CPU count like in training.
+        batches (int): Number of timed batches per worker count, after one warmup batch that also starts the workers.
+        task (str): Task whose labels and augmentations are used, i.e. 'detect', 'segment', 'pose' or 'obb'.
+        reference (bool): Also benchmark the previous per-sample pipeline and report the speedup.
+        **kwargs (Any): Other training arguments, i.e. augmentation hyperparameters or `cache`.
+
+    Returns:
+        (pandas.DataFrame): Samples per second in total and per worker, and milliseconds per batch, per worker count,
+            with the reference samples per second per worker and the speedup if `reference=True`.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_dataloader
+        >>> benchmark_dataloader("coco128.yaml", workers=(0, 4, 8), batches=100)
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data import build_dataloader, build_yolo_dataset
+    from ultralytics.data.augment import Format, RandomFlip
+    from ultralytics.data.utils import check_det_dataset
+
+    def reference_flip(self, labels):
+        """RandomFlip with numpy flips, made contiguous by a full copy."""
+        img, instances = labels["img"], labels.pop("instances")
+        instances.convert_bbox(format="xywh")
+        h, w = (1, 1) if instances.normalized else img.shape[:2]
+        if self.direction == "vertical" and random.random() < self.p:
+            img = np.flipud(img)
+            instances.flipud(h)
+        if self.direction == "horizontal" and random.random() < self.p:
+            img = np.fliplr(img)
+            instances.fliplr(w)
+            if self.flip_idx is not None and instances.keypoints is not None:
+                instances.keypoints = np.ascontiguousarray(instances.keypoints[:, self.flip_idx, :])
+        labels["img"], labels["instances"] = np.ascontiguousarray(img), instances
+        return labels
+
+    def reference_format_img(self, img):
+        """Format image conversion with a strided HWC to CHW transpose and channel reversal."""
+        img = img.transpose(2, 0, 1) if img.ndim == 3 else img[None]
+        return torch.from_numpy(np.ascontiguousarray(img[::-1] if random.uniform(0, 1) > self.bgr else img))
+
+    @contextmanager
+    def previous_pipeline():
+        """Swap in the previous per-sample pipeline, inherited by workers started inside the context."""
+        labels, flip, format_img = dataset.labels, RandomFlip.__call__, Format._format_img
+        dataset.labels = [deepcopy(x) for x in labels]  # label lists are deep-copied by get_image_and_label()
+        RandomFlip.__call__, Format._format_img = reference_flip, reference_format_img
+        try:
+            yield
+        finally:
+            dataset.labels, RandomFlip.__call__, Format._format_img = labels, flip, format_img
+
+    def samples_per_second(nw):
+        """Samples per second, worker count and seconds of `batches` batches loaded with `nw` workers."""
+        loader = build_dataloader(dataset, batch, nw, shuffle=True)
+        next(loader.iterator)  # warmup, start workers
+        n, t0 = 0, time.perf_counter()
+        for _ in range(batches):
+            n += len(next(loader.iterator)["img"])
+        dt = time.perf_counter() - t0
+        nw = loader.num_workers
+        del loader  # terminate workers
+        return n / dt, nw, dt
+
+    cfg = get_cfg(overrides={"imgsz": imgsz, "batch": batch, "task": task, **kwargs})
+    data_dict = check_det_dataset(data)
+    dataset = build_yolo_dataset(cfg, data_dict["train"], batch, data_dict, mode="train")
+    y = []
+    for nw in workers:
+        sps, nw, dt = samples_per_second(nw)
+        y.append([nw, round(sps, 1), round(sps / max(nw, 1), 1), round(dt / batches * 1e3, 1)])
+        if reference:
+            with previous_pipeline():
+                ref = samples_per_second(nw)[0]
+            y[-1] += [round(ref / max(nw, 1), 1), round(sps / ref, 2)]
+
+    columns = ["Workers", "Samples/s", "Samples/s/worker", "ms/batch"]
+    df = pd.DataFrame(y, columns=columns + ["Ref samples/s/worker", "Speedup"] * reference)
+    LOGGER.info(f"\nDataloader benchmark complete for {data} with imgsz={imgsz}, batch={batch}\n{df}\n")
+    return df
+
+
+def benchmark_masks(instances=(1, 10, 50, 100, 300), imgsz=640, mask_ratio=4, points=1000, runs=10, seed=0):
+    """
+    Benchmark segmentation mask rasterization against per-polygon full-resolution filling on synthetic crowds.
+
+    Every image holds `instances` random star-shaped polygons of 5-20% of the image size with `points` vertices each,
+    like segments resampled by YOLODataset. The reference fills each polygon at full resolution with polygon2mask(),
+    resizes it, and composites overlap masks in order of mask area, the previous implementation.
+
+    Args:
+        instances (tuple): Numbers of instances per image to benchmark.
+        imgsz (int): Image size.
+        mask_ratio (int): Mask downsample ratio.
+        points (int): Number of vertices per polygon.
+        runs (int): Number of timed runs per instance count, after one warmup run.
+        seed (int): Random seed for the synthetic polygons.
+
+    Returns:
+        (pandas.DataFrame): Time per image of both implementations for overlap and per-instance masks, the speedups,
+            and the fraction of mask pixels on which both implementations agree. Overlap agreement drops in dense crowds
+            where instances of similar size are ordered by polygon area instead of by their rounded mask area.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_masks
+        >>> benchmark_masks(instances=(10, 100, 300), mask_ratio=4)
+    """
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.data.utils import polygon2mask, polygons2masks, polygons2masks_overlap
+
+    def reference_overlap(segments):
+        """Overlap mask from full resolution masks, sorted and composited by mask area."""
+        ms = np.array([polygon2mask((imgsz, imgsz), [x.reshape(-1)], 1, mask_ratio) for x in segments])
+        index = np.argsort(-ms.sum((1, 2)))
+        masks = np.zeros(ms.shape[1:], dtype=np.int32 if len(segments) > 255 else np.uint8)
+        for i, m in enumerate(ms[index]):
+            masks = np.clip(masks + m.astype(masks.dtype) * (i + 1), 0, i + 1)
+        return masks, index
+
+    def reference(segments):
+        """Per-instance masks from full resolution masks."""
+        return np.array([polygon2mask((imgsz, imgsz), [x.reshape(-1)], 1, mask_ratio) for x in segments])
+
+    def timed(f, segments):
+        """Median milliseconds of `f(segments)` and its last output."""
+        out, dt = f(segments), []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            out = f(segments)
+            dt.append(time.perf_counter() - t0)
+        return np.median(dt) * 1e3, out
+
+    rng = np.random.default_rng(seed)
+    theta = np.linspace(0, 2 * np.pi, points, endpoint=False)
+    y = []
+    for n in instances:
+        radius = rng.uniform(0.05, 0.2, (n, 1)) * imgsz * rng.uniform(0.6, 1.0, (n, points // 50 + 1)).repeat(50, 1)
+        xy = np.stack((np.cos(theta), np.sin(theta)), -1) * radius[:, :points, None]
+        segments = (xy + rng.uniform(0.1, 0.9, (n, 1, 2)) * imgsz).astype(np.float32)
+        t0, (m0, i0) = timed(reference_overlap, segments)
+        t1, (m1, i1) = timed(lambda x: polygons2masks_overlap((imgsz, imgsz), x, mask_ratio), segments)
+        t2, m2 = timed(reference, segments)
+        t3, m3 = timed(lambda x: polygons2masks((imgsz, imgsz), x, 1, mask_ratio), segments)
+        ids0 = np.append(i0, -1)[m0.astype(np.int64) - 1]  # instance index per pixel, -1 for background
+        ids1 = np.append(i1, -1)[m1.astype(np.int64) - 1]
+        agree = (ids0 == ids1).mean()
+        y.append(
+            [n, round(t0, 2), round(t1, 2), round(t0 / t1, 1), round(t2, 2), round(t3, 2), round(t2 / t3, 1)]
+            + [round(agree, 4), round((m2 == m3).mean(), 4)]
+        )
+
+    columns = [
+        "Instances",
+        "Overlap ref (ms)",
+        "Overlap (ms)",
+        "Overlap speedup",
+        "Masks ref (ms)",
+        "Masks (ms)",
+        "Masks speedup",
+    ]
+    df = pd.DataFrame(y, columns=columns + ["Overlap agree", "Masks agree"])
+    LOGGER.info(f"\nMask rasterization benchmark complete with imgsz={imgsz}, mask_ratio={mask_ratio}\n{df}\n")
+    return df
+
+
 class RF100Benchmark:
     """Benchmark YOLO model performance across various formats for speed and accuracy."""
 
@@ -23,6 +23,12 @@ def _ntuple(n):
 to_2tuple = _ntuple(2)
 to_4tuple = _ntuple(4)
 
+
+def _writeable(x):
+    """Return array x, or a copy of it if it is read-only, i.e. a LabelStore view, so it can be modified in place."""
+    return x if not isinstance(x, np.ndarray) or x.flags.writeable else x.copy()
+
+
 # `xyxy` means left top and right bottom
 # `xywh` means center x, center y and width, height(YOLO format)
 # `ltwh` means left top and width, height(COCO format)
@@ -106,6 +112,7 @@ class Bboxes:
             scale = to_4tuple(scale)
         assert isinstance(scale, (tuple, list))
         assert len(scale) == 4
+        self.bboxes = _writeable(self.bboxes)
         self.bboxes[:, 0] *= scale[0]
         self.bboxes[:, 1] *= scale[1]
         self.bboxes[:, 2] *= scale[2]
@@ -123,6 +130,7 @@ class Bboxes:
             offset = to_4tuple(offset)
         assert isinstance(offset, (tuple, list))
         assert len(offset) == 4
+        self.bboxes = _writeable(self.bboxes)
         self.bboxes[:, 0] += offset[0]
         self.bboxes[:, 1] += offset[1]
         self.bboxes[:, 2] += offset[2]
@@ -212,6 +220,8 @@ class Instances:
     Note:
         The bounding box format is either 'xywh' or 'xyxy', and is determined by the `bbox_format` argument.
         This class does not perform input validation, and it assumes the inputs are well-formed.
+        Bboxes, segments and keypoints may be read-only views, e.g. of a LabelStore; they are copied on write, by the
+        first method that modifies them in place.
     """
 
     def __init__(self, bboxes, segments=None, keypoints=None, bbox_format="xywh", normalized=True) -> None:
@@ -234,6 +244,12 @@ class Instances:
         """Convert bounding box format."""
         self._bboxes.convert(format=format)
 
+    def _writeable(self):
+        """Copy bboxes, segments and keypoints that are read-only views before they are modified in place."""
+        self._bboxes.bboxes = _writeable(self._bboxes.bboxes)
+        self.segments = _writeable(self.segments)
+        self.keypoints = _writeable(self.keypoints)
+
     @property
     def bbox_areas(self):
         """Calculate the area of bounding boxes."""
@@ -244,6 +260,7 @@ class Instances:
         self._bboxes.mul(scale=(scale_w, scale_h, scale_w, scale_h))
         if bbox_only:
             return
+        self._writeable()
         self.segments[..., 0] *= scale_w
         self.segments[..., 1] *= scale_h
         if self.keypoints is not None:
@@ -254,6 +271,7 @@ class Instances:
         """Denormalizes boxes, segments, and keypoints from normalized coordinates."""
         if not self.normalized:
             return
+        self._writeable()
         self._bboxes.mul(scale=(w, h, w, h))
         self.segments[..., 0] *= w
         self.segments[..., 1] *= h
@@ -266,6 +284,7 @@ class Instances:
         """Normalize bounding boxes, segments, and keypoints to image dimensions."""
         if self.normalized:
             return
+        self._writeable()
         self._bboxes.mul(scale=(1 / w, 1 / h, 1 / w, 1 / h))
         self.segments[..., 0] /= w
         self.segments[..., 1] /= h
@@ -277,6 +296,7 @@ class Instances:
     def add_padding(self, padw, padh):
         """Handle rect and mosaic situation."""
         assert not self.normalized, "you should add padding with absolute coordinates."
+        self._writeable()
         self._bboxes.add(offset=(padw, padh, padw, padh))
         self.segments[..., 0] += padw
         self.segments[..., 1] += padh
@@ -314,6 +334,7 @@ class Instances:
 
     def flipud(self, h):
         """Flips the coordinates of bounding boxes, segments, and keypoints vertically."""
+        self._writeable()
         if self._bboxes.format == "xyxy":
             y1 = self.bboxes[:, 1].copy()
             y2 = self.bboxes[:, 3].copy()
@@ -327,6 +348,7 @@ class Instances:
 
     def fliplr(self, w):
         """Reverses the order of the bounding boxes and segments horizontally."""
+        self._writeable()
         if self._bboxes.format == "xyxy":
             x1 = self.bboxes[:, 0].copy()
             x2 = self.bboxes[:, 2].copy()
@@ -340,6 +362,7 @@ class Instances:
 
     def clip(self, w, h):
         """Clips bounding boxes, segments, and keypoints values to stay within image boundaries."""
+        self._writeable()
         ori_format = self._bboxes.format
         self.convert_bbox(format="xyxy")
         self.bboxes[:, [0, 2]] = self.bboxes[:, [0, 2]].clip(0, w)
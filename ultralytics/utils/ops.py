@@ -11,7 +11,9 @@ import torch
 import torch.nn.functional as F
 
 from ultralytics.utils import LOGGER
-from ultralytics.utils.metrics import batch_probiou
+from ultralytics.utils.metrics import batch_probiou, probiou
+
+NMS_ROTATED_DENSE_MAX = 256  # nms_rotated() computes the full probiou matrix up to this many boxes
 
 
 class Profile(contextlib.ContextDecorator):
@@ -143,25 +145,91 @@ def make_divisible(x, divisor):
     return math.ceil(x / divisor) * divisor
 
 
-def nms_rotated(boxes, scores, threshold=0.45):
+def nms_rotated(boxes, scores, threshold=0.45, strategy="auto", return_strategy=False):
     """
     NMS for oriented bounding boxes using probiou and fast-nms.
 
+    The 'dense' strategy computes the full N x N probiou matrix. The 'grid' strategy bins box centers into a uniform
+    grid and only computes probiou for pairs whose bounding circles overlap, so time and memory grow with the number of
+    nearby pairs instead of N^2. Circle radii are scaled so that any pair outside them has a probiou below the
+    threshold, so both strategies keep the same boxes. 'auto' uses the dense path for small N or when the grid prunes
+    too few pairs.
+
     Args:
         boxes (torch.Tensor): Rotated bounding boxes, shape (N, 5), format xywhr.
         scores (torch.Tensor): Confidence scores, shape (N,).
         threshold (float, optional): IoU threshold. Defaults to 0.45.
+        strategy (str, optional): One of 'auto', 'dense' or 'grid'. Defaults to 'auto'.
+        return_strategy (bool, optional): Also return the strategy that was used. Defaults to False.
 
     Returns:
-        (torch.Tensor): Indices of boxes to keep after NMS.
+        (torch.Tensor | Tuple[torch.Tensor, str]): Indices of boxes to keep after NMS, and the strategy used if
+            return_strategy=True.
     """
-    if len(boxes) == 0:
-        return np.empty((0,), dtype=np.int8)
+    assert strategy in {"auto", "dense", "grid"}, f"Invalid strategy '{strategy}', valid values are auto, dense, grid"
+    n = len(boxes)
+    if n == 0:
+        keep = np.empty((0,), dtype=np.int8)
+        return (keep, "dense") if return_strategy else keep
     sorted_idx = torch.argsort(scores, descending=True)
     boxes = boxes[sorted_idx]
-    ious = batch_probiou(boxes, boxes).triu_(diagonal=1)
-    pick = torch.nonzero(ious.max(dim=0)[0] < threshold).squeeze_(-1)
-    return sorted_idx[pick]
+    if strategy == "auto":
+        strategy = "grid" if n > NMS_ROTATED_DENSE_MAX and threshold > 0 else "dense"
+    pairs = _nms_rotated_pairs(boxes, threshold, max_pairs=n * n // 4 if strategy == "auto" else None)
+    if strategy == "grid" and pairs is not None:
+        i, j = pairs
+        iou = probiou(boxes[i], boxes[j]).squeeze(-1)
+        ious = torch.zeros(n, dtype=iou.dtype, device=iou.device).scatter_reduce_(0, j, iou, "amax")
+    else:
+        strategy = "dense"
+        ious = batch_probiou(boxes, boxes).triu_(diagonal=1).max(dim=0)[0]
+    keep = sorted_idx[torch.nonzero(ious < threshold).squeeze_(-1)]
+    return (keep, strategy) if return_strategy else keep
+
+
+def _nms_rotated_pairs(boxes, threshold, max_pairs=None):
+    """
+    Find index pairs (i, j), i < j, of rotated boxes whose probiou can reach the threshold, using a uniform grid.
+
+    probiou >= threshold requires a Bhattacharyya distance bd <= -log(1 - (1 - threshold)^2), and bd >= 3 d^2 /
+    (l1^2 + l2^2) for center distance d and long sides l1, l2. Pairs further apart than r1 + r2 with radius
+    r = l * sqrt(bd_max / 3) can therefore be skipped. With grid cells as wide as the largest circle diameter, every
+    remaining pair lies in the same or a neighboring cell.
+
+    Args:
+        boxes (torch.Tensor): Rotated bounding boxes, shape (N, 5), format xywhr.
+        threshold (float): IoU threshold, must be greater than 0.
+        max_pairs (int, optional): Return None instead if there are more candidate pairs than this.
+
+    Returns:
+        (Tuple[torch.Tensor, torch.Tensor] | None): Indices i and j of the candidate pairs.
+    """
+    if threshold <= 0:  # every pair can reach the threshold
+        return None
+    n, device = len(boxes), boxes.device
+    r = boxes[:, 2:4].amax(1) * (math.sqrt(-math.log(1 - (1 - threshold) ** 2) / 3) * 1.01)  # 1% rounding margin
+    cell = (2 * r.max()).clamp_(min=1e-6)
+    ij = (boxes[:, :2] / cell).floor_().long()
+    ij -= ij.min(0)[0] - 1  # start at 1 so neighbors of the first row and column stay in range
+    ny = int(ij[:, 1].max()) + 2
+    key = ij[:, 0] * ny + ij[:, 1]  # cell index
+    skey, order = key.sort()
+
+    # Count boxes in the 3x3 neighborhood of every box before materializing any pairs
+    offsets = torch.tensor([dx * ny + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)], device=device)
+    neighbors = key[None] + offsets[:, None]  # (9, n) neighboring cell indices of every box
+    start = torch.searchsorted(skey, neighbors)
+    counts = torch.searchsorted(skey, neighbors, right=True) - start
+    if max_pairs is not None and int(counts.sum()) > max_pairs:
+        return None
+
+    # Expand neighbor ranges into pairs, then keep each pair once (i < j) if bounding circles overlap
+    counts, start = counts.flatten(), start.flatten()
+    first = counts.cumsum(0) - counts  # position of the first pair of each range
+    i = torch.arange(n, device=device).repeat(9).repeat_interleave(counts)
+    j = order[(start - first).repeat_interleave(counts) + torch.arange(len(i), device=device)]
+    k = (i < j) & ((boxes[i, :2] - boxes[j, :2]).pow(2).sum(1) <= (r[i] + r[j]).pow(2))
+    return i[k], j[k]
 
 
 def non_max_suppression(
@@ -179,6 +247,7 @@ def non_max_suppression(
     max_wh=7680,
     in_place=True,
     rotated=False,
+    batched=True,
 ):
     """
     Perform non-maximum suppression (NMS) on a set of boxes, with support for masks and multiple labels per box.
@@ -205,6 +274,8 @@ def non_max_suppression(
         max_wh (int): The maximum box width and height in pixels.
         in_place (bool): If True, the input prediction tensor will be modified in place.
         rotated (bool): If Oriented Bounding Boxes (OBB) are being passed for NMS.
+        batched (bool): If True, suppress all images of a multi-image batch in a single NMS call instead of looping
+            over images. Not used for rotated boxes, apriori labels or MPS devices.
 
     Returns:
         (List[torch.Tensor]): A list of length batch_size, where each element is a tensor of
@@ -245,6 +316,11 @@ def non_max_suppression(
         else:
             prediction = torch.cat((xywh2xyxy(prediction[..., :4]), prediction[..., 4:]), dim=-1)  # xywh to xyxy
 
+    if batched and bs > 1 and not rotated and not labels and prediction.device.type != "mps":  # MPS lacks float64
+        return _batched_non_max_suppression(
+            prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh
+        )
+
     t = time.time()
     output = [torch.zeros((0, 6 + nm), device=prediction.device)] * bs
     for xi, x in enumerate(prediction):  # image index, image inference
@@ -316,6 +392,229 @@ def non_max_suppression(
     return output
 
 
+def _batched_non_max_suppression(
+    prediction, xc, conf_thres, iou_thres, classes, agnostic, multi_label, max_det, nc, max_nms, max_wh
+):
+    """
+    Vectorized non_max_suppression() body that runs a single NMS over every image of a batch.
+
+    Candidates of all images are filtered at once and boxes are offset by class exactly as in the per-image loop. On
+    accelerators they are also offset by image index (in float64 to keep the float32 coordinates exact), so a single
+    torchvision.ops.nms() call suppresses each (image, class) group independently. The CPU kernel is quadratic in the
+    total box count, so there only the kernel itself runs per image on contiguous slices. Per-image max_nms and
+    max_det limits are applied by ranking detections within their image.
+
+    Args:
+        prediction (torch.Tensor): Predictions of shape (batch_size, num_boxes, 4 + nc + num_masks) with xyxy boxes.
+        xc (torch.Tensor): Boolean candidate mask of shape (batch_size, num_boxes).
+        conf_thres (float): Confidence threshold.
+        iou_thres (float): IoU threshold.
+        classes (torch.Tensor | None): Class indices to keep.
+        agnostic (bool): Class-agnostic NMS.
+        multi_label (bool): Allow multiple labels per box.
+        max_det (int): Maximum number of detections per image.
+        nc (int): Number of classes.
+        max_nms (int): Maximum number of boxes per image into NMS.
+        max_wh (int): Maximum box width and height in pixels.
+
+    Returns:
+        (List[torch.Tensor]): Per-image detections, identical to the per-image loop of non_max_suppression().
+    """
+    import torchvision  # scope for faster 'import ultralytics'
+
+    bs, device = prediction.shape[0], prediction.device
+    nm = prediction.shape[-1] - nc - 4  # number of masks
+    b, k = xc.nonzero(as_tuple=True)  # image index, anchor index
+    x = prediction[b, k]
+
+    # Detections matrix nx6 (xyxy, conf, cls)
+    box, cls, mask = x.split((4, nc, nm), 1)
+    if multi_label:
+        i, j = torch.where(cls > conf_thres)
+        x, b = torch.cat((box[i], x[i, 4 + j, None], j[:, None].float(), mask[i]), 1), b[i]
+    else:  # best class only
+        conf, j = cls.max(1, keepdim=True)
+        i = conf.view(-1) > conf_thres
+        x, b = torch.cat((box, conf, j.float(), mask), 1)[i], b[i]
+
+    # Filter by class
+    if classes is not None:
+        i = (x[:, 5:6] == classes).any(1)
+        x, b = x[i], b[i]
+    if not x.shape[0]:  # no boxes
+        return [torch.zeros((0, 6 + nm), device=device)] * bs
+
+    # Keep the max_nms most confident boxes of each image (b is sorted by image already)
+    counts = torch.bincount(b, minlength=bs)
+    if counts.max() > max_nms:  # excess boxes
+        i = x[:, 4].argsort(descending=True)
+        i = i[b[i].sort(stable=True)[1]]  # group by image, descending confidence within each image
+        i = i[_rank_in_group(b[i], counts) < max_nms].sort()[0]  # restore original order
+        x, b, counts = x[i], b[i], counts.clamp(max=max_nms)
+
+    # Batched NMS
+    c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
+    boxes, scores = x[:, :4] + c, x[:, 4]  # boxes (offset by class), scores
+    if device.type == "cpu":  # CPU NMS is quadratic in the total box count, so only the kernel runs per image
+        starts, counts = (counts.cumsum(0) - counts).tolist(), counts.tolist()
+        i = torch.cat(
+            [
+                torchvision.ops.nms(bx, sc, iou_thres) + start
+                for bx, sc, start in zip(boxes.split(counts), scores.split(counts), starts)
+            ]
+        )
+    else:
+        boxes = boxes.double() + b[:, None].double() * (max_wh * (nc + 2))  # offset by image, exact in float64
+        i = torchvision.ops.nms(boxes, scores.double(), iou_thres)  # NMS
+    i = i[b[i].sort(stable=True)[1]]  # group by image, keeping descending scores within each image
+    counts = torch.bincount(b[i], minlength=bs)
+    i = i[_rank_in_group(b[i], counts) < max_det]  # limit detections
+    return list(x[i].split(counts.clamp(max=max_det).tolist()))
+
+
+def _rank_in_group(g, counts):
+    """Return the position of each element within its group, given sorted group indices g and group sizes counts."""
+    return torch.arange(len(g), device=g.device) - (counts.cumsum(0) - counts)[g]
+
+
+def non_max_suppression_numpy(
+    prediction,
+    conf_thres=0.25,
+    iou_thres=0.45,
+    classes=None,
+    agnostic=False,
+    multi_label=False,
+    max_det=300,
+    nc=0,  # number of classes (optional)
+    max_nms=30000,
+    max_wh=7680,
+    topk=None,
+):
+    """
+    Perform non-maximum suppression (NMS) in NumPy on the CPU outputs of non-PyTorch backends (ONNX, OpenVINO, etc.).
+
+    Mirrors non_max_suppression() so that these outputs do not need a round trip through torch. Candidates are
+    filtered by confidence, optionally limited to the topk most confident per class, and suppressed greedily with a
+    vectorized IoU that stops as soon as max_det boxes are kept.
+
+    Args:
+        prediction (np.ndarray): An array of shape (batch_size, num_classes + 4 + num_masks, num_boxes), or
+            (batch_size, num_boxes, 6) for end-to-end models.
+        conf_thres (float): The confidence threshold below which boxes will be filtered out.
+        iou_thres (float): The IoU threshold above which overlapping boxes of the same class are suppressed.
+        classes (List[int]): A list of class indices to consider. If None, all classes will be considered.
+        agnostic (bool): If True, the model is agnostic to the number of classes, and all classes will be considered
+            as one.
+        multi_label (bool): If True, each box may have multiple labels.
+        max_det (int): The maximum number of boxes to keep after NMS.
+        nc (int, optional): The number of classes output by the model. Any indices after this will be considered masks.
+        max_nms (int): The maximum number of boxes into NMS.
+        max_wh (int): The maximum box width and height in pixels.
+        topk (int, optional): The maximum number of candidates per class into NMS. None keeps all candidates, which
+            matches non_max_suppression() exactly; small values can drop boxes in crowded scenes.
+
+    Returns:
+        (List[np.ndarray]): A list of length batch_size, where each element is an array of shape
+            (num_boxes, 6 + num_masks) containing the kept boxes, with columns
+            (x1, y1, x2, y2, confidence, class, mask1, mask2, ...).
+    """
+    # Checks
+    assert 0 <= conf_thres <= 1, f"Invalid Confidence threshold {conf_thres}, valid values are between 0.0 and 1.0"
+    assert 0 <= iou_thres <= 1, f"Invalid IoU {iou_thres}, valid values are between 0.0 and 1.0"
+    if isinstance(prediction, (list, tuple)):  # select only inference output
+        prediction = prediction[0]
+    if classes is not None:
+        classes = np.asarray(classes)
+
+    if prediction.shape[-1] == 6:  # end-to-end model (BNC, i.e. 1,300,6)
+        output = [pred[pred[:, 4] > conf_thres][:max_det] for pred in prediction]
+        if classes is not None:
+            output = [pred[np.isin(pred[:, 5], classes)] for pred in output]
+        return output
+
+    nc = nc or (prediction.shape[1] - 4)  # number of classes
+    mi = 4 + nc  # mask start index
+    multi_label &= nc > 1  # multiple labels per box
+
+    output = []
+    for x, xc in zip(prediction, prediction[:, 4:mi].max(1) > conf_thres):  # image inference, candidates
+        x = x[:, xc].T  # confidence, shape(n, 4 + nc + nm)
+        box, cls, mask = xywh2xyxy(x[:, :4]), x[:, 4:mi], x[:, mi:]
+
+        # Detections matrix nx6 (xyxy, conf, cls)
+        if multi_label:
+            i, j = np.nonzero(cls > conf_thres)
+            x = np.concatenate((box[i], cls[i, j, None], j[:, None].astype(x.dtype), mask[i]), 1)
+        else:  # best class only
+            j = cls.argmax(1)
+            conf = cls[np.arange(len(j)), j]
+            x = np.concatenate((box, conf[:, None], j[:, None].astype(x.dtype), mask), 1)[conf > conf_thres]
+
+        # Filter by class
+        if classes is not None:
+            x = x[np.isin(x[:, 5], classes)]
+
+        # Check shape
+        if topk and len(x) > topk:  # keep the topk most confident boxes of each class
+            i = np.lexsort((-x[:, 4], x[:, 5]))  # sort by class, then by descending confidence
+            c = x[i, 5]
+            x = x[np.sort(i[np.arange(len(i)) - np.searchsorted(c, c) < topk])]
+        if len(x) > max_nms:  # excess boxes
+            x = x[np.argsort(-x[:, 4], kind="stable")[:max_nms]]  # sort by confidence and remove excess boxes
+
+        # Batched NMS
+        c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
+        output.append(x[nms_numpy(x[:, :4] + c, x[:, 4], iou_thres, max_det)])
+    return output
+
+
+def nms_numpy(boxes, scores, threshold=0.45, max_det=None, block=64):
+    """
+    Greedy NMS in NumPy with the same IoU arithmetic as torchvision.ops.nms().
+
+    Boxes are visited in descending score order in blocks. Each block is first suppressed by the boxes kept from
+    earlier blocks, then resolved within itself by iterating the matrix form of greedy NMS, i.e. a box is kept if no
+    kept higher-scoring box overlaps it by more than threshold, to its fixed point (Cluster-NMS). The fixed point is the
+    greedy result and is usually reached in a few vectorized passes, so there is no Python loop over the boxes.
+
+    Args:
+        boxes (np.ndarray): Boxes of shape (N, 4) in xyxy format.
+        scores (np.ndarray): Confidence scores of shape (N,).
+        threshold (float): IoU threshold above which lower-scoring boxes are suppressed.
+        max_det (int, optional): Stop once this many boxes are kept.
+        block (int): The number of boxes resolved at once, which bounds memory to O(block * (block + max_det)).
+
+    Returns:
+        (np.ndarray): Indices of the kept boxes in descending score order.
+    """
+    order = np.argsort(-scores, kind="stable")
+    x1, y1, x2, y2 = boxes[order].T
+    areas = (x2 - x1) * (y2 - y1)
+
+    def suppressed(i, j):
+        """Return the (len(i), len(j)) mask of sorted boxes j overlapping sorted boxes i by more than threshold."""
+        w = np.maximum(np.minimum(x2[i, None], x2[j]) - np.maximum(x1[i, None], x1[j]), 0)
+        h = np.maximum(np.minimum(y2[i, None], y2[j]) - np.maximum(y1[i, None], y1[j]), 0)
+        inter = w * h
+        return inter / (areas[i, None] + areas[j] - inter) > threshold
+
+    keep = np.zeros(0, dtype=np.int64)
+    for start in range(0, len(order), block):
+        j = np.arange(start, min(start + block, len(order)))
+        j = j[~suppressed(keep, j).any(0)]  # not suppressed by earlier blocks
+        s = np.triu(suppressed(j, j), 1)  # s[a, b]: box a suppresses box b if a is kept
+        k = np.ones(len(j), dtype=bool)
+        while True:
+            k_new = ~(s & k[:, None]).any(0)
+            if (k_new == k).all():
+                break
+            k = k_new
+        keep = np.concatenate((keep, j[k]))
+        if max_det and len(keep) >= max_det:
+            break
+    return order[keep[:max_det]]
+
+
 def clip_boxes(boxes, shape):
     """
     Takes a list of bounding boxes and a shape (height, width) and clips the bounding boxes to the shape.
@@ -790,6 +1089,29 @@ def regularize_rboxes(rboxes):
     return torch.stack([x, y, w_, h_, t], dim=-1)  # regularized boxes
 
 
+def masks2rle(masks):
+    """
+    Encode binary masks as COCO uncompressed run-length encodings, vectorized over all masks.
+
+    Args:
+        masks (torch.Tensor | np.ndarray): Binary masks of shape (n, h, w).
+
+    Returns:
+        (List[List[int]]): Run lengths of each mask in column-major order, starting with a (possibly empty) run of
+            zeros, as used by COCO {"size": [h, w], "counts": [...]} annotations.
+    """
+    if isinstance(masks, torch.Tensor):
+        masks = masks.cpu().numpy()
+    n, h, w = masks.shape
+    x = masks.transpose(0, 2, 1).reshape(n, h * w) > 0.5  # column-major pixel order
+    change = np.ones((n, x.shape[1] + 1), dtype=bool)  # run boundaries, including start and end of each mask
+    change[:, 1:-1] = x[:, 1:] != x[:, :-1]
+    i, j = np.nonzero(change)
+    same = i[1:] == i[:-1]  # consecutive boundaries within the same mask
+    runs = np.split(np.diff(j)[same], np.cumsum(np.bincount(i[1:][same], minlength=n))[:-1])
+    return [([0] if first else []) + r.tolist() for first, r in zip(x[:, 0] if h * w else [False] * n, runs)]
+
+
 def masks2segments(masks, strategy="all"):
     """
     It takes a list of masks(n,h,w) and returns a list of segments(n,xy).
@@ -4,10 +4,14 @@ import gc
 import math
 import os
 import random
+import threading
 import time
+import weakref
+from collections import OrderedDict
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Union
 
@@ -756,6 +760,111 @@ class EarlyStopping:
         return stop
 
 
+class BufferPool:
+    """
+    Shape-keyed pool of reusable tensors, e.g. for predictor input batches.
+
+    Tensors are handed out by acquire() and returned with release(). Released tensors are reused by later acquire()
+    calls with the same shape, dtype and device, so steady-state streaming allocates nothing once every buffer in
+    flight exists. CPU tensors are allocated in pinned memory if pin_memory=True, enabling non_blocking host to device
+    copies; pass the CUDA event recorded after such a copy to release() and the buffer is only reused once the copy
+    is done. The pool keeps at most `max_per_key` released tensors per key for the `max_keys` most recently released
+    keys and drops the rest, so inputs of ever-changing shapes can't grow it without bound. Acquired tensors are held
+    by weak reference, so tensors that are never released are freed as usual. Thread-safe.
+
+    Attributes:
+        pin_memory (bool): Whether CPU tensors are allocated in pinned memory.
+        max_keys (int): Maximum number of (shape, dtype, device) keys with released tensors.
+        max_per_key (int): Maximum number of released tensors kept per key.
+        allocations (int): Number of tensors allocated.
+        reuses (int): Number of acquire() calls served by a released tensor.
+        nbytes (int): Total bytes allocated.
+    """
+
+    def __init__(self, pin_memory=False, max_keys=8, max_per_key=8):
+        """
+        Initialize an empty buffer pool.
+
+        Args:
+            pin_memory (bool, optional): Allocate CPU tensors in pinned memory. Defaults to False.
+            max_keys (int, optional): Maximum number of keys with released tensors. Defaults to 8.
+            max_per_key (int, optional): Maximum number of released tensors kept per key. Defaults to 8.
+        """
+        self.pin_memory = pin_memory
+        self.max_keys = max_keys
+        self.max_per_key = max_per_key
+        self.allocations = 0
+        self.reuses = 0
+        self.nbytes = 0
+        self._free = OrderedDict()  # {(shape, dtype, device): [(tensor, event), ...]}, least recently released first
+        self._acquired = {}  # {id(tensor): (weakref to tensor, key)}, entries removed when the tensor is freed
+        self._lock = threading.RLock()  # weakref callbacks may run while the lock is held
+
+    def acquire(self, shape, dtype=torch.uint8, device="cpu"):
+        """
+        Return a tensor of the given shape, dtype and device with undefined contents.
+
+        Args:
+            shape (tuple): Tensor shape.
+            dtype (torch.dtype, optional): Tensor dtype. Defaults to torch.uint8.
+            device (torch.device | str, optional): Tensor device. Defaults to 'cpu'.
+
+        Returns:
+            (torch.Tensor): A released tensor if one is available, otherwise a newly allocated one.
+        """
+        key = (tuple(shape), dtype, torch.device(device))
+        with self._lock:
+            free = self._free.get(key)
+            x, event = free.pop() if free else (None, None)
+            if x is None:
+                pin = self.pin_memory and key[2].type == "cpu"
+                x = torch.empty(key[0], dtype=dtype, device=key[2], pin_memory=pin)
+                self.allocations += 1
+                self.nbytes += x.nelement() * x.element_size()
+            else:
+                self.reuses += 1
+            self._acquired[id(x)] = (weakref.ref(x, partial(self._forget, id(x))), key)
+        if event is not None:
+            event.synchronize()  # wait for pending asynchronous copies from or into this tensor
+        return x
+
+    def release(self, x, event=None):
+        """
+        Return a tensor obtained from acquire() to the pool. Tensors not acquired from this pool are ignored.
+
+        Args:
+            x (torch.Tensor): The tensor to release.
+            event (torch.cuda.Event, optional): Event that must complete before the tensor is reused.
+
+        Returns:
+            (bool): Whether the tensor was kept for reuse.
+        """
+        with self._lock:
+            ref, key = self._acquired.get(id(x), (None, None))
+            if ref is None or ref() is not x:
+                return False
+            del self._acquired[id(x)]
+            free = self._free.pop(key, [])
+            kept = len(free) < self.max_per_key
+            if kept:
+                free.append((x, event))
+            self._free[key] = free  # most recently released
+            while len(self._free) > self.max_keys:
+                self._free.popitem(last=False)
+        return kept
+
+    def _forget(self, i, ref):
+        """Remove the entry of an acquired tensor that was freed without being released."""
+        with self._lock:
+            if self._acquired.get(i, (None,))[0] is ref:
+                del self._acquired[i]
+
+    def clear(self):
+        """Drop all released tensors so their memory can be freed; allocation counters are kept."""
+        with self._lock:
+            self._free.clear()
+
+
 class FXModel(nn.Module):
     """
     A custom model class for torch.fx compatibility.